@@ -0,0 +1,66 @@
+from django.contrib import admin
+from django.template.response import TemplateResponse
+from django.utils.cache import add_never_cache_headers
+
+from api.models import APIToken
+
+
+class APITokenAdmin(admin.ModelAdmin):
+    list_display = (
+        "name",
+        "person",
+        "key_prefix",
+        "created_at",
+        "expires_at",
+        "revoked_at",
+        "is_active",
+    )
+    list_filter = ["revoked_at", "expires_at"]
+    search_fields = ("name", "key_prefix", "person__personal", "person__family")
+    raw_id_fields = ("person",)
+    readonly_fields = ("key_prefix", "created_at", "revoked_at")
+    actions = ["revoke"]
+
+    def get_readonly_fields(self, request, obj=None):
+        if obj is None:
+            return ()
+        # tokens can't be moved to other people
+        return ("person",) + self.readonly_fields
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            # only available to `response_add` of this request
+            obj._key = APIToken.generate_key()
+            obj.set_key(obj._key)
+        super().save_model(request, obj, form, change)
+
+    def response_add(self, request, obj, post_url_continue=None):
+        """Show the key of the issued token once, instead of redirecting.
+
+        The key isn't put into messages, because these may be stored in a cookie."""
+        context = {
+            **self.admin_site.each_context(request),
+            "title": "API token issued",
+            "opts": self.model._meta,
+            "token": obj,
+            "key": obj._key,
+        }
+        response = TemplateResponse(request, "api/admin_apitoken_issued.html", context)
+        add_never_cache_headers(response)
+        return response
+
+    def revoke(self, request, queryset):
+        tokens = list(queryset.filter(revoked_at=None))
+        for token in tokens:
+            token.revoke()
+        self.message_user(request, f"Revoked {len(tokens)} token(s).")
+
+    revoke.short_description = "Revoke selected tokens"
+
+    def is_active(self, obj):
+        return obj.is_active
+
+    is_active.boolean = True
+
+
+admin.site.register(APIToken, APITokenAdmin)
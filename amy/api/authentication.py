@@ -0,0 +1,90 @@
+"""Authentication of API clients with tokens (see `api.models.APIToken`).
+
+Unlike `BasicAuthentication`, which checks a slow password hash on every
+request, a token is verified by a lookup of its (fast) hash. Active tokens found
+by the lookups are kept in the default cache for a short time, and are
+invalidated when a token is changed, revoked or deleted. Unknown keys aren't
+cached, so that a token is usable as soon as it's issued.
+
+Clients send the token in a header: `Authorization: Token <key>`.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+
+from api.models import APIToken, hash_token_key
+from workshops.models import Person
+
+API_TOKEN_CACHE_KEY = "api-token:{key_hash}"
+API_TOKEN_CACHE_TIMEOUT = 5 * 60  # 5 minutes
+
+
+def _delete_cached_token(key_hash: str) -> None:
+    cache.delete(API_TOKEN_CACHE_KEY.format(key_hash=key_hash))
+
+
+def invalidate_cached_token(key_hash: str) -> None:
+    """Remove cached lookup of the token, both immediately and after the current
+    transaction commits."""
+    _delete_cached_token(key_hash)
+    transaction.on_commit(lambda: _delete_cached_token(key_hash))
+
+
+def lookup_token(key: str):
+    """Return (token ID, person ID, expiration time) of an active token with
+    given key, or None."""
+    key_hash = hash_token_key(key)
+    cache_key = API_TOKEN_CACHE_KEY.format(key_hash=key_hash)
+    entry = cache.get(cache_key)
+    if entry is None:
+        entry = (
+            APIToken.objects.active()
+            .filter(key_hash=key_hash)
+            .values_list("pk", "person_id", "expires_at")
+            .first()
+        )
+        if entry is not None:
+            cache.set(cache_key, entry, timeout=API_TOKEN_CACHE_TIMEOUT)
+    return entry
+
+
+class TokenAuthentication(BaseAuthentication):
+    """Authenticate as the person who the token was issued for; the person's
+    permissions (e.g. `IsAdmin` or `HasRestrictedPermission` checks) apply.
+    `request.auth` is the token's ID."""
+
+    keyword = "Token"
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) != 2:
+            raise AuthenticationFailed("Invalid token header.")
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise AuthenticationFailed("Invalid token header.")
+
+        return self.authenticate_credentials(key)
+
+    def authenticate_credentials(self, key: str):
+        token = lookup_token(key)
+        if token is None:
+            raise AuthenticationFailed("Invalid token.")
+
+        token_id, person_id, expires_at = token
+        if expires_at is not None and expires_at <= timezone.now():
+            raise AuthenticationFailed("Token has expired.")
+
+        try:
+            person = Person.objects.get(pk=person_id, is_active=True)
+        except Person.DoesNotExist:
+            raise AuthenticationFailed("User inactive or deleted.")
+        return person, token_id
+
+    def authenticate_header(self, request):
+        return self.keyword
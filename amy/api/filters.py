@@ -3,7 +3,7 @@ from django_filters import rest_framework as filters
 from consents.models import Consent, TermOption
 from extrequests.filters import TrainingRequestFilter
 from workshops.filters import NamesOrderingFilter
-from workshops.models import Badge, Event, Person, Tag, Task
+from workshops.models import Event, Person, Tag, Task
 
 
 class EventFilter(filters.FilterSet):
@@ -51,11 +51,10 @@ class TaskFilter(filters.FilterSet):
 
 
 def filter_instructors(queryset, name, value):
-    instructor_badges = Badge.objects.instructor_badges()
     if value is True:
-        return queryset.filter(badges__in=instructor_badges)
+        return queryset.annotate_with_instructor_badges().filter(is_instructor=True)
     elif value is False:
-        return queryset.exclude(badges__in=instructor_badges)
+        return queryset.annotate_with_instructor_badges().filter(is_instructor=False)
     else:
         return queryset
 
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import hashlib
+import secrets
+from typing import Tuple
+
+from django.db import models
+from django.utils import timezone
+
+from workshops.mixins import CreatedUpdatedMixin
+from workshops.models import STR_MED, Person
+
+# Number of leading characters of a token stored in plain text, so that tokens
+# can be told apart in the admin.
+TOKEN_PREFIX_LENGTH = 8
+
+
+def hash_token_key(key: str) -> str:
+    # Keys are long and random, so unlike passwords they don't need a slow hash.
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class APITokenQuerySet(models.query.QuerySet):
+    def active(self):
+        return self.filter(revoked_at=None).filter(
+            models.Q(expires_at=None) | models.Q(expires_at__gt=timezone.now())
+        )
+
+
+class APIToken(CreatedUpdatedMixin, models.Model):
+    """Token used by API clients (e.g. reporting scripts) to authenticate as
+    a person. Only a hash of the token key is stored; the key itself is shown
+    once, when the token is issued."""
+
+    person = models.ForeignKey(
+        Person, on_delete=models.CASCADE, related_name="api_tokens"
+    )
+    name = models.CharField(
+        max_length=STR_MED, help_text="What or who is the token used by."
+    )
+    key_prefix = models.CharField(max_length=TOKEN_PREFIX_LENGTH, editable=False)
+    key_hash = models.CharField(max_length=64, unique=True, editable=False)
+    expires_at = models.DateTimeField(
+        null=True, blank=True, help_text="Leave empty for a token which never expires."
+    )
+    revoked_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = APITokenQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "API token"
+        ordering = ("-created_at",)
+
+    def __str__(self):
+        return f"{self.name} ({self.key_prefix}…)"
+
+    @staticmethod
+    def generate_key() -> str:
+        return secrets.token_urlsafe(32)
+
+    def set_key(self, key: str) -> None:
+        self.key_prefix = key[:TOKEN_PREFIX_LENGTH]
+        self.key_hash = hash_token_key(key)
+
+    @classmethod
+    def issue(cls, person: Person, name: str, **kwargs) -> Tuple[APIToken, str]:
+        """Create a token; return it together with its key."""
+        key = cls.generate_key()
+        token = cls(person=person, name=name, **kwargs)
+        token.set_key(key)
+        token.save()
+        return token, key
+
+    @property
+    def is_active(self) -> bool:
+        return self.revoked_at is None and (
+            self.expires_at is None or self.expires_at > timezone.now()
+        )
+
+    def revoke(self) -> None:
+        self.revoked_at = timezone.now()
+        self.save()
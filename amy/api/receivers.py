@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.authentication import invalidate_cached_token
+from api.models import APIToken
+
+
+@receiver(post_save, sender=APIToken)
+@receiver(post_delete, sender=APIToken)
+def invalidate_cached_token_on_change(sender, instance: APIToken, **kwargs) -> None:
+    invalidate_cached_token(instance.key_hash)
@@ -1,4 +1,4 @@
-from rest_framework_csv.renderers import CSVRenderer
+from rest_framework_csv.renderers import CSVStreamingRenderer
 
 from api.serializers import (
     TrainingRequestForManualScoringSerializer,
@@ -61,10 +61,15 @@ class TrainingRequestCSVColumns:
         }
 
 
-class TrainingRequestCSVRenderer(CSVRenderer, TrainingRequestCSVColumns):
+# Streaming renderers return generators, which are consumed either by
+# `StreamingHttpResponse` (see `api.views.TrainingRequests`), or when regular
+# responses (e.g. errors) set their content.
+class TrainingRequestCSVRenderer(CSVStreamingRenderer, TrainingRequestCSVColumns):
     serializer = TrainingRequestWithPersonSerializer
 
 
-class TrainingRequestManualScoreCSVRenderer(CSVRenderer, TrainingRequestCSVColumns):
+class TrainingRequestManualScoreCSVRenderer(
+    CSVStreamingRenderer, TrainingRequestCSVColumns
+):
     serializer = TrainingRequestForManualScoringSerializer
     format = "csv2"
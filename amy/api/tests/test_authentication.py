@@ -0,0 +1,138 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.authentication import lookup_token
+from api.models import APIToken
+from workshops.models import Person
+from workshops.tests.base import consent_to_all_required_consents
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class TestTokenAuthentication(APITestCase):
+    def setUp(self):
+        self.admin = Person.objects.create_superuser(
+            username="admin",
+            personal="Super",
+            family="User",
+            email="sudo@example.org",
+            password="admin",
+        )
+        consent_to_all_required_consents(self.admin)
+        self.token, self.key = APIToken.issue(self.admin, name="Reports")
+        self.url = reverse("api:airport-list")
+
+    def get(self, key):
+        return self.client.get(self.url, HTTP_AUTHORIZATION=f"Token {key}")
+
+    def test_key_not_stored(self):
+        self.assertEqual(self.token.key_prefix, self.key[:8])
+        self.assertNotIn(self.key, self.token.key_hash)
+
+    def test_valid_token(self):
+        rv = self.get(self.key)
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(rv.wsgi_request.user, self.admin)
+
+    def test_invalid_token(self):
+        rv = self.get("invalid")
+        self.assertEqual(rv.status_code, 401)
+        self.assertEqual(rv["WWW-Authenticate"], 'Basic realm="api"')
+
+    def test_permissions_of_person_apply(self):
+        person = Person.objects.create(
+            personal="Test",
+            family="User",
+            email="test@example.org",
+            username="test",
+            is_active=True,
+        )
+        _, key = APIToken.issue(person, name="Scripts")
+        rv = self.get(key)
+        self.assertEqual(rv.status_code, 403)
+
+    def test_lookup_cached(self):
+        lookup_token(self.key)
+        with self.assertNumQueries(0):
+            self.assertEqual(lookup_token(self.key)[0], self.token.pk)
+
+    def test_unknown_key_not_cached(self):
+        self.assertIsNone(lookup_token("unknown"))
+        with self.assertNumQueries(1):
+            self.assertIsNone(lookup_token("unknown"))
+
+    def test_revoked_token(self):
+        self.assertEqual(self.get(self.key).status_code, 200)
+        self.token.revoke()
+        self.assertEqual(self.get(self.key).status_code, 401)
+
+    def test_deleted_token(self):
+        self.assertEqual(self.get(self.key).status_code, 200)
+        self.token.delete()
+        self.assertEqual(self.get(self.key).status_code, 401)
+
+    def test_expired_token(self):
+        token, key = APIToken.issue(
+            self.admin, name="Temporary", expires_at=timezone.now() + timedelta(hours=1)
+        )
+        self.assertEqual(self.get(key).status_code, 200)
+
+        # cached lookup still checks the expiration time
+        later = timezone.now() + timedelta(hours=2)
+        with patch("api.authentication.timezone.now", return_value=later):
+            self.assertEqual(self.get(key).status_code, 401)
+
+    def test_inactive_person(self):
+        self.admin.is_active = False
+        self.admin.save()
+        self.assertEqual(self.get(self.key).status_code, 401)
+
+
+class TestAPITokenAdmin(APITestCase):
+    def setUp(self):
+        self.admin = Person.objects.create_superuser(
+            username="admin",
+            personal="Super",
+            family="User",
+            email="sudo@example.org",
+            password="admin",
+        )
+        consent_to_all_required_consents(self.admin)
+        self.client.login(username="admin", password="admin")
+
+    def test_issue_token(self):
+        rv = self.client.post(
+            reverse("admin:api_apitoken_add"),
+            {"person": self.admin.pk, "name": "Reports", "expires_at_0": ""},
+            follow=True,
+        )
+        self.assertEqual(rv.status_code, 200)
+        self.assertIn("no-cache", rv["Cache-Control"])
+        token = APIToken.objects.get()
+        key = rv.context["key"]
+        self.assertContains(rv, key)
+        self.assertEqual(token.key_prefix, key[:8])
+        self.assertEqual(lookup_token(key)[0], token.pk)
+
+        # the key isn't stored anywhere, e.g. in messages
+        self.assertNotIn(key, [str(message) for message in rv.context["messages"]])
+        rv = self.client.get(reverse("admin:api_apitoken_change", args=[token.pk]))
+        self.assertNotContains(rv, key)
+
+    def test_revoke_tokens(self):
+        token, _ = APIToken.issue(self.admin, name="Reports")
+        rv = self.client.post(
+            reverse("admin:api_apitoken_changelist"),
+            {"action": "revoke", "_selected_action": [token.pk]},
+            follow=True,
+        )
+        self.assertEqual(rv.status_code, 200)
+        token.refresh_from_db()
+        self.assertIsNotNone(token.revoked_at)
+        self.assertFalse(APIToken.objects.active().exists())
@@ -288,7 +288,8 @@ class TestListingTrainingRequests(APITestCase):
         # get CSV-formatted output
         self.client.login(username="admin", password="admin")
         response = self.client.get(url, {"format": "csv"})
-        content = response.content.decode("utf-8")
+        self.assertTrue(response.streaming)
+        content = b"".join(response.streaming_content).decode("utf-8")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
         firstline = content.splitlines()[0]
@@ -1,6 +1,7 @@
 from collections import OrderedDict
 
 from django.db.models import Prefetch, Q
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets
 from rest_framework.generics import ListAPIView, RetrieveAPIView
 from rest_framework.metadata import SimpleMetadata
@@ -38,6 +39,7 @@ from autoemails.models import EmailTemplate
 from communityroles.models import CommunityRoleConfig
 from consents.models import Consent, Term
 from recruitment.models import InstructorRecruitment
+from workshops.exports import iterate_in_chunks
 from workshops.models import (
     Airport,
     Award,
@@ -208,6 +210,27 @@ class TrainingRequests(ListAPIView):
         else:
             return TrainingRequestWithPersonSerializer
 
+    def list(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        if not isinstance(
+            renderer,
+            (TrainingRequestCSVRenderer, TrainingRequestManualScoreCSVRenderer),
+        ):
+            return super().list(request, *args, **kwargs)
+
+        # CSV is serialized and sent row by row, with requests fetched in chunks
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+        data = (
+            serializer_class(training_request, context=context).data
+            for training_request in iterate_in_chunks(queryset)
+        )
+        return StreamingHttpResponse(
+            renderer.render(data, renderer_context=self.get_renderer_context()),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+
 
 # ----------------------
 # "new" API starts below
@@ -1,16 +1,20 @@
 from __future__ import annotations
 
 from datetime import date, datetime, timedelta
+from itertools import islice
 import logging
-from typing import Iterable, Optional, Type
+import time
+from typing import Any, Callable, Optional, Type
 
 from django.conf import settings
 from django.contrib.sites.models import Site
 from django.core.mail import EmailMultiAlternatives
+from django.db.models import QuerySet
 from django.template.exceptions import TemplateDoesNotExist, TemplateSyntaxError
 import django_rq
 
 from autoemails.models import EmailTemplate, Trigger
+from autoemails.payloads import PayloadMixin, restore, snapshot
 from autoemails.utils import compare_emails
 from consents.models import Term
 from workshops.fields import TAG_SEPARATOR
@@ -21,15 +25,20 @@ scheduler = django_rq.get_scheduler("default")
 DAY_IN_SECONDS = 86400
 
 
-class BaseAction:
+class BaseAction(PayloadMixin):
     """
     Base class interface for actions triggered by our predefined triggers.
     This class can handle condition checking for whether the action should
     launch, but most importantly acts as a refresher for DB data.  It was
     intended to support lazy binding / refreshing DB data before actual email
     is built and sent out.
+
+    When pickled (e.g. into RQ job), only references to model instances are
+    stored; the template is stored with its current contents.
     """
 
+    payload_attributes = ("trigger", "context_objects", "context", "email")
+
     # Keeps the default timestamp for the job to run
     launch_at: Optional[timedelta] = None
     # Stores additional contextual data for the trigger/template
@@ -52,6 +61,17 @@ class BaseAction:
         self.context: Optional[dict] = None
         self.email = None
 
+    def __getstate__(self) -> dict:
+        state = super().__getstate__()
+        state["template"] = snapshot(self.template)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        super().__setstate__(state)
+        if "version" in state:
+            self.template = restore(state["template"])
+            self.logger = logger
+
     def __eq__(self, b):
         try:
             return (
@@ -1242,16 +1262,19 @@ class ProfileUpdateReminderAction(BaseAction):
         return (settings.ADMIN_NOTIFICATION_CRITERIA_DEFAULT,)
 
 
-class BaseRepeatedAction:
+class BaseRepeatedAction(PayloadMixin):
     """
     Base class for repeated jobs in the Redis.
     """
 
+    payload_attributes = ("trigger",)
+
     trigger: Trigger
     EMAIL_ACTION_CLASS: Type[BaseAction]
     INTERVAL: int = DAY_IN_SECONDS  # time between repeats
     REPEAT: Optional[int] = None  # number of times the job is repeated
     # If repeat is None means repeat forever
+    CHUNK_SIZE: int = 1000  # number of objects scheduled at once by `fan_out`
 
     def __init__(self, trigger: Trigger):
         super().__init__()
@@ -1264,6 +1287,58 @@ class BaseRepeatedAction:
     def template(self):
         return self.trigger.template
 
+    def fan_out(
+        self,
+        objects: QuerySet,
+        triggers: QuerySet[Trigger],
+        get_context_objects: Callable[[Any], dict],
+    ) -> dict:
+        """Schedule `EMAIL_ACTION_CLASS` emails for all `objects`.
+
+        Objects are streamed from the database and their emails are scheduled in
+        bulk, `CHUNK_SIZE` objects at a time. Returns (and logs) run statistics;
+        when run by RQ, they're stored as the job result."""
+        from autoemails.base_views import ActionManageMixin
+
+        action_name = self.EMAIL_ACTION_CLASS.__name__
+        start = time.monotonic()
+
+        # evaluate triggers only once
+        triggers = list(triggers.select_related("template"))
+        objects_count = 0
+        jobs_count = 0
+
+        iterator = objects.iterator(chunk_size=self.CHUNK_SIZE)
+        while True:
+            chunk = list(islice(iterator, self.CHUNK_SIZE))
+            if not chunk:
+                break
+
+            jobs, _ = ActionManageMixin.bulk_add(
+                action_class=self.EMAIL_ACTION_CLASS,
+                logger=logger,
+                scheduler=scheduler,
+                triggers=triggers,
+                objects=[(get_context_objects(obj), obj) for obj in chunk],
+            )
+            objects_count += len(chunk)
+            jobs_count += len(jobs)
+
+        stats = dict(
+            action=action_name,
+            objects=objects_count,
+            jobs=jobs_count,
+            duration=time.monotonic() - start,
+        )
+        logger.info(
+            "%s: scheduled %d jobs for %d objects in %.2fs",
+            action_name,
+            jobs_count,
+            objects_count,
+            stats["duration"],
+        )
+        return stats
+
 
 class UpdateProfileReminderRepeatedAction(BaseRepeatedAction):
     """
@@ -1274,28 +1349,24 @@ class UpdateProfileReminderRepeatedAction(BaseRepeatedAction):
     EMAIL_ACTION_CLASS = ProfileUpdateReminderAction
 
     def __call__(self, *args, **kwargs):
-        from autoemails.base_views import ActionManageMixin
-
-        people = self.get_people_with_anniversary()
+        people = self.get_people_with_anniversary().only(
+            "pk", "email", "personal", "middle", "family"
+        )
         triggers = Trigger.objects.filter(
             active=True,
             action="profile-update",
         )
-        for person in people:
-            ActionManageMixin.add(
-                action_class=self.EMAIL_ACTION_CLASS,
-                logger=logger,
-                scheduler=scheduler,
-                triggers=triggers,
-                context_objects={
-                    "person_email": person.email,
-                    "person_full_name": person.full_name,
-                },
-                object_=person,
-            )
+        return self.fan_out(
+            people,
+            triggers,
+            lambda person: {
+                "person_email": person.email,
+                "person_full_name": person.full_name,
+            },
+        )
 
     @staticmethod
-    def get_people_with_anniversary() -> Iterable[Person]:
+    def get_people_with_anniversary() -> QuerySet[Person]:
         """
         Pull all people whose created_at anniversary is today
         """
@@ -2,10 +2,12 @@ from datetime import datetime, timedelta
 import logging
 
 from django.contrib import admin, messages
+from django.core.paginator import Paginator
 from django.db.models import TextField
 from django.shortcuts import get_object_or_404, redirect
 from django.template.response import TemplateResponse
 from django.urls import path, reverse
+from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.utils.html import format_html
 from django.views.decorators.http import require_POST
@@ -17,7 +19,12 @@ from autoemails.actions import BaseRepeatedAction
 from autoemails.forms import RescheduleForm, TemplateForm
 from autoemails.job import Job
 from autoemails.models import EmailTemplate, RQJob, Trigger
-from autoemails.utils import check_status, scheduled_execution_time
+from autoemails.utils import (
+    ScheduledJobs,
+    check_status,
+    check_statuses,
+    scheduled_execution_time,
+)
 from workshops.util import admin_required
 
 logger = logging.getLogger("amy.signals")
@@ -44,12 +51,15 @@ class EmailTemplateAdmin(admin.ModelAdmin):
         return new_urls + original_urls
 
     def email_queue_view(self, request):
-        jobs = list(scheduler.get_jobs(with_times=True))
+        # only jobs from the current page are fetched (and unpickled) from Redis
+        paginator = Paginator(ScheduledJobs(scheduler), self.list_per_page)
+        page = paginator.get_page(request.GET.get("page"))
         context = dict(
             self.admin_site.each_context(request),
             title="Queue",
-            cl=self.get_changelist_instance(request),
-            queue=jobs,
+            opts=self.model._meta,
+            queue=page.object_list,
+            page=page,
         )
         return TemplateResponse(request, "queue.html", context)
 
@@ -89,15 +99,21 @@ class RQJobAdmin(admin.ModelAdmin):
     ]
 
     def action_refresh_state(self, request, queryset):
-        counter = 0
-        for rqjob in queryset:
-            status = check_status(rqjob.job_id)
+        rqjobs = list(queryset)
+        statuses = check_statuses([rqjob.job_id for rqjob in rqjobs], scheduler)
+
+        # `bulk_update` skips `save()`, so `auto_now` isn't applied
+        now = timezone.now()
+        refreshed = []
+        for rqjob in rqjobs:
+            status = statuses[rqjob.job_id]
             if status is not None:
                 rqjob.status = status
-                rqjob.save()
-                counter += 1
+                rqjob.last_updated_at = now
+                refreshed.append(rqjob)
+        RQJob.objects.bulk_update(refreshed, ["status", "last_updated_at"])
 
-        self.message_user(request, "Refreshed status of %d RQJob(s)." % counter)
+        self.message_user(request, "Refreshed status of %d RQJob(s)." % len(refreshed))
 
     action_refresh_state.short_description = "Refresh status from Redis"
 
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections import defaultdict
+from datetime import datetime
 from logging import Logger
 from typing import Optional, Sequence, Type, Union
 
@@ -9,14 +11,16 @@ from django.http import HttpRequest
 from django.urls import reverse
 from django.utils.html import format_html
 from django_rq.queues import DjangoScheduler
+import pytz
 from redis import Redis, StrictRedis
 from rq.exceptions import NoSuchJobError
+from rq_scheduler.utils import from_unix, to_unix
 
 from autoemails.actions import BaseAction
 from autoemails.job import Job
 from autoemails.mixins import RQJobsMixin
 from autoemails.models import RQJob, Trigger
-from autoemails.utils import check_status, scheduled_execution_time
+from autoemails.utils import scheduled_execution_time
 
 
 class ActionManageMixin:
@@ -50,80 +54,128 @@ class ActionManageMixin:
         object_: Optional[RQJobsMixin] = None,
         request: Optional[HttpRequest] = None,
     ) -> tuple[list[Job], list[RQJob]]:
+        return ActionManageMixin.bulk_add(
+            action_class=action_class,
+            logger=logger,
+            scheduler=scheduler,
+            triggers=triggers,
+            objects=[(context_objects, object_)],
+            request=request,
+        )
+
+    @staticmethod
+    def bulk_add(
+        action_class: Type[BaseAction],
+        logger: Logger,
+        scheduler: DjangoScheduler,
+        triggers: QuerySet[Trigger],
+        objects: Sequence[tuple[dict, Optional[RQJobsMixin]]],
+        request: Optional[HttpRequest] = None,
+    ) -> tuple[list[Job], list[RQJob]]:
+        """Schedule jobs for each trigger and each of many objects at once.
+
+        `objects` is a sequence of `(context_objects, object_)` pairs. Triggers
+        are fetched once, all jobs are written to Redis in a single pipeline (with
+        scheduled execution times calculated locally instead of read back from
+        Redis) and all `RQJob` entries, and their relations to objects, are
+        inserted in bulk."""
         Action = action_class
         action_name = Action.__name__
 
         logger.debug("%s: adding jobs...", action_name)
 
         # fetch all related triggers
-        logger.debug("%s: found %d triggers", action_name, triggers.count())
+        if isinstance(triggers, QuerySet):
+            triggers = triggers.select_related("template")
+        triggers = list(triggers)
+        logger.debug("%s: found %d triggers", action_name, len(triggers))
 
         created_jobs = []
         created_rqjobs = []
+        related_objects = []
+
+        pipeline = scheduler.connection.pipeline()
+        for context_objects, object_ in objects:
+            for trigger in triggers:
+                # create action
+                logger.debug("%s: creating an action object", action_name)
+                action = Action(trigger=trigger, objects=dict(context_objects))
+
+                # prepare launch timestamp and some metadata
+                launch_at = action.get_launch_at()
+                meta = dict(
+                    action=action,
+                    template=trigger.template,
+                    launch_at=launch_at,
+                    email=None,
+                    context=None,
+                )
 
-        for trigger in triggers:
-            # create action
-            logger.debug("%s: creating an action object", action_name)
-            action = Action(trigger=trigger, objects=dict(context_objects))
-
-            # prepare launch timestamp and some metadata
-            launch_at = action.get_launch_at()
-            meta = dict(
-                action=action,
-                template=trigger.template,
-                launch_at=launch_at,
-                email=None,
-                context=None,
-            )
-
-            # enqueue job at specified timestamp with metadata
-            logger.debug("%s: enqueueing", action_name)
-            job = scheduler.enqueue_in(launch_at, action, meta=meta)
-            scheduled_at = scheduled_execution_time(
-                job.get_id(), scheduler=scheduler, naive=False
-            )
-            logger.debug("%s: job created [%r]", action_name, job)
-
-            if object_:
-                # save job ID in the object
-                logger.debug("%s: saving job in [%r] object", action_name, object_)
-                rqj = object_.rq_jobs.create(
-                    job_id=job.get_id(),
-                    trigger=trigger,
-                    scheduled_execution=scheduled_at,
-                    status=check_status(job),
-                    mail_status="",
-                    event_slug=action.event_slug(),
-                    recipients=action.all_recipients(),
-                    action_name=action_name,
+                # enqueue job at specified timestamp with metadata; this is the
+                # same as `scheduler.enqueue_in`, but writes to the pipeline
+                logger.debug("%s: enqueueing", action_name)
+                job = scheduler._create_job(action, meta=meta, commit=False)
+                job.save(pipeline=pipeline)
+                scheduled_timestamp = to_unix(datetime.utcnow() + launch_at)
+                pipeline.zadd(
+                    scheduler.scheduled_jobs_key, {job.id: scheduled_timestamp}
                 )
-            else:
-                # save directly in the table
-                logger.debug("%s: saving job in job table", action_name)
-                rqj = RQJob.objects.create(
-                    job_id=job.get_id(),
-                    trigger=trigger,
-                    scheduled_execution=scheduled_at,
-                    status=check_status(job),
-                    mail_status="",
-                    event_slug=action.event_slug(),
-                    recipients=action.all_recipients(),
-                    action_name=action_name,
+                # By default, RQ-Scheduler uses UTC naive (TZ-unaware) objects,
+                # which we can "convert" to TZ-aware UTC.
+                scheduled_at = from_unix(scheduled_timestamp).replace(tzinfo=pytz.UTC)
+                logger.debug("%s: job created [%r]", action_name, job)
+
+                if object_:
+                    logger.debug("%s: saving job in [%r] object", action_name, object_)
+                else:
+                    logger.debug("%s: saving job in job table", action_name)
+
+                created_jobs.append(job)
+                created_rqjobs.append(
+                    RQJob(
+                        job_id=job.get_id(),
+                        trigger=trigger,
+                        scheduled_execution=scheduled_at,
+                        # new jobs don't have a status, see `check_status`
+                        status=job.get_status(refresh=False) or "scheduled",
+                        mail_status="",
+                        event_slug=action.event_slug(),
+                        recipients=action.all_recipients(),
+                        action_name=action_name,
+                    )
                 )
+                related_objects.append(object_)
+        pipeline.execute()
 
-            created_jobs.append(job)
-            created_rqjobs.append(rqj)
+        created_rqjobs = RQJob.objects.bulk_create(created_rqjobs)
+
+        # save job IDs in the objects
+        through_objects = defaultdict(list)
+        for rqj, object_ in zip(created_rqjobs, related_objects):
+            if object_:
+                field = object_._meta.get_field("rq_jobs")
+                through_objects[field.remote_field.through].append(
+                    field.remote_field.through(
+                        **{
+                            field.m2m_column_name(): object_.pk,
+                            field.m2m_reverse_name(): rqj.pk,
+                        }
+                    )
+                )
+        for through, relations in through_objects.items():
+            through.objects.bulk_create(relations)
 
-            # `request` is optionally passed down from the view
-            if request:
+        # `request` is optionally passed down from the view
+        if request:
+            for job, rqj in zip(created_jobs, created_rqjobs):
                 messages.info(
                     request,
                     format_html(
                         "New email ({}) was scheduled to run "
                         '<relative-time datetime="{}"></relative-time>: '
                         '<a href="{}"><code>{}</code></a>.',
-                        trigger.get_action_display(),
-                        scheduled_at.isoformat(),
+                        rqj.trigger.get_action_display(),
+                        rqj.scheduled_execution.isoformat(),
                         reverse("admin:autoemails_rqjob_preview", args=[rqj.pk]),
                         job.id,
                     ),
@@ -28,23 +28,32 @@ def send_bulk_email(
         emails[i : i + settings.BULK_EMAIL_LIMIT]  # noqa
         for i in range(0, len(emails), settings.BULK_EMAIL_LIMIT)
     ]
-    for emails in emails_to_send:
-        jobs, rqjobs = ActionManageMixin.add(
-            action_class=action_class,
-            logger=logger,
-            scheduler=scheduler,
-            triggers=triggers,
-            context_objects=dict(
-                person_emails=emails,
-                **additional_context_objects,
-            ),
-            object_=object_,
-        )
-        if triggers and jobs:
+    # evaluate triggers only once
+    triggers = list(triggers)
+    # all jobs are scheduled at once
+    jobs, rqjobs = ActionManageMixin.bulk_add(
+        action_class=action_class,
+        logger=logger,
+        scheduler=scheduler,
+        triggers=triggers,
+        objects=[
+            (
+                dict(
+                    person_emails=emails,
+                    **additional_context_objects,
+                ),
+                object_,
+            )
+            for emails in emails_to_send
+        ],
+    )
+    if triggers and jobs:
+        # jobs are ordered by emails, and then by triggers
+        for emails, job in zip(emails_to_send, jobs[:: len(triggers)]):
             ActionManageMixin.bulk_schedule_message(
                 request=request,
                 num_emails=len(emails),
                 trigger=triggers[0],
-                job=jobs[0],
+                job=job,
                 scheduler=scheduler,
             )
@@ -1,14 +1,14 @@
 from collections import namedtuple
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.mail import EmailMultiAlternatives
 from django.db import models
-from django.template import Template, TemplateSyntaxError, engines
+from django.template import Template, TemplateSyntaxError
 from django.urls import reverse
-import markdown
 
+from autoemails.template_cache import compiled_templates, markdown_to_html
 from workshops.mixins import ActiveMixin, CreatedUpdatedMixin
 
 EmailBody = namedtuple("EmailBody", ["text", "html"])
@@ -102,31 +102,46 @@ class EmailTemplate(ActiveMixin, CreatedUpdatedMixin, models.Model):
     )
 
     @staticmethod
-    def get_template(content: str, default_engine: str = "db_backend") -> Template:
+    def get_template(
+        content: str,
+        default_engine: str = "db_backend",
+        template_id: Optional[int] = None,
+    ) -> Template:
         """Translate text into Django Template object.
 
+        Compiled templates are cached per process, see
+        `autoemails.template_cache.compiled_templates`.
+
         default_engine: name of the template backend used for rendering
         For more see:
         https://docs.djangoproject.com/en/2.2/ref/settings/#std:setting-TEMPLATES-NAME
         """
-        return engines[default_engine].from_string(content)
+        return compiled_templates.get_or_compile(
+            content, engine=default_engine, template_id=template_id
+        )
 
     @staticmethod
     def render_template(
-        tpl: str, context: dict, default_engine: str = "db_backend"
+        tpl: str,
+        context: dict,
+        default_engine: str = "db_backend",
+        template_id: Optional[int] = None,
     ) -> str:
         """Render template with given context."""
-        return EmailTemplate.get_template(tpl, default_engine=default_engine).render(
-            context
-        )
+        return EmailTemplate.get_template(
+            tpl, default_engine=default_engine, template_id=template_id
+        ).render(context)
+
+    def _render(self, tpl: str, context: dict) -> str:
+        return self.render_template(tpl, context, template_id=self.pk)
 
     def get_subject(self, subject: str = "", context: Optional[dict] = None) -> str:
         context = context or {}
-        return subject or self.render_template(self.subject, context)
+        return subject or self._render(self.subject, context)
 
     def get_sender(self, sender: str = "", context: Optional[dict] = None) -> str:
         context = context or {}
-        return sender or self.render_template(self.from_header, context)
+        return sender or self._render(self.from_header, context)
 
     def get_recipients(
         self, recipients: Optional[List[str]] = None, context: Optional[dict] = None
@@ -134,7 +149,7 @@ class EmailTemplate(ActiveMixin, CreatedUpdatedMixin, models.Model):
         context = context or {}
         return recipients or list(
             # remove empty entries from the list
-            filter(bool, [self.render_template(self.to_header, context)])
+            filter(bool, [self._render(self.to_header, context)])
         )
 
     def get_cc_recipients(
@@ -143,7 +158,7 @@ class EmailTemplate(ActiveMixin, CreatedUpdatedMixin, models.Model):
         context = context or {}
         return cc_recipients or list(
             # remove empty entries from the list
-            filter(bool, [self.render_template(self.cc_header, context)])
+            filter(bool, [self._render(self.cc_header, context)])
         )
 
     def get_bcc_recipients(
@@ -152,14 +167,14 @@ class EmailTemplate(ActiveMixin, CreatedUpdatedMixin, models.Model):
         context = context or {}
         return bcc_recipients or list(
             # remove empty entries from the list
-            filter(bool, [self.render_template(self.bcc_header, context)])
+            filter(bool, [self._render(self.bcc_header, context)])
         )
 
     def get_reply_to(
         self, reply_to: Optional[List[str]] = None, context: Optional[dict] = None
     ) -> List[str]:
         context = context or {}
-        return reply_to or [self.render_template(self.reply_to_header, context)] or [""]
+        return reply_to or [self._render(self.reply_to_header, context)] or [""]
 
     def get_body(
         self, text: str = "", html: str = "", context: Optional[dict] = None
@@ -174,17 +189,17 @@ class EmailTemplate(ActiveMixin, CreatedUpdatedMixin, models.Model):
         context = context or {}
         # when either text or HTML parameters aren't provided
         if not text or not html:
-            base_template = self.render_template(self.body_template, context)
+            base_template = self._render(self.body_template, context)
 
         if text:
-            text_body = self.render_template(text, context)
+            text_body = self._render(text, context)
         else:
             text_body = base_template
 
         if html:
-            html_body = self.render_template(html, context)
+            html_body = self._render(html, context)
         else:
-            html_body = markdown.markdown(base_template)
+            html_body = markdown_to_html(base_template)
 
         body = EmailBody(text=text_body, html=html_body)
         return body
@@ -233,6 +248,25 @@ class EmailTemplate(ActiveMixin, CreatedUpdatedMixin, models.Model):
 
         return msg
 
+    def build_emails(
+        self, contexts: Iterable[dict], **kwargs
+    ) -> List[EmailMultiAlternatives]:
+        """Build many emails from this template, one for each context.
+
+        Other parameters are the same as in `build_email()` and apply to all
+        emails. Every template field is compiled once for the whole batch."""
+        return [self.build_email(context=context, **kwargs) for context in contexts]
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        compiled_templates.invalidate(self.pk)
+
+    def delete(self, *args, **kwargs):
+        pk = self.pk
+        result = super().delete(*args, **kwargs)
+        compiled_templates.invalidate(pk)
+        return result
+
     def __str__(self):
         return f"Email Template '{self.slug}' ({self.subject:.50}...)"
 
@@ -0,0 +1,114 @@
+"""Compact representation of objects stored in autoemail RQ jobs.
+
+Actions are pickled into Redis both as the job's callable and in the job's
+metadata. Instead of whole model instances (with all their cached relations),
+they store references: model label and primary key. Referenced objects are
+loaded from the database again only when they're needed, usually when the job
+is executed by a worker."""
+from typing import Any
+
+from django.apps import apps
+from django.db import models
+
+# Increase when the payload format changes; older payloads must stay loadable.
+PAYLOAD_VERSION = 1
+
+MODEL_REFERENCE_KEY = "__model__"
+
+
+class PayloadVersionError(ValueError):
+    pass
+
+
+def dump(value: Any) -> Any:
+    """Replace saved model instances with references, also inside lists, tuples
+    and dictionaries. Other values are left intact."""
+    if isinstance(value, models.Model) and value.pk is not None:
+        return {MODEL_REFERENCE_KEY: value._meta.label_lower, "pk": value.pk}
+    if isinstance(value, (list, tuple)):
+        return type(value)(dump(item) for item in value)
+    if isinstance(value, dict):
+        return {key: dump(item) for key, item in value.items()}
+    return value
+
+
+def load(value: Any) -> Any:
+    """Reverse `dump()`: fetch referenced model instances from the database."""
+    if isinstance(value, dict):
+        if MODEL_REFERENCE_KEY in value:
+            model = apps.get_model(value[MODEL_REFERENCE_KEY])
+            return model._default_manager.get(pk=value["pk"])
+        return {key: load(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(load(item) for item in value)
+    return value
+
+
+def check_version(state: dict) -> None:
+    version = state.get("version", 0)
+    if version > PAYLOAD_VERSION:
+        raise PayloadVersionError(
+            f"Job payload version {version} is newer than supported version "
+            f"{PAYLOAD_VERSION}."
+        )
+
+
+def snapshot(instance: models.Model) -> dict:
+    """Store values of all concrete fields, so that an instance (possibly edited
+    after it was scheduled) can be restored without the database."""
+    return {
+        MODEL_REFERENCE_KEY: instance._meta.label_lower,
+        "fields": {
+            field.attname: getattr(instance, field.attname)
+            for field in instance._meta.concrete_fields
+        },
+    }
+
+
+def restore(value: dict) -> models.Model:
+    """Reverse `snapshot()`."""
+    model = apps.get_model(value[MODEL_REFERENCE_KEY])
+    return model(**value["fields"])
+
+
+class PayloadMixin:
+    """Pickle only attributes listed in `payload_attributes`, with model instances
+    replaced by references (see `dump()`).
+
+    After unpickling, referenced objects are loaded on first access to the
+    attribute, so merely fetching a job (e.g. when listing scheduled jobs) doesn't
+    hit the database."""
+
+    payload_attributes: tuple[str, ...] = ()
+
+    def __getstate__(self) -> dict:
+        # attributes which weren't loaded yet don't need to be dumped again
+        not_loaded = self.__dict__.get("_payload", {})
+        state = {"version": PAYLOAD_VERSION}
+        for name in self.payload_attributes:
+            if name in not_loaded:
+                state[name] = not_loaded[name]
+            else:
+                state[name] = dump(self.__dict__.get(name))
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        check_version(state)
+        if "version" not in state:
+            # object pickled as a whole, before payloads were introduced
+            self.__dict__.update(state)
+            return
+
+        self.__dict__["_payload"] = {
+            name: state[name] for name in self.payload_attributes if name in state
+        }
+
+    def __getattr__(self, name: str) -> Any:
+        # only called when regular attribute lookup fails
+        payload = self.__dict__.get("_payload")
+        if payload is not None and name in payload:
+            value = self.__dict__[name] = load(payload.pop(name))
+            return value
+        raise AttributeError(
+            f"{type(self).__name__!r} object has no attribute {name!r}"
+        )
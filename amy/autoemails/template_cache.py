@@ -0,0 +1,86 @@
+from collections import OrderedDict
+import hashlib
+from threading import Lock, local
+from typing import Hashable, Optional
+
+from django.template import Template, engines
+import markdown
+
+# Maximum number of compiled templates kept in memory by a single process.
+TEMPLATE_CACHE_SIZE = 512
+
+
+class CompiledTemplateCache:
+    """Bounded LRU cache of compiled Django templates.
+
+    Entries are keyed by template engine, email template ID and a hash of the
+    template content, so an edited template never renders stale content, even
+    before its cached entries are invalidated."""
+
+    def __init__(self, maxsize: int = TEMPLATE_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._templates: OrderedDict[Hashable, Template] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    @staticmethod
+    def key(engine: str, template_id: Optional[int], content: str) -> Hashable:
+        digest = hashlib.sha1(content.encode("utf-8")).hexdigest()
+        return (engine, template_id, digest)
+
+    def get_or_compile(
+        self,
+        content: str,
+        engine: str = "db_backend",
+        template_id: Optional[int] = None,
+    ) -> Template:
+        key = self.key(engine, template_id, content)
+        with self._lock:
+            try:
+                self._templates.move_to_end(key)
+                self.hits += 1
+                return self._templates[key]
+            except KeyError:
+                self.misses += 1
+
+        # compile outside of the lock; syntax errors aren't cached
+        template = engines[engine].from_string(content)
+
+        with self._lock:
+            self._templates[key] = template
+            self._templates.move_to_end(key)
+            while len(self._templates) > self.maxsize:
+                self._templates.popitem(last=False)
+        return template
+
+    def invalidate(self, template_id: Optional[int]) -> None:
+        """Remove all compiled templates of given email template."""
+        with self._lock:
+            for key in [key for key in self._templates if key[1] == template_id]:
+                del self._templates[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+compiled_templates = CompiledTemplateCache()
+
+
+_markdown = local()
+
+
+def markdown_to_html(text: str) -> str:
+    """Convert Markdown to HTML, reusing a per-thread converter (creating one sets
+    up all Markdown processors, which is slower than the conversion itself)."""
+    try:
+        converter = _markdown.converter
+    except AttributeError:
+        converter = _markdown.converter = markdown.Markdown()
+    return converter.reset().convert(text)
@@ -1,5 +1,5 @@
 from datetime import date, datetime, timedelta
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from django.test import RequestFactory, TestCase
 from rq.exceptions import NoSuchJobError
@@ -10,6 +10,7 @@ from autoemails.base_views import ActionManageMixin
 from autoemails.job import Job
 from autoemails.models import EmailTemplate, RQJob, Trigger
 from autoemails.tests.base import FakeRedisTestCaseMixin, dummy_job
+from autoemails.utils import scheduled_execution_time
 from workshops.models import Event, Organization, Person, Role, Tag, Task
 
 
@@ -177,6 +178,97 @@ class TestActionManageMixin(FakeRedisTestCaseMixin, TestCase):
         self.assertEqual(rqjob.job_id, job.get_id())
         self.assertEqual(rqjob.trigger, trigger)
 
+    def testActionAddingUsesSingleRedisPipeline(self):
+        Trigger.objects.create(
+            action="test-action", template=EmailTemplate.objects.create(slug="other")
+        )
+        triggers = Trigger.objects.filter(action="test-action").order_by("pk")
+
+        with patch.object(
+            self.connection, "pipeline", wraps=self.connection.pipeline
+        ) as mock_pipeline:
+            jobs, rqjobs = ActionManageMixin.add(
+                action_class=NewInstructorAction,
+                logger=MagicMock(),
+                scheduler=self.scheduler,
+                triggers=triggers,
+                context_objects=dict(task=self.task, event=self.task.event),
+                object_=self.task,
+            )
+
+        mock_pipeline.assert_called_once()
+        self.assertEqual(self.scheduler.count(), 2)
+        self.assertEqual(len(jobs), 2)
+        self.assertEqual(set(self.task.rq_jobs.all()), set(rqjobs))
+        for job, rqjob, trigger in zip(jobs, rqjobs, triggers):
+            self.assertEqual(rqjob.job_id, job.get_id())
+            self.assertEqual(rqjob.trigger, trigger)
+            self.assertEqual(rqjob.status, "scheduled")
+            # scheduled execution time is calculated locally, but it's the same
+            # as in RQ-Scheduler
+            self.assertEqual(
+                rqjob.scheduled_execution,
+                scheduled_execution_time(
+                    job.get_id(), scheduler=self.scheduler, naive=False
+                ),
+            )
+
+    def testActionBulkAdding(self):
+        second_task = Task.objects.create(
+            event=self.event,
+            person=Person.objects.create(
+                personal="Hermione",
+                family="Granger",
+                email="hg@magic.uk",
+                username="granger_hermione",
+            ),
+            role=self.role,
+        )
+        tasks = [self.task, second_task]
+
+        # assertions before the action is invoked
+        self.assertEqual(self.scheduler.count(), 0)
+        self.assertEqual(RQJob.objects.count(), 0)
+
+        # trigger, RQJob and task-RQJob relations queries
+        with self.assertNumQueries(3):
+            jobs, rqjobs = ActionManageMixin.bulk_add(
+                action_class=NewInstructorAction,
+                logger=MagicMock(),
+                scheduler=self.scheduler,
+                triggers=Trigger.objects.filter(pk=self.trigger.pk),
+                objects=[(dict(task=task, event=task.event), task) for task in tasks],
+            )
+
+        self.assertEqual(self.scheduler.count(), 2)
+        self.assertEqual(len(jobs), 2)
+        self.assertEqual(
+            {job.get_id() for job in self.scheduler.get_jobs()},
+            {job.get_id() for job in jobs},
+        )
+
+        for task, job, rqjob in zip(tasks, jobs, rqjobs):
+            # proper action is scheduled
+            self.assertEqual(
+                job.instance,
+                NewInstructorAction(
+                    trigger=self.trigger,
+                    objects=dict(task=task, event=task.event),
+                ),
+            )
+            # job is saved in the task
+            self.assertEqual(list(task.rq_jobs.all()), [rqjob])
+            self.assertEqual(rqjob.job_id, job.get_id())
+            self.assertEqual(rqjob.status, "scheduled")
+            self.assertEqual(rqjob.event_slug, "test-event")
+            # scheduled execution time is the same as in RQ-Scheduler
+            self.assertEqual(
+                rqjob.scheduled_execution,
+                scheduled_execution_time(
+                    job.get_id(), scheduler=self.scheduler, naive=False
+                ),
+            )
+
     def testActionRemove(self):
         trigger = self.trigger
         task = self.task
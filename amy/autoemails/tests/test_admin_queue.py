@@ -1,4 +1,5 @@
 from datetime import timedelta
+from unittest.mock import patch
 
 from django.test import TestCase
 from django.urls import reverse
@@ -74,3 +75,22 @@ class TestAdminQueueView(SuperuserMixin, FakeRedisTestCaseMixin, TestCase):
         queue = rv.context["queue"]
         job2, time = queue[0]
         self.assertEqual(job, job2)
+
+    def test_queue_paginated(self):
+        self._logSuperuserIn()
+        jobs = [
+            self.scheduler.enqueue_in(timedelta(hours=hours), dummy_job)
+            for hours in range(1, 6)
+        ]
+
+        with patch.object(admin.EmailTemplateAdmin, "list_per_page", 2):
+            rv = self.client.get(self.url)
+            self.assertEqual([job for job, _ in rv.context["queue"]], jobs[:2])
+            self.assertEqual(rv.context["page"].paginator.count, 5)
+
+            rv = self.client.get(self.url, {"page": 3})
+            self.assertEqual([job for job, _ in rv.context["queue"]], jobs[4:])
+
+            # out-of-range pages show the last page
+            rv = self.client.get(self.url, {"page": 10})
+            self.assertEqual(rv.context["page"].number, 3)
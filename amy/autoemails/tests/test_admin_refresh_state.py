@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+
+from autoemails import admin
+from autoemails.models import EmailTemplate, RQJob, Trigger
+from autoemails.tests.base import FakeRedisTestCaseMixin, dummy_job
+from workshops.tests.base import SuperuserMixin
+
+
+class TestAdminRefreshState(SuperuserMixin, FakeRedisTestCaseMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self._setUpSuperuser()  # creates self.admin
+
+        # save scheduler and connection data
+        self._saved_scheduler = admin.scheduler
+        # overwrite
+        admin.scheduler = self.scheduler
+
+        self.email = EmailTemplate.objects.create(slug="test-1")
+        self.trigger = Trigger.objects.create(
+            action="new-instructor", template=self.email
+        )
+        self.url = reverse("admin:autoemails_rqjob_changelist")
+
+    def tearDown(self):
+        super().tearDown()
+        # bring back saved scheduler
+        admin.scheduler = self._saved_scheduler
+
+    def test_refresh_state(self):
+        self._logSuperuserIn()
+        scheduled = self.scheduler.enqueue_in(timedelta(minutes=10), dummy_job)
+        cancelled = self.scheduler.enqueue_in(timedelta(minutes=10), dummy_job)
+        self.scheduler.cancel(cancelled)
+        rqjobs = [
+            RQJob.objects.create(job_id=job_id, trigger=self.trigger, status="")
+            for job_id in [scheduled.id, cancelled.id, "fake-id"]
+        ]
+        last_updated = [rqjob.last_updated_at for rqjob in rqjobs]
+
+        rv = self.client.post(
+            self.url,
+            {
+                "action": "action_refresh_state",
+                "_selected_action": [rqjob.pk for rqjob in rqjobs],
+            },
+            follow=True,
+        )
+
+        self.assertContains(rv, "Refreshed status of 2 RQJob(s).")
+        rqjobs[0].refresh_from_db()
+        self.assertEqual(rqjobs[0].status, "scheduled")
+        self.assertGreater(rqjobs[0].last_updated_at, last_updated[0])
+        rqjobs[1].refresh_from_db()
+        self.assertEqual(rqjobs[1].status, "cancelled")
+        self.assertGreater(rqjobs[1].last_updated_at, last_updated[1])
+        rqjobs[2].refresh_from_db()
+        self.assertEqual(rqjobs[2].status, "")
+        self.assertEqual(rqjobs[2].last_updated_at, last_updated[2])
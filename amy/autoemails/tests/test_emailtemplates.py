@@ -4,6 +4,7 @@ from django.template.exceptions import TemplateDoesNotExist, TemplateSyntaxError
 from django.test import TestCase
 
 from autoemails.models import EmailTemplate
+from autoemails.template_cache import compiled_templates
 
 
 class TestEmailTemplate(TestCase):
@@ -175,6 +176,46 @@ Regional Coordinator""",
 Regional Coordinator</p>""",
         )
 
+    def test_compiled_templates_reused(self):
+        tpl = self.prepare_template()
+        ctx = self.prepare_context()
+        tpl.build_email(context=ctx)
+        misses = compiled_templates.misses
+
+        tpl.build_email(context=dict(ctx, user="Ron"))
+
+        self.assertEqual(compiled_templates.misses, misses)
+
+    def test_compiled_templates_invalidated_on_save(self):
+        tpl = self.prepare_template()
+        ctx = self.prepare_context()
+        self.assertEqual(tpl.get_subject(context=ctx), "Welcome to AMY")
+
+        tpl.subject = "Goodbye from {{ site.name }}"
+        tpl.save()
+
+        self.assertFalse(
+            [key for key in compiled_templates._templates if key[1] == tpl.pk]
+        )
+        self.assertEqual(tpl.get_subject(context=ctx), "Goodbye from AMY")
+
+    def test_build_emails(self):
+        tpl = self.prepare_template()
+        ctx = self.prepare_context()
+
+        emails = tpl.build_emails(
+            [dict(ctx, user="Harry"), dict(ctx, user="Ron")],
+            recipients=["hogwarts@example.org"],
+        )
+
+        self.assertEqual(len(emails), 2)
+        self.assertTrue(emails[0].body.startswith("Welcome, Harry!"))
+        self.assertTrue(emails[1].body.startswith("Welcome, Ron!"))
+        for email in emails:
+            self.assertEqual(email.subject, "Welcome to AMY")
+            self.assertEqual(email.to, ["hogwarts@example.org"])
+            self.assertEqual(email.reply_to, ["regional@example.org"])
+
     def test_syntax_check(self):
         """All fields should have Django syntax check validation enabled."""
         # case 1: wrong tag
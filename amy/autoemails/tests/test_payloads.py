@@ -0,0 +1,126 @@
+from datetime import date, timedelta
+import pickle
+
+from django.db import models
+from django.test import TestCase
+
+from autoemails.actions import NewInstructorAction, UpdateProfileReminderRepeatedAction
+from autoemails.models import EmailTemplate, Trigger
+from autoemails.payloads import PAYLOAD_VERSION, PayloadVersionError, dump, load
+from workshops.models import Event, Organization, Person, Role, Task
+
+
+def contains_model_instances(value) -> bool:
+    if isinstance(value, models.Model):
+        return True
+    if isinstance(value, dict):
+        return any(contains_model_instances(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(contains_model_instances(item) for item in value)
+    return False
+
+
+class TestActionPayload(TestCase):
+    def setUp(self):
+        self.template = EmailTemplate.objects.create(
+            slug="test", subject="Hello", body_template="Hi {{ workshop.slug }}!"
+        )
+        self.trigger = Trigger.objects.create(
+            action="new-instructor", template=self.template
+        )
+        self.event = Event.objects.create(
+            slug="test-event",
+            host=Organization.objects.first(),
+            start=date.today() + timedelta(days=7),
+            end=date.today() + timedelta(days=8),
+        )
+        self.person = Person.objects.create(
+            personal="Harry", family="Potter", email="hp@magic.uk"
+        )
+        self.task = Task.objects.create(
+            event=self.event,
+            person=self.person,
+            role=Role.objects.create(name="instructor"),
+        )
+        self.action = NewInstructorAction(
+            trigger=self.trigger,
+            objects=dict(event=self.event, task=self.task),
+        )
+
+    def test_dump_and_load(self):
+        value = {"event": self.event, "emails": ["a@example.org"], "tasks": [self.task]}
+
+        dumped = dump(value)
+
+        self.assertEqual(
+            dumped,
+            {
+                "event": {"__model__": "workshops.event", "pk": self.event.pk},
+                "emails": ["a@example.org"],
+                "tasks": [{"__model__": "workshops.task", "pk": self.task.pk}],
+            },
+        )
+        self.assertEqual(load(dumped), value)
+
+    def test_state_contains_only_references(self):
+        state = self.action.__getstate__()
+
+        self.assertEqual(state["version"], PAYLOAD_VERSION)
+        self.assertEqual(
+            state["context_objects"]["task"],
+            {"__model__": "workshops.task", "pk": self.task.pk},
+        )
+        self.assertFalse(contains_model_instances(state))
+
+    def test_roundtrip_loads_objects_lazily(self):
+        data = pickle.dumps(self.action)
+
+        with self.assertNumQueries(0):
+            action = pickle.loads(data)
+            self.assertEqual(action.template, self.template)
+
+        # trigger, event and task
+        with self.assertNumQueries(3):
+            self.assertEqual(action, self.action)
+        self.assertEqual(action.context_objects["task"].person, self.person)
+
+    def test_template_contents_kept(self):
+        self.action.template.body_template = "Changed {{ workshop.slug }}"
+
+        action = pickle.loads(pickle.dumps(self.action))
+
+        self.assertEqual(action.template.body_template, "Changed {{ workshop.slug }}")
+        email = action._email()
+        self.assertEqual(email.body, "Changed test-event")
+
+    def test_repickling_doesnt_load_objects(self):
+        action = pickle.loads(pickle.dumps(self.action))
+
+        with self.assertNumQueries(0):
+            action = pickle.loads(pickle.dumps(action))
+        self.assertEqual(action, self.action)
+
+    def test_pickled_before_payloads(self):
+        action = NewInstructorAction.__new__(NewInstructorAction)
+        action.__setstate__(dict(self.action.__dict__))
+
+        self.assertEqual(action, self.action)
+        self.assertIs(action.context_objects["task"], self.task)
+
+    def test_newer_payload_version(self):
+        state = self.action.__getstate__()
+        state["version"] = PAYLOAD_VERSION + 1
+        action = NewInstructorAction.__new__(NewInstructorAction)
+
+        with self.assertRaises(PayloadVersionError):
+            action.__setstate__(state)
+
+    def test_repeated_action(self):
+        action = UpdateProfileReminderRepeatedAction(trigger=self.trigger)
+
+        state = action.__getstate__()
+        restored = pickle.loads(pickle.dumps(action))
+
+        self.assertFalse(contains_model_instances(state))
+        self.assertEqual(restored.trigger, self.trigger)
+        self.assertEqual(restored.template, self.template)
@@ -0,0 +1,60 @@
+from django.template.exceptions import TemplateSyntaxError
+from django.test import TestCase
+
+from autoemails.template_cache import CompiledTemplateCache, markdown_to_html
+
+
+class TestCompiledTemplateCache(TestCase):
+    def setUp(self):
+        self.cache = CompiledTemplateCache(maxsize=2)
+
+    def test_template_compiled_once(self):
+        template1 = self.cache.get_or_compile("Hello {{ name }}", template_id=1)
+        template2 = self.cache.get_or_compile("Hello {{ name }}", template_id=1)
+
+        self.assertIs(template1, template2)
+        self.assertEqual(template1.render({"name": "Harry"}), "Hello Harry")
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_content_change_compiles_new_template(self):
+        self.cache.get_or_compile("Hello {{ name }}", template_id=1)
+        template = self.cache.get_or_compile("Bye {{ name }}", template_id=1)
+
+        self.assertEqual(template.render({"name": "Harry"}), "Bye Harry")
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_least_recently_used_evicted(self):
+        self.cache.get_or_compile("a", template_id=1)
+        self.cache.get_or_compile("b", template_id=1)
+        self.cache.get_or_compile("a", template_id=1)
+        self.cache.get_or_compile("c", template_id=1)
+
+        self.assertEqual(len(self.cache), 2)
+        self.cache.get_or_compile("a", template_id=1)
+        self.assertEqual(self.cache.hits, 2)
+        self.cache.get_or_compile("b", template_id=1)
+        self.assertEqual(self.cache.misses, 4)
+
+    def test_invalidate(self):
+        self.cache.get_or_compile("a", template_id=1)
+        self.cache.get_or_compile("a", template_id=2)
+
+        self.cache.invalidate(1)
+
+        self.assertEqual(len(self.cache), 1)
+        self.cache.get_or_compile("a", template_id=2)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_syntax_errors_not_cached(self):
+        with self.assertRaises(TemplateSyntaxError):
+            self.cache.get_or_compile("{% if %}", template_id=1)
+        self.assertEqual(len(self.cache), 0)
+
+
+class TestMarkdownToHtml(TestCase):
+    def test_converter_reused(self):
+        self.assertEqual(
+            markdown_to_html("* a\n* b"), "<ul>\n<li>a</li>\n<li>b</li>\n</ul>"
+        )
+        # converter's state is reset between conversions
+        self.assertEqual(markdown_to_html("text"), "<p>text</p>")
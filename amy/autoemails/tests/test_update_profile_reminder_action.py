@@ -44,3 +44,27 @@ class TestUpdateProfileRepeatedAction(TestCase):
         self.assertCountEqual([job.recipients for job in rq_jobs], [p1.email, p2.email])
         for job in rq_jobs:
             self.assertEqual(job.action_name, ProfileUpdateReminderAction.__name__)
+
+    def test_action_scheduled_in_chunks(self) -> None:
+        people = [
+            Person.objects.create(
+                personal="Harry",
+                family="Potter",
+                username=f"hpotter{i}",
+                email=f"hp{i}@magic.uk",
+                is_active=True,
+            )
+            for i in range(3)
+        ]
+        self.action.CHUNK_SIZE = 2
+
+        stats = self.action()
+
+        self.assertEqual(stats["action"], ProfileUpdateReminderAction.__name__)
+        self.assertEqual(stats["objects"], 3)
+        self.assertEqual(stats["jobs"], 3)
+        self.assertGreaterEqual(stats["duration"], 0)
+        for person in people:
+            self.assertEqual(
+                [job.recipients for job in person.rq_jobs.all()], [person.email]
+            )
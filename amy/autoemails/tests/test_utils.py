@@ -8,7 +8,9 @@ from rq_scheduler.utils import to_unix
 
 from autoemails.tests.base import FakeRedisTestCaseMixin, dummy_fail_job, dummy_job
 from autoemails.utils import (
+    ScheduledJobs,
     check_status,
+    check_statuses,
     safe_next_or_default_url,
     scheduled_execution_time,
 )
@@ -166,6 +168,77 @@ class TestCheckStatus(FakeRedisTestCaseMixin, TestCase):
         self.assertEqual(rv, "deferred")
 
 
+class TestCheckStatuses(FakeRedisTestCaseMixin, TestCase):
+    def test_statuses(self):
+        scheduled = self.scheduler.enqueue_in(timedelta(minutes=5), dummy_job)
+        queued = self.scheduler.enqueue_in(timedelta(minutes=5), dummy_job)
+        self.scheduler.enqueue_job(queued)
+        cancelled = self.scheduler.enqueue_in(timedelta(minutes=5), dummy_job)
+        self.scheduler.cancel(cancelled)
+        job_ids = [scheduled.id, queued.id, cancelled.id, "doesn't exist"]
+
+        rv = check_statuses(job_ids, self.scheduler)
+
+        self.assertEqual(
+            rv,
+            {
+                scheduled.id: "scheduled",
+                queued.id: "queued",
+                cancelled.id: "cancelled",
+                "doesn't exist": None,
+            },
+        )
+        # results are the same as from `check_status`
+        for job_id in job_ids:
+            self.assertEqual(rv[job_id], check_status(job_id, self.scheduler))
+
+    def test_no_jobs(self):
+        self.assertEqual(check_statuses([], self.scheduler), {})
+
+
+class TestScheduledJobs(FakeRedisTestCaseMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.jobs = [
+            self.scheduler.enqueue_in(timedelta(minutes=minutes), dummy_job)
+            for minutes in [30, 10, 20]
+        ]
+
+    def test_len(self):
+        self.assertEqual(len(ScheduledJobs(self.scheduler)), 3)
+
+    def test_slices_ordered_by_scheduled_time(self):
+        expected = list(self.scheduler.get_jobs(with_times=True))
+        jobs = ScheduledJobs(self.scheduler)
+
+        self.assertEqual(jobs[0:3], expected)
+        self.assertEqual(jobs[1:], expected[1:])
+        self.assertEqual(jobs[:1], expected[:1])
+        self.assertEqual(jobs[2:10], expected[2:])
+        self.assertEqual(jobs[2:2], [])
+        self.assertEqual(
+            [job for job, _ in jobs[:]],
+            [self.jobs[1], self.jobs[2], self.jobs[0]],
+        )
+
+    def test_only_slicing_supported(self):
+        jobs = ScheduledJobs(self.scheduler)
+        with self.assertRaises(TypeError):
+            jobs[0]
+        with self.assertRaises(TypeError):
+            jobs[::2]
+        with self.assertRaises(ValueError):
+            jobs[-1:]
+
+    def test_missing_jobs_removed(self):
+        self.jobs[1].delete()
+
+        rv = ScheduledJobs(self.scheduler)[:]
+
+        self.assertEqual([job for job, _ in rv], [self.jobs[2], self.jobs[0]])
+        self.assertEqual(len(ScheduledJobs(self.scheduler)), 2)
+
+
 class TestSafeNextOrDefaultURL(TestCase):
     def test_default_url_if_next_empty(self):
         # Arrange
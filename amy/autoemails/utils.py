@@ -1,4 +1,4 @@
-from typing import Optional, Union
+from typing import Iterable, Optional, Union
 
 from django.conf import settings
 from django.utils.http import is_safe_url
@@ -6,6 +6,7 @@ import django_rq
 import pytz
 from rq.exceptions import NoSuchJobError
 from rq.job import Job
+from rq.utils import as_text
 from rq_scheduler.utils import from_unix
 
 
@@ -70,6 +71,80 @@ def check_status(job: Union[str, Job], scheduler=None):
         return job.get_status() or "cancelled"
 
 
+def check_statuses(job_ids: Iterable[str], scheduler=None) -> dict:
+    """Bulk version of `check_status()`: statuses of all jobs are read from Redis
+    in a single pipeline. Jobs that don't exist are mapped to `None`."""
+    _scheduler = scheduler
+    if not scheduler:
+        _scheduler = django_rq.get_scheduler("default")
+
+    job_ids = list(job_ids)
+    with _scheduler.connection.pipeline() as pipeline:
+        for job_id in job_ids:
+            pipeline.exists(_scheduler.job_class.key_for(job_id))
+            pipeline.hget(_scheduler.job_class.key_for(job_id), "status")
+            pipeline.zscore(_scheduler.scheduled_jobs_key, job_id)
+        results = pipeline.execute()
+
+    statuses = {}
+    triples = zip(results[::3], results[1::3], results[2::3])
+    for job_id, (exists, status, scheduled) in zip(job_ids, triples):
+        if not exists:
+            statuses[job_id] = None
+        elif scheduled:
+            statuses[job_id] = as_text(status) or "scheduled"
+        else:
+            statuses[job_id] = as_text(status) or "cancelled"
+    return statuses
+
+
+class ScheduledJobs:
+    """Lazy sequence of `(job, scheduled time)` pairs from RQ-Scheduler, ordered
+    by scheduled time.
+
+    Unlike `scheduler.get_jobs()`, only the requested slice of the scheduler's
+    sorted set is read, and jobs are fetched in a single pipeline, so it can be
+    used with a `Paginator`."""
+
+    def __init__(self, scheduler=None) -> None:
+        self.scheduler = scheduler or django_rq.get_scheduler("default")
+
+    def __len__(self) -> int:
+        return self.scheduler.connection.zcard(self.scheduler.scheduled_jobs_key)
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice) or key.step is not None:
+            raise TypeError("ScheduledJobs supports only slicing without a step.")
+        start, stop = key.start or 0, key.stop
+        if start < 0 or (stop is not None and stop < 0):
+            raise ValueError("Negative indexing is not supported.")
+        if stop is not None and stop <= start:
+            return []
+
+        entries = self.scheduler.connection.zrange(
+            self.scheduler.scheduled_jobs_key,
+            start,
+            -1 if stop is None else stop - 1,
+            withscores=True,
+        )
+        job_ids = [as_text(job_id) for job_id, _ in entries]
+        jobs = self.scheduler.job_class.fetch_many(
+            job_ids, connection=self.scheduler.connection
+        )
+
+        page = []
+        missing = []
+        for job_id, job, (_, score) in zip(job_ids, jobs, entries):
+            if job is None:
+                missing.append(job_id)
+            else:
+                page.append((job, from_unix(score)))
+        if missing:
+            # like `scheduler.get_jobs()`, remove jobs that don't exist anymore
+            self.scheduler.connection.zrem(self.scheduler.scheduled_jobs_key, *missing)
+        return page
+
+
 def safe_next_or_default_url(next_url: Optional[str], default: str) -> str:
     if next_url is not None and is_safe_url(next_url, settings.ALLOWED_HOSTS):
         return next_url
@@ -0,0 +1,89 @@
+"""Cache of people's "consented to all required terms" status.
+
+The status is checked by `TermsMiddleware` on every request, so it's kept in the
+default cache. Each cached value is tagged with a global "required terms
+version", which is bumped whenever anything that may affect many people changes
+(e.g. a term is created or archived). Changes affecting a single person only
+invalidate that person's entry.
+"""
+from typing import Optional, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+
+REQUIRED_TERMS_VERSION_KEY = "consents:required-terms-version"
+CONSENT_STATUS_KEY = "consents:status:{person_id}"
+CONSENT_STATUS_TIMEOUT = 24 * 60 * 60  # 1 day
+
+
+def _person_token(person) -> str:
+    # Primary keys can be reused (e.g. after restoring a database backup, or by
+    # separate test databases), so the creation timestamp is part of the entry.
+    return person.created_at.isoformat() if person.created_at else ""
+
+
+def get_cached_consent_status(person) -> Tuple[Optional[bool], int]:
+    """Return cached consent status of the person (or None if it's not cached or
+    outdated) and current required terms version. Usually uses a single cache
+    round-trip.
+
+    The version should be passed to `set_cached_consent_status` once the status
+    is calculated, so that a status calculated concurrently with a change in terms
+    isn't cached as a current one."""
+    key = CONSENT_STATUS_KEY.format(person_id=person.pk)
+    values = cache.get_many([REQUIRED_TERMS_VERSION_KEY, key])
+    version = values.get(REQUIRED_TERMS_VERSION_KEY)
+    if version is None:
+        cache.add(REQUIRED_TERMS_VERSION_KEY, 1, timeout=None)
+        return None, cache.get(REQUIRED_TERMS_VERSION_KEY)
+
+    try:
+        cached_version, token, status = values[key]
+    except (KeyError, TypeError, ValueError):
+        return None, version
+
+    if cached_version != version or token != _person_token(person):
+        return None, version
+    return status, version
+
+
+def set_cached_consent_status(person, status: bool, version: int) -> None:
+    cache.set(
+        CONSENT_STATUS_KEY.format(person_id=person.pk),
+        (version, _person_token(person), status),
+        timeout=CONSENT_STATUS_TIMEOUT,
+    )
+
+
+def _bump_required_terms_version() -> None:
+    try:
+        cache.incr(REQUIRED_TERMS_VERSION_KEY)
+    except ValueError:
+        # key doesn't exist, so nothing was cached with it
+        pass
+
+
+def _delete_consent_statuses(person_ids) -> None:
+    cache.delete_many(
+        [CONSENT_STATUS_KEY.format(person_id=person_id) for person_id in person_ids]
+    )
+
+
+def invalidate_all_consent_statuses() -> None:
+    """Invalidate cached consent status of all people.
+
+    Invalidation happens both immediately and after the current transaction
+    commits, so that a status computed from not yet committed data by a concurrent
+    request isn't kept in the cache."""
+    _bump_required_terms_version()
+    transaction.on_commit(_bump_required_terms_version)
+
+
+def invalidate_consent_status(*person_ids: int) -> None:
+    """Invalidate cached consent status of given people (see
+    `invalidate_all_consent_statuses` for details)."""
+    person_ids = [person_id for person_id in person_ids if person_id is not None]
+    if not person_ids:
+        return
+    _delete_consent_statuses(person_ids)
+    transaction.on_commit(lambda: _delete_consent_statuses(person_ids))
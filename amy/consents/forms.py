@@ -3,6 +3,7 @@ from typing import Iterable, List
 from django import forms
 from django.db.models.fields import BLANK_CHOICE_DASH
 
+from consents.cache import invalidate_consent_status
 from consents.models import Consent, Term, TermOption
 from workshops.forms import BootstrapHelper, WidgetOverrideMixin
 from workshops.models import Person
@@ -88,6 +89,7 @@ class BaseTermConsentsForm(WidgetOverrideMixin, forms.ModelForm):
                 Consent(person=person, term_option_id=option_id, term_id=term.id)
             )
         Consent.objects.bulk_create(new_consents)
+        invalidate_consent_status(person.pk)
 
     def get_terms(self) -> Iterable[Term]:
         return Term.objects.all().prefetch_active_options()
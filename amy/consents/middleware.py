@@ -2,7 +2,7 @@ from django.shortcuts import redirect
 from django.urls import reverse
 from django.utils.http import urlencode
 
-from consents.util import person_has_consented_to_required_terms
+from consents.util import person_has_consented_to_required_terms_cached
 
 
 class TermsMiddleware:
@@ -32,7 +32,7 @@ class TermsMiddleware:
         if (
             request.path not in allowed_urls
             and not request.user.is_anonymous
-            and not person_has_consented_to_required_terms(request.user)
+            and not person_has_consented_to_required_terms_cached(request.user)
         ):
             return redirect(url)
         else:
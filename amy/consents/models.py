@@ -1,17 +1,23 @@
 from __future__ import annotations
 
-from typing import Iterable, Optional
+from itertools import islice
+from typing import Iterable, Iterator, Optional
 
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Prefetch
 from django.utils import timezone
 from django.utils.functional import cached_property
 
 from autoemails.mixins import RQJobsMixin
+from consents.cache import invalidate_all_consent_statuses
 from workshops.mixins import CreatedUpdatedArchivedMixin
 from workshops.models import STR_MED, Person
 
+# Consents for all people (or all consents of a term) are created in batches of
+# this size, so that memory usage doesn't grow with the number of people.
+CONSENT_BATCH_SIZE = 1000
+
 
 class TermQuerySet(models.query.QuerySet):
     def active(self):
@@ -80,6 +86,7 @@ class Term(CreatedUpdatedArchivedMixin, RQJobsMixin, models.Model):
             archived_at=self.archived_at
         )
         Consent.objects.filter(term=self).active().update(archived_at=self.archived_at)
+        invalidate_all_consent_statuses()
 
     def __str__(self) -> str:
         return self.slug
@@ -128,6 +135,7 @@ class TermOption(CreatedUpdatedArchivedMixin, models.Model):
         Consent.objects.filter(term_option=self).active().update(
             archived_at=self.archived_at
         )
+        invalidate_all_consent_statuses()
 
     def _check_is_only_agree_option_for_required_term(self) -> None:
         """
@@ -178,20 +186,47 @@ class Consent(CreatedUpdatedArchivedMixin, models.Model):
         return super().save(*args, **kwargs)
 
     @classmethod
-    def create_unset_consents_for_term(cls, term: Term) -> None:
+    def bulk_create_in_batches(
+        cls, consents: Iterable[Consent], batch_size: int = CONSENT_BATCH_SIZE
+    ) -> int:
+        """
+        Save consents from (possibly lazy) iterable, at most `batch_size` of them
+        at a time. Returns number of created consents.
+        """
+        iterator = iter(consents)
+        count = 0
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                return count
+            cls.objects.bulk_create(batch)
+            count += len(batch)
+
+    @classmethod
+    def create_unset_consents_for_term(
+        cls, term: Term, batch_size: int = CONSENT_BATCH_SIZE
+    ) -> int:
         """
         Creates unset consents for all users with the given term.
 
         Used when a term is first created so that unset consents
-        are stored in the database for any given term.
+        are stored in the database for any given term. Only IDs of people
+        are read from the database, in chunks.
         """
-        cls.objects.bulk_create(
-            cls(
-                person=person,
-                term=term,
-                term_option=None,
-            )
-            for person in Person.objects.all()
+        person_ids = Person.objects.values_list("pk", flat=True).iterator(
+            chunk_size=batch_size
+        )
+        return cls.bulk_create_in_batches(
+            (
+                cls(
+                    person_id=person_id,
+                    term=term,
+                    term_option=None,
+                    archived_at=term.archived_at,
+                )
+                for person_id in person_ids
+            ),
+            batch_size=batch_size,
         )
 
     def archive(self) -> None:
@@ -209,17 +244,34 @@ class Consent(CreatedUpdatedArchivedMixin, models.Model):
         cls.archive_all(consents)
 
     @classmethod
-    def archive_all(cls, consents: Iterable[Consent]) -> None:
-        new_consents = [
-            cls(
-                person_id=consent.person_id,
-                term_id=consent.term_id,
-                term_option=None,
-            )
-            for consent in consents
-        ]
-        consents.update(archived_at=timezone.now())
-        cls.objects.bulk_create(new_consents)
+    def archive_all(
+        cls, consents: models.QuerySet[Consent], batch_size: int = CONSENT_BATCH_SIZE
+    ) -> None:
+        """
+        Archive given consents and replace them with new unset consents.
+
+        Consents are processed in batches: each batch is archived before its
+        replacements are created, so that there's at most one active consent
+        per person and term at any time.
+        """
+        archived_at = timezone.now()
+        rows: Iterator[tuple[int, int, int]] = consents.values_list(
+            "pk", "person_id", "term_id"
+        ).iterator(chunk_size=batch_size)
+
+        with transaction.atomic():
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                cls.objects.filter(pk__in=[pk for pk, _, _ in batch]).update(
+                    archived_at=archived_at
+                )
+                cls.objects.bulk_create(
+                    cls(person_id=person_id, term_id=term_id, term_option=None)
+                    for _, person_id, term_id in batch
+                )
+        invalidate_all_consent_statuses()
 
     @classmethod
     def reconsent(cls, consent: Consent, term_option: Optional[TermOption]) -> Consent:
@@ -1,9 +1,10 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from consents.cache import invalidate_all_consent_statuses, invalidate_consent_status
 from consents.models import Consent, Term
 from workshops.models import Person
-from workshops.signals import person_archived_signal
+from workshops.signals import person_archived_signal, persons_bulk_created_signal
 
 
 @receiver(post_save, sender=Person)
@@ -22,23 +23,42 @@ def create_unset_consents_on_user_create(
         )
 
 
+@receiver(persons_bulk_created_signal, sender=Person)
+def create_unset_consents_on_users_bulk_create(sender, **kwargs) -> None:
+    terms = list(Term.objects.all())
+    Consent.bulk_create_in_batches(
+        Consent(
+            person=person,
+            term=term,
+            term_option=None,
+            archived_at=term.archived_at,
+        )
+        for person in kwargs["persons"]
+        for term in terms
+    )
+
+
 @receiver(post_save, sender=Term)
 def create_unset_consents_on_term_create(
     sender, instance: Term, created: bool, **kwargs
 ):
     if created:
-        Consent.objects.bulk_create(
-            Consent(
-                person=person,
-                term=instance,
-                term_option=None,
-                archived_at=instance.archived_at,
-            )
-            for person in Person.objects.all()
-        )
+        Consent.create_unset_consents_for_term(instance)
 
 
 @receiver(person_archived_signal, sender=Person)
 def unset_consents_on_person_archive(sender, **kwargs) -> None:
     person = kwargs["person"]
     Consent.archive_all_for_person(person=person)
+
+
+@receiver(post_save, sender=Term)
+@receiver(post_delete, sender=Term)
+def invalidate_consent_statuses_on_term_change(sender, instance: Term, **kwargs):
+    invalidate_all_consent_statuses()
+
+
+@receiver(post_save, sender=Consent)
+@receiver(post_delete, sender=Consent)
+def invalidate_consent_status_on_consent_change(sender, instance: Consent, **kwargs):
+    invalidate_consent_status(instance.person_id)
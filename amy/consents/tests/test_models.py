@@ -203,6 +203,71 @@ class TestConsentModel(ConsentTestBase):
             len(terms),
         )
 
+    def test_create_unset_consents_for_term_in_batches(self) -> None:
+        Person.objects.bulk_create(
+            Person(
+                personal="Person",
+                family=str(i),
+                username=f"person{i}",
+                github=f"person{i}",
+            )
+            for i in range(5)
+        )
+        people_count = Person.objects.count()
+        term = Term.objects.create(content="term1", slug="term1")
+        Consent.objects.filter(term=term).delete()
+
+        count = Consent.create_unset_consents_for_term(term, batch_size=2)
+
+        self.assertEqual(count, people_count)
+        consents = Consent.objects.filter(term=term)
+        self.assertEqual(consents.count(), people_count)
+        self.assertEqual(consents.values("person").distinct().count(), people_count)
+        self.assertFalse(consents.filter(term_option__isnull=False).exists())
+
+    def test_archive_all_in_batches(self) -> None:
+        terms = Term.objects.active()
+        person = Person.objects.create(
+            personal="Harry", family="Potter", email="hp@magic.uk"
+        )
+        self.person_consent_active_terms(person)
+        old_consents = list(Consent.objects.active().filter(person=person))
+        self.assertGreater(len(old_consents), 2)
+
+        Consent.archive_all(
+            Consent.objects.filter(person=person).active(), batch_size=2
+        )
+
+        for consent in old_consents:
+            consent.refresh_from_db()
+            self.assertIsNotNone(consent.archived_at)
+        new_consents = Consent.objects.active().filter(person=person)
+        self.assertEqual(len(new_consents), len(terms))
+        self.assertFalse(new_consents.filter(term_option__isnull=False).exists())
+
+    def test_bulk_create_in_batches(self) -> None:
+        term = Term.objects.create(content="term1", slug="term1")
+        people = Person.objects.bulk_create(
+            Person(
+                personal="Person",
+                family=str(i),
+                username=f"person{i}",
+                github=f"person{i}",
+            )
+            for i in range(3)
+        )
+        Consent.objects.filter(term=term).delete()
+
+        # consents generated lazily, saved in 2 queries
+        with self.assertNumQueries(2):
+            count = Consent.bulk_create_in_batches(
+                (Consent(person=person, term=term) for person in people),
+                batch_size=2,
+            )
+
+        self.assertEqual(count, 3)
+        self.assertEqual(Consent.objects.filter(term=term).count(), 3)
+
 
 class TestTermModel(ConsentTestBase):
     def test_archive(self):
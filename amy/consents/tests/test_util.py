@@ -1,8 +1,12 @@
+from django.test import override_settings
 from django.utils import timezone
 
-from consents.models import Term, TermOption
+from consents.models import Consent, Term, TermOption
 from consents.tests.base import ConsentTestBase
-from consents.util import person_has_consented_to_required_terms
+from consents.util import (
+    person_has_consented_to_required_terms,
+    person_has_consented_to_required_terms_cached,
+)
 from workshops.models import Person
 
 
@@ -38,3 +42,65 @@ class TestActiveTermConsentsForm(ConsentTestBase):
         # Consents created for the required terms; should return True
         self.person_agree_to_terms(person, required_terms)
         self.assertEqual(person_has_consented_to_required_terms(person), True)
+
+
+# Tests running in parallel processes would share (and bump) required terms
+# version stored in Redis.
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class TestPersonHasConsentedToRequiredTermsCached(ConsentTestBase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.person = Person.objects.create(
+            personal="Harry", family="Potter", email="hp@magic.uk"
+        )
+        self.required_terms = (
+            Term.objects.filter(required_type=Term.PROFILE_REQUIRE_TYPE)
+            .active()
+            .prefetch_active_options()
+        )
+
+    def test_status_is_cached(self) -> None:
+        self.assertEqual(
+            person_has_consented_to_required_terms_cached(self.person), False
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                person_has_consented_to_required_terms_cached(self.person), False
+            )
+
+    def test_cache_invalidated_on_reconsent(self) -> None:
+        self.assertEqual(
+            person_has_consented_to_required_terms_cached(self.person), False
+        )
+        self.person_agree_to_terms(self.person, self.required_terms)
+        self.assertEqual(
+            person_has_consented_to_required_terms_cached(self.person), True
+        )
+
+    def test_cache_invalidated_on_new_required_term(self) -> None:
+        self.person_agree_to_terms(self.person, self.required_terms)
+        self.assertEqual(
+            person_has_consented_to_required_terms_cached(self.person), True
+        )
+
+        Term.objects.create(
+            content="new_required_term",
+            slug="new_required_term",
+            required_type=Term.PROFILE_REQUIRE_TYPE,
+        )
+        self.assertEqual(
+            person_has_consented_to_required_terms_cached(self.person), False
+        )
+
+    def test_cache_invalidated_on_consents_archived(self) -> None:
+        self.person_agree_to_terms(self.person, self.required_terms)
+        self.assertEqual(
+            person_has_consented_to_required_terms_cached(self.person), True
+        )
+
+        Consent.archive_all_for_term(self.required_terms)
+        self.assertEqual(
+            person_has_consented_to_required_terms_cached(self.person), False
+        )
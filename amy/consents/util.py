@@ -1,6 +1,7 @@
 from autoemails.actions import NewConsentRequiredAction
 from autoemails.bulk_email import send_bulk_email
 from autoemails.models import Trigger
+from consents.cache import get_cached_consent_status, set_cached_consent_status
 from consents.models import Consent, Term
 from workshops.models import Person
 
@@ -27,6 +28,18 @@ def person_has_consented_to_required_terms(person: Person) -> bool:
     return set(required_term_ids) == set(term_ids_user_consented_to)
 
 
+def person_has_consented_to_required_terms_cached(person: Person) -> bool:
+    """
+    Same as `person_has_consented_to_required_terms`, but the result is
+    cached until person's consents or the required terms change.
+    """
+    status, version = get_cached_consent_status(person)
+    if status is None:
+        status = person_has_consented_to_required_terms(person)
+        set_cached_consent_status(person, status, version)
+    return status
+
+
 def send_consent_email(request, term: Term) -> None:
     """
     Sending consent emails individually to each user to avoid
@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class DashboardConfig(AppConfig):
     name = "dashboard"
+
+    def ready(self):
+        super().ready()
+        from dashboard.receivers import connect_search_receivers
+
+        connect_search_receivers()
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.search import SEARCH_SPECS, index_objects, rebuild_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild search documents used by the admin search page. Run it once after"
+        " deploying the search index migration (dashboard 0003)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models",
+            nargs="*",
+            metavar="app_label.model_name",
+            help="Rebuild only documents of these models (default: all).",
+        )
+
+    def handle(self, *args, **options):
+        if options["models"]:
+            specs = {
+                "{}.{}".format(spec.app_label, spec.model_name): spec
+                for spec in SEARCH_SPECS
+            }
+            counts = {}
+            for label in options["models"]:
+                if label.lower() not in specs:
+                    self.stderr.write("Model {} is not searchable.".format(label))
+                    continue
+                counts[label] = index_objects(specs[label.lower()])
+        else:
+            counts = rebuild_index()
+
+        for label, count in counts.items():
+            self.stdout.write("Indexed {} objects of {}.".format(count, label))
@@ -1,3 +1,6 @@
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django_countries.fields import CountryField
 
@@ -42,3 +45,39 @@ class Continent(models.Model):
 
     def __str__(self):
         return "Continent {name}".format(name=self.name)
+
+
+class SearchDocument(models.Model):
+    """Denormalized, lower-cased text of a single searchable object.
+
+    Documents are kept up to date by signal receivers (see
+    `dashboard.receivers`) and can be rebuilt in bulk with
+    `manage.py rebuild_search_index`."""
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    content_object = GenericForeignKey("content_type", "object_id")
+
+    title = models.CharField(max_length=255, blank=True, default="")
+    body = models.TextField(blank=True, default="")
+    last_updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_type", "object_id"],
+                name="unique_search_document_per_object",
+            )
+        ]
+        indexes = [
+            GinIndex(
+                fields=["body"],
+                name="searchdocument_body_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
+
+    def __str__(self):
+        return "Search document for {ct} #{pk}".format(
+            ct=self.content_type, pk=self.object_id
+        )
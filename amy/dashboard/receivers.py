@@ -0,0 +1,78 @@
+from django.apps import apps
+from django.db.models.signals import post_delete, post_save
+
+from dashboard.search import (
+    SEARCH_SPECS,
+    get_search_spec,
+    index_object,
+    index_objects,
+    unindex_object,
+)
+from workshops.models import Person
+from workshops.signals import persons_bulk_created_signal
+
+
+def update_search_document(sender, instance, **kwargs):
+    spec = get_search_spec(sender)
+    update_fields = kwargs.get("update_fields")
+    # e.g. `update_last_login` saves only `Person.last_login`
+    if update_fields and not set(update_fields) & set(spec.fields):
+        return
+    index_object(instance)
+
+
+def remove_search_document(sender, instance, **kwargs):
+    unindex_object(instance)
+
+
+def update_bulk_created_persons_search_documents(sender, **kwargs):
+    index_objects(
+        get_search_spec(sender), pks=[person.pk for person in kwargs["persons"]]
+    )
+
+
+def update_related_search_documents(sender, instance, created, **kwargs):
+    """Reindex objects whose documents include fields of the saved object, for
+    example events hosted by an organization whose name has changed."""
+    if created:
+        return
+
+    update_fields = kwargs.get("update_fields")
+    for spec in SEARCH_SPECS:
+        Model = apps.get_model(spec.app_label, spec.model_name)
+        related_fields = {}
+        for lookup in spec.fields:
+            if "__" not in lookup:
+                continue
+            relation, field = lookup.split("__", 1)
+            if Model._meta.get_field(relation).related_model is sender:
+                related_fields.setdefault(relation, set()).add(field)
+
+        for relation, fields in related_fields.items():
+            if update_fields and not set(update_fields) & fields:
+                continue
+            pks = Model._base_manager.filter(**{relation: instance}).values_list(
+                "pk", flat=True
+            )
+            index_objects(spec, pks=pks)
+
+
+def connect_search_receivers():
+    """Connect signal receivers keeping `SearchDocument`s up to date."""
+    related_models = set()
+    for spec in SEARCH_SPECS:
+        Model = apps.get_model(spec.app_label, spec.model_name)
+        post_save.connect(update_search_document, sender=Model)
+        post_delete.connect(remove_search_document, sender=Model)
+
+        for lookup in spec.fields:
+            if "__" in lookup:
+                relation = lookup.split("__", 1)[0]
+                related_models.add(Model._meta.get_field(relation).related_model)
+
+    persons_bulk_created_signal.connect(
+        update_bulk_created_persons_search_documents, sender=Person
+    )
+
+    for RelatedModel in related_models:
+        post_save.connect(update_related_search_documents, sender=RelatedModel)
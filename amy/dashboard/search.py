@@ -0,0 +1,257 @@
+"""Indexed search across AMY objects.
+
+Every searchable object has a single `SearchDocument` row holding lower-cased
+values of its searchable fields (including fields of related objects, like
+event's host). The `body` column has a trigram GIN index, so substring
+lookups don't require sequential scans of the original tables.
+"""
+from collections import namedtuple
+import re
+from typing import Dict, Iterable, List, Optional, Type
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import models, transaction
+from django.db.models import Case, FloatField, Q, Subquery, Value, When
+
+from dashboard.models import SearchDocument
+
+# Name of the model is always lower-case, as in `ContentType.model`. `fields` are
+# lookups (can span relationships) whose values are put into the document;
+# `title_fields` make up a human-readable title used for ranking.
+SearchSpec = namedtuple(
+    "SearchSpec", ["app_label", "model_name", "title_fields", "fields"]
+)
+
+SEARCH_SPECS = (
+    SearchSpec(
+        "workshops",
+        "organization",
+        title_fields=("fullname",),
+        fields=("domain", "fullname"),
+    ),
+    SearchSpec(
+        "workshops",
+        "membership",
+        title_fields=("name",),
+        fields=("name", "registration_code"),
+    ),
+    SearchSpec(
+        "workshops",
+        "event",
+        title_fields=("slug",),
+        fields=(
+            "slug",
+            "host__domain",
+            "host__fullname",
+            "url",
+            "contact",
+            "venue",
+            "address",
+        ),
+    ),
+    SearchSpec(
+        "workshops",
+        "person",
+        title_fields=("personal", "family"),
+        fields=("personal", "family", "email", "secondary_email", "github"),
+    ),
+    SearchSpec(
+        "workshops",
+        "airport",
+        title_fields=("iata", "fullname"),
+        fields=("iata", "fullname"),
+    ),
+    SearchSpec(
+        "workshops",
+        "trainingrequest",
+        title_fields=("personal", "family"),
+        fields=(
+            "group_name",
+            "family",
+            "email",
+            "github",
+            "affiliation",
+            "location",
+            "user_notes",
+        ),
+    ),
+    SearchSpec(
+        "django_comments",
+        "comment",
+        title_fields=("user_name",),
+        fields=(
+            "comment",
+            "user_name",
+            "user_email",
+            "user__personal",
+            "user__family",
+            "user__email",
+            "user__github",
+        ),
+    ),
+)
+
+# Field values are separated so that a search term can't match across two of them.
+FIELD_SEPARATOR = "\n"
+TITLE_MAX_LENGTH = 255
+BATCH_SIZE = 1000
+
+TOKEN_SPLIT = re.compile(r"\s+")
+
+
+def get_search_spec(model: Type[models.Model]) -> Optional[SearchSpec]:
+    """Return search spec for given model class, or None if it isn't indexed."""
+    for spec in SEARCH_SPECS:
+        if (spec.app_label, spec.model_name) == (
+            model._meta.app_label,
+            model._meta.model_name,
+        ):
+            return spec
+    return None
+
+
+def _get_content_type(spec: SearchSpec) -> ContentType:
+    # cached by the content types manager
+    return ContentType.objects.get_by_natural_key(spec.app_label, spec.model_name)
+
+
+def _build_document(spec: SearchSpec, values: Dict[str, Optional[str]]):
+    title = " ".join(str(values[field]) for field in spec.title_fields if values[field])
+    body = FIELD_SEPARATOR.join(
+        str(values[field]).lower() for field in spec.fields if values[field]
+    )
+    return title[:TITLE_MAX_LENGTH], body
+
+
+def index_objects(spec: SearchSpec, pks: Optional[Iterable[int]] = None) -> int:
+    """(Re)build search documents for objects of given spec.
+
+    If `pks` are not provided, all documents for this model are rebuilt.
+    Returns number of indexed objects."""
+    Model = apps.get_model(spec.app_label, spec.model_name)
+    content_type = _get_content_type(spec)
+
+    objects = Model._base_manager.order_by()
+    documents = SearchDocument.objects.filter(content_type=content_type)
+    if pks is not None:
+        pks = list(pks)
+        objects = objects.filter(pk__in=pks)
+        documents = documents.filter(object_id__in=pks)
+
+    fields = list(dict.fromkeys(spec.title_fields + spec.fields))
+    rows = objects.values("pk", *fields).iterator(chunk_size=BATCH_SIZE)
+
+    indexed = 0
+    with transaction.atomic():
+        documents.delete()
+
+        batch = []
+        for row in rows:
+            title, body = _build_document(spec, row)
+            batch.append(
+                SearchDocument(
+                    content_type=content_type,
+                    object_id=row["pk"],
+                    title=title,
+                    body=body,
+                )
+            )
+            if len(batch) >= BATCH_SIZE:
+                SearchDocument.objects.bulk_create(batch)
+                indexed += len(batch)
+                batch = []
+
+        SearchDocument.objects.bulk_create(batch)
+        indexed += len(batch)
+
+    return indexed
+
+
+def index_object(instance: models.Model) -> None:
+    """Rebuild search document for a single object."""
+    spec = get_search_spec(type(instance))
+    if spec:
+        index_objects(spec, pks=[instance.pk])
+
+
+def unindex_object(instance: models.Model) -> None:
+    """Remove search document of a single object."""
+    spec = get_search_spec(type(instance))
+    if spec:
+        SearchDocument.objects.filter(
+            content_type=_get_content_type(spec), object_id=instance.pk
+        ).delete()
+
+
+def rebuild_index() -> Dict[str, int]:
+    """Rebuild whole search index. Returns number of documents per model."""
+    return {
+        "{}.{}".format(spec.app_label, spec.model_name): index_objects(spec)
+        for spec in SEARCH_SPECS
+    }
+
+
+def _matching_documents(
+    term: str, model_classes: Optional[List[Type[models.Model]]] = None
+):
+    """Return unordered queryset of search documents containing every
+    whitespace-separated token of the `term`."""
+    tokens = [token for token in TOKEN_SPLIT.split(term) if token]
+    if not tokens:
+        return SearchDocument.objects.none()
+
+    q = Q()
+    for token in tokens:
+        q &= Q(body__contains=token)
+    documents = SearchDocument.objects.filter(q)
+
+    if model_classes is not None:
+        specs = filter(None, (get_search_spec(model) for model in model_classes))
+        documents = documents.filter(
+            content_type__in=[_get_content_type(spec) for spec in specs]
+        )
+
+    return documents
+
+
+def search_documents(
+    term: str, model_classes: Optional[List[Type[models.Model]]] = None
+):
+    """Return ranked queryset of search documents matching the `term`.
+
+    A document matches when it contains every whitespace-separated token of the
+    term. Documents whose title is most similar to the term come first. Results
+    can be paginated with regular Django paginator."""
+    term = term.strip().lower()
+    documents = _matching_documents(term, model_classes)
+
+    return documents.annotate(
+        rank=TrigramSimilarity("title", term)
+        + Case(
+            When(body__contains=term, then=Value(1.0)),
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+    ).order_by("-rank", "title", "pk")
+
+
+def search_objects(term: str) -> Dict[Type[models.Model], models.QuerySet]:
+    """Return querysets of objects matching the `term`, grouped by model class.
+
+    Returned querysets select objects with a subquery against the search index,
+    so no documents are fetched until a queryset is evaluated."""
+    term = term.strip().lower()
+
+    results = {}
+    for spec in SEARCH_SPECS:
+        content_type = _get_content_type(spec)
+        Model = content_type.model_class()
+        object_ids = (
+            _matching_documents(term)
+            .filter(content_type=content_type)
+            .values("object_id")
+        )
+        results[Model] = Model.objects.filter(pk__in=Subquery(object_ids))
+    return results
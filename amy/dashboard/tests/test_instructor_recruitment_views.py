@@ -132,14 +132,14 @@ class TestUpcomingTeachingOpportunitiesList(TestCase):
         view = UpcomingTeachingOpportunitiesList(request=request)
         view.get_queryset()
         # Act & Assert
-        with self.assertNumQueries(2):
+        with self.assertNumQueries(3):
             data = view.get_context_data(object_list=[])
         # Assert
         self.assertEqual(data["person"].num_taught, 1)
         self.assertEqual(data["person"].num_supporting, 2)
         self.assertEqual(data["person"].num_helper, 3)
         self.assertEqual(list(data["person_instructor_tasks_slugs"]), [event1.slug])
-        self.assertEqual(data["person_instructor_task_events"], {event1})
+        self.assertEqual(list(data["person_instructor_task_events"]), [event1])
         self.assertEqual(list(data["person_signups"]), [signup1])
 
 
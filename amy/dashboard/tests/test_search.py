@@ -1,9 +1,14 @@
 from datetime import date, datetime, timedelta, timezone
+from io import StringIO
 
+from django.core.management import call_command
 from django.urls import reverse
 from django_comments.models import Comment
 
+from dashboard.models import SearchDocument
+from dashboard.search import rebuild_index, search_documents, search_objects
 from workshops.models import (
+    Event,
     Member,
     MemberRole,
     Membership,
@@ -20,6 +25,9 @@ class TestSearch(TestBase):
     def setUp(self):
         super().setUp()
         self._setUpUsersAndLogin()
+        # objects created by data migrations (e.g. self-organised host) are indexed
+        # only by rebuilding the index, just like after deployment
+        rebuild_index()
 
     def search_for(self, term, no_redirect=True, follow=False):
         search_page = self.app.get(reverse("search"), user="admin")
@@ -30,6 +38,9 @@ class TestSearch(TestBase):
             return form.submit().maybe_follow()
         return form.submit()
 
+    def found_objects(self, response, name):
+        return [document.content_object for document in response.context[name]]
+
     def test_search_for_organization_with_no_matches(self):
         response = self.search_for("non.existent")
         self.assertEqual(response.status_code, 200)
@@ -81,8 +92,8 @@ class TestSearch(TestBase):
             2,
             "Expected two search results",
         )
-        self.assertIn(org, response.context["organisations"])
-        self.assertIn(self.hermione, response.context["persons"])
+        self.assertIn(org, self.found_objects(response, "organisations"))
+        self.assertIn(self.hermione, self.found_objects(response, "persons"))
 
     def test_search_for_people_by_secondary_email(self):
         """Test if searching by secondary email yields people correctly."""
@@ -103,8 +114,8 @@ class TestSearch(TestBase):
             2,
             "Expected two search results",
         )
-        self.assertIn(org, response.context["organisations"])
-        self.assertIn(self.hermione, response.context["persons"])
+        self.assertIn(org, self.found_objects(response, "organisations"))
+        self.assertIn(self.hermione, self.found_objects(response, "persons"))
 
     def test_search_for_training_requests(self):
         """Make sure that finding training requests works."""
@@ -248,3 +259,95 @@ class TestSearch(TestBase):
         self.assertEqual(response.status_code, 200)  # doesn't redirect
         self.assertEqual(len(response.context["organisations"]), 1)
         self.assertEqual(len(response.context["comments"]), 2)
+
+    def test_search_results_ranked(self):
+        Organization.objects.create(
+            fullname="Alpha Organization Alumni Association", domain="alumni.org"
+        )
+
+        response = self.search_for("alpha organization")
+        self.assertEqual(
+            self.found_objects(response, "organisations")[0], self.org_alpha
+        )
+
+    def test_search_results_paginated(self):
+        for i in range(3):
+            Organization.objects.create(
+                fullname=f"Paginated University {i}", domain=f"paginated{i}.edu"
+            )
+
+        response = self.app.get(
+            reverse("search"),
+            params={
+                "term": "paginated",
+                "no_redirect": "on",
+                "items_per_page": 2,
+                "organisations_page": 2,
+            },
+            user="admin",
+        )
+        organisations = response.context["organisations"]
+        self.assertEqual(organisations.paginator.count, 3)
+        self.assertEqual(organisations.number, 2)
+        self.assertEqual(len(organisations), 1)
+
+
+class TestSearchIndex(TestBase):
+    """Test cases for maintaining search documents."""
+
+    def setUp(self):
+        super().setUp()
+        self._setUpUsersAndLogin()
+
+    def test_document_updated_on_save(self):
+        self.org_alpha.fullname = "Omega University"
+        self.org_alpha.domain = "omega.edu"
+        self.org_alpha.save()
+
+        results = search_objects("omega")
+        self.assertEqual(list(results[Organization]), [self.org_alpha])
+        self.assertEqual(list(search_objects("alpha")[Organization]), [])
+
+    def test_document_removed_on_delete(self):
+        organization = Organization.objects.create(
+            fullname="Temporary", domain="temporary.org"
+        )
+        self.assertEqual(
+            list(search_objects("temporary")[Organization]), [organization]
+        )
+
+        organization.delete()
+        self.assertEqual(list(search_objects("temporary")[Organization]), [])
+
+    def test_related_documents_updated(self):
+        """Events are searchable by their host's name."""
+        event = Event.objects.create(slug="event-omega", host=self.org_beta)
+
+        self.org_beta.fullname = "Omega University"
+        self.org_beta.save()
+
+        self.assertEqual(list(search_objects("omega university")[Event]), [event])
+
+    def test_all_tokens_must_match(self):
+        self.assertIn(self.hermione, search_objects("Granger Hermione")[Person])
+        self.assertNotIn(self.hermione, search_objects("Granger Ron")[Person])
+
+    def test_ranking(self):
+        Organization.objects.create(
+            fullname="Alpha Organization Alumni Association", domain="alumni.org"
+        )
+        documents = search_documents("alpha organization", model_classes=[Organization])
+        self.assertEqual(len(documents), 2)
+        self.assertEqual(documents[0].content_object, self.org_alpha)
+
+    def test_rebuild_command(self):
+        SearchDocument.objects.all().delete()
+        self.assertEqual(list(search_objects("alpha")[Organization]), [])
+
+        call_command("rebuild_search_index", stdout=StringIO())
+
+        self.assertEqual(list(search_objects("alpha")[Organization]), [self.org_alpha])
+        self.assertEqual(
+            SearchDocument.objects.filter(content_type__model="person").count(),
+            Person.objects.count(),
+        )
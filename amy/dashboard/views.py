@@ -1,10 +1,17 @@
 from datetime import timedelta
-import re
 from typing import Dict, Optional
 
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Case, Count, IntegerField, Prefetch, Q, Value, When
+from django.db.models import (
+    Case,
+    Count,
+    IntegerField,
+    Prefetch,
+    Value,
+    When,
+    prefetch_related_objects,
+)
 from django.forms.widgets import HiddenInput
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
@@ -24,8 +31,10 @@ from dashboard.forms import (
     SendHomeworkForm,
     SignupForRecruitmentForm,
 )
+from dashboard.search import search_documents
 from extrequests.base_views import AMYCreateAndFetchObjectView
 from fiscal.models import MembershipTask
+from recruitment.conflicts import IntervalIndex, event_dates, signup_dates
 from recruitment.models import InstructorRecruitment, InstructorRecruitmentSignup
 from recruitment.views import RecruitmentEnabledMixin
 from workshops.base_views import AMYListView, ConditionallyEnabledMixin
@@ -42,7 +51,7 @@ from workshops.models import (
     TrainingProgress,
     TrainingRequest,
 )
-from workshops.util import admin_required, login_required
+from workshops.util import admin_required, get_pagination_items, login_required
 
 # Terms shown on the instructor dashboard and can be updated by the user.
 TERM_SLUGS = ["may-contact", "public-profile", "may-publish-name"]
@@ -338,16 +347,24 @@ class UpcomingTeachingOpportunitiesList(
             role__name="instructor", person__pk=self.request.user.pk
         ).values_list("event__slug", flat=True)
 
-        context["person_instructor_task_events"] = {
-            task.event
-            for task in Task.objects.filter(
-                role__name="instructor", person__pk=self.request.user.pk
-            ).select_related("event")
-        }
+        # Indexes are built once and used by conflict-checking template tags for
+        # every listed recruitment.
+        context["person_instructor_task_events"] = IntervalIndex(
+            {
+                task.event
+                for task in Task.objects.filter(
+                    role__name="instructor", person__pk=self.request.user.pk
+                ).select_related("event")
+            },
+            event_dates,
+        )
 
-        context["person_signups"] = InstructorRecruitmentSignup.objects.filter(
-            person=self.request.user
-        ).select_related("recruitment", "recruitment__event")
+        context["person_signups"] = IntervalIndex(
+            InstructorRecruitmentSignup.objects.filter(
+                person=self.request.user
+            ).select_related("recruitment", "recruitment__event"),
+            signup_dates,
+        )
 
         return context
 
@@ -479,115 +496,55 @@ class SignupForRecruitment(
 # ------------------------------------------------------------
 
 
+# context name and model of every group of search results
+SEARCH_RESULT_GROUPS = (
+    ("organisations", Organization),
+    ("memberships", Membership),
+    ("events", Event),
+    ("persons", Person),
+    ("airports", Airport),
+    ("training_requests", TrainingRequest),
+    ("comments", Comment),
+)
+
+
+def _search_results_page(request, term, name, model):
+    """Ranked, paginated search documents of given model, with their objects."""
+    documents = get_pagination_items(
+        request,
+        search_documents(term, model_classes=[model]),
+        page_param=f"{name}_page",
+    )
+    prefetch = "content_object"
+    if model is Comment:
+        prefetch = "content_object__content_object"
+    documents.object_list = list(documents.object_list)
+    prefetch_related_objects(documents.object_list, prefetch)
+    return documents
+
+
 @require_GET
 @admin_required
 def search(request):
     """Search the database by term."""
 
     term = ""
-    organizations = None
-    memberships = None
-    events = None
-    persons = None
-    airports = None
-    training_requests = None
-    comments = None
+    results = dict.fromkeys(name for name, _ in SEARCH_RESULT_GROUPS)
 
     if request.method == "GET" and "term" in request.GET:
         form = SearchForm(request.GET)
         if form.is_valid():
             term = form.cleaned_data.get("term", "").strip()
-            tokens = re.split(r"\s+", term)
-            results_combined = []
-
-            organizations = list(
-                Organization.objects.filter(
-                    Q(domain__icontains=term) | Q(fullname__icontains=term)
-                ).order_by("fullname")
-            )
-            results_combined += organizations
-
-            memberships = list(
-                Membership.objects.filter(
-                    Q(name__icontains=term) | Q(registration_code__icontains=term)
-                ).order_by("-agreement_start")
-            )
-            results_combined += memberships
-
-            events = list(
-                Event.objects.filter(
-                    Q(slug__icontains=term)
-                    | Q(host__domain__icontains=term)
-                    | Q(host__fullname__icontains=term)
-                    | Q(url__icontains=term)
-                    | Q(contact__icontains=term)
-                    | Q(venue__icontains=term)
-                    | Q(address__icontains=term)
-                ).order_by("-slug")
-            )
-            results_combined += events
-
-            # if user searches for two words, assume they mean a person
-            # name
-            if len(tokens) == 2:
-                name1, name2 = tokens
-                complex_q = (
-                    (Q(personal__icontains=name1) & Q(family__icontains=name2))
-                    | (Q(personal__icontains=name2) & Q(family__icontains=name1))
-                    | Q(email__icontains=term)
-                    | Q(secondary_email__icontains=term)
-                    | Q(github__icontains=term)
-                )
-                persons = list(Person.objects.filter(complex_q))
-            else:
-                persons = list(
-                    Person.objects.filter(
-                        Q(personal__icontains=term)
-                        | Q(family__icontains=term)
-                        | Q(email__icontains=term)
-                        | Q(secondary_email__icontains=term)
-                        | Q(github__icontains=term)
-                    ).order_by("family")
-                )
-
-            results_combined += persons
-
-            airports = list(
-                Airport.objects.filter(
-                    Q(iata__icontains=term) | Q(fullname__icontains=term)
-                ).order_by("iata")
-            )
-            results_combined += airports
-
-            training_requests = list(
-                TrainingRequest.objects.filter(
-                    Q(group_name__icontains=term)
-                    | Q(family__icontains=term)
-                    | Q(email__icontains=term)
-                    | Q(github__icontains=term)
-                    | Q(affiliation__icontains=term)
-                    | Q(location__icontains=term)
-                    | Q(user_notes__icontains=term)
-                )
-            )
-            results_combined += training_requests
-
-            comments = list(
-                Comment.objects.filter(
-                    Q(comment__icontains=term)
-                    | Q(user_name__icontains=term)
-                    | Q(user_email__icontains=term)
-                    | Q(user__personal__icontains=term)
-                    | Q(user__family__icontains=term)
-                    | Q(user__email__icontains=term)
-                    | Q(user__github__icontains=term)
-                ).prefetch_related("content_object")
-            )
-            results_combined += comments
+            for name, model in SEARCH_RESULT_GROUPS:
+                results[name] = _search_results_page(request, term, name, model)
 
             # only 1 record found? Let's move to it immediately
-            if len(results_combined) == 1 and not form.cleaned_data["no_redirect"]:
-                result = results_combined[0]
+            total = sum(page.paginator.count for page in results.values())
+            if total == 1 and not form.cleaned_data["no_redirect"]:
+                document = next(
+                    page[0] for page in results.values() if page.paginator.count
+                )
+                result = document.content_object
                 msg = format_html(
                     "You were moved to this page, because your search <i>{}</i> "
                     "yields only this result.",
@@ -614,12 +571,6 @@ def search(request):
         "title": "Search",
         "form": form,
         "term": term,
-        "organisations": organizations,
-        "memberships": memberships,
-        "events": events,
-        "persons": persons,
-        "airports": airports,
-        "comments": comments,
-        "training_requests": training_requests,
+        **results,
     }
     return render(request, "dashboard/search.html", context)
@@ -3,3 +3,12 @@ from django.apps import AppConfig
 
 class ExtrequestsConfig(AppConfig):
     name = "extrequests"
+
+    def ready(self):
+        from workshops.facets import watch_models
+
+        # models with cached filter choices
+        watch_models(
+            self.get_model("WorkshopInquiryRequest"),
+            self.get_model("SelfOrganisedSubmission"),
+        )
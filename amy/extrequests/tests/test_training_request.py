@@ -1,17 +1,25 @@
 from datetime import date, datetime, timedelta, timezone
+from io import StringIO
 from urllib.parse import urlencode
 
 from django.contrib.messages import WARNING
 from django.contrib.messages.middleware import MessageMiddleware
 from django.contrib.sessions.middleware import SessionMiddleware
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection
 from django.template import Context, Template
 from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django_comments.models import Comment
+from reversion.models import Version
 
 from extrequests.forms import TrainingRequestsMergeForm
-from extrequests.views import _match_training_request_to_person
+from extrequests.views import (
+    _bulk_match_training_requests,
+    _match_training_request_to_person,
+)
 from workshops.models import (
     Event,
     KnowledgeDomain,
@@ -25,6 +33,7 @@ from workshops.models import (
     Task,
     TrainingRequest,
 )
+from workshops.scoring import calculate_score_auto, rescore_training_requests
 from workshops.tests.base import TestBase
 
 
@@ -252,6 +261,121 @@ class TestTrainingRequestModelScoring(TestBase):
             else:
                 self.assertEqual(self.tr.score_auto, 0)
 
+    def training_request_queries(self, context):
+        """Writes to training requests table and queries to their M2M relations."""
+        return [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith(
+                (
+                    'INSERT INTO "workshops_trainingrequest"',
+                    'UPDATE "workshops_trainingrequest"',
+                )
+            )
+            or '"workshops_trainingrequest_domains"' in query["sql"]
+            or '"workshops_trainingrequest_previous_involvement"' in query["sql"]
+        ]
+
+    def test_score_calculated_before_insert(self):
+        with CaptureQueriesContext(connection) as context:
+            tr = TrainingRequest.objects.create(
+                personal="Jane",
+                family="Smith",
+                email="jane@smith.com",
+                country="W3",
+                previous_training="course",
+                programming_language_usage_frequency="never",
+                reason="Just for fun.",
+            )
+
+        # only INSERT, no queries for M2M relations or UPDATE with the score
+        queries = self.training_request_queries(context)
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries[0].startswith("INSERT"))
+        self.assertEqual(tr.score_auto, 2)
+
+    def test_score_uses_prefetched_relations(self):
+        self.tr.domains.add(KnowledgeDomain.objects.get(name="Chemistry"))
+        self.tr.previous_involvement.add(*Role.objects.all()[:2])
+        tr = TrainingRequest.objects.prefetch_related(
+            "domains", "previous_involvement"
+        ).get(pk=self.tr.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(tr.recalculate_score_auto(), 3)
+
+    def test_saving_fields_not_used_in_score(self):
+        TrainingRequest.objects.filter(pk=self.tr.pk).update(score_auto=10)
+        self.tr.refresh_from_db()
+
+        # only UPDATE query, score isn't recalculated
+        with CaptureQueriesContext(connection) as context:
+            self.tr.user_notes = "Notes"
+            self.tr.save(update_fields=["user_notes"])
+        self.assertEqual(len(self.training_request_queries(context)), 1)
+        self.tr.refresh_from_db()
+        self.assertEqual(self.tr.score_auto, 10)
+
+        self.tr.underresourced = True
+        self.tr.save(update_fields=["underresourced"])
+        self.tr.refresh_from_db()
+        self.assertEqual(self.tr.score_auto, 1)
+
+    def test_calculate_score_auto(self):
+        data = dict(
+            country="W3",
+            underresourced=True,
+            domains=["Chemistry", "Humanities", "Mathematics"],
+            underrepresented="yes",
+            previous_involvement_count=5,
+            previous_training="full",
+            previous_experience="ta",
+            programming_language_usage_frequency="daily",
+        )
+        self.assertEqual(calculate_score_auto(**data), 10)
+        data.update(country="PL", domains=[], previous_involvement_count=2)
+        self.assertEqual(calculate_score_auto(**data), 7)
+
+    def test_rescore_training_requests(self):
+        self.tr.domains.add(KnowledgeDomain.objects.get(name="Humanities"))
+        self.tr.previous_involvement.add(*Role.objects.all()[:4])
+        requests = [self.tr] + [
+            TrainingRequest.objects.create(
+                personal="John",
+                family=f"Smith {i}",
+                email=f"john{i}@smith.com",
+                country="W3",
+                underresourced=bool(i % 2),
+                reason="Just for fun.",
+            )
+            for i in range(3)
+        ]
+        expected = {tr.pk: tr.recalculate_score_auto() for tr in requests}
+        TrainingRequest.objects.update(score_auto=0)
+
+        # select requests with their scoring data, update changed scores
+        with self.assertNumQueries(2):
+            count = rescore_training_requests()
+
+        self.assertEqual(count, 4)
+        self.assertEqual(
+            dict(TrainingRequest.objects.values_list("pk", "score_auto")), expected
+        )
+        self.assertEqual(expected[self.tr.pk], 4)
+        # nothing changed
+        self.assertEqual(rescore_training_requests(), 0)
+
+    def test_rescore_command(self):
+        TrainingRequest.objects.filter(pk=self.tr.pk).update(score_auto=5)
+        out = StringIO()
+
+        call_command("rescore_training_requests", state="a", stdout=out)
+        self.assertEqual(TrainingRequest.objects.get(pk=self.tr.pk).score_auto, 5)
+
+        call_command("rescore_training_requests", stdout=out)
+        self.assertEqual(TrainingRequest.objects.get(pk=self.tr.pk).score_auto, 0)
+        self.assertIn("Updated score of 1 training requests.", out.getvalue())
+
 
 class TestTrainingRequestsListView(TestBase):
     def setUp(self):
@@ -324,6 +448,30 @@ class TestTrainingRequestsListView(TestBase):
         self.third_req.refresh_from_db()
         self.assertEqual(self.third_req.state, "a")
 
+    def test_bulk_accept_recorded_in_history(self):
+        data = {
+            "accept": "",
+            "requests": [self.first_req.pk, self.third_req.pk],
+        }
+        self.client.post(reverse("all_trainingrequests"), data, follow=True)
+
+        self.assertEqual(Version.objects.get_for_object(self.first_req).count(), 1)
+        # already accepted request isn't changed
+        self.assertEqual(Version.objects.get_for_object(self.third_req).count(), 0)
+
+    def test_bulk_match_recorded_in_history(self):
+        data = {
+            "match": "",
+            "event": self.second_training.pk,
+            "requests": [self.first_req.pk],
+            "seat_public": "True",
+        }
+        self.client.post(reverse("all_trainingrequests"), data, follow=True)
+
+        task = Task.objects.get(person=self.spiderman, event=self.second_training)
+        self.assertEqual(Version.objects.get_for_object(task).count(), 1)
+        self.assertEqual(Version.objects.get_for_object(self.first_req).count(), 1)
+
     def test_successful_matching_to_training(self):
         data = {
             "match": "",
@@ -581,6 +729,96 @@ class TestTrainingRequestsListView(TestBase):
         )
         self.assertEqual(task.seat_public, data["seat_public"])
 
+    def test_view_paginated(self):
+        rv = self.client.get(reverse("all_trainingrequests"), {"items_per_page": 2})
+        self.assertEqual(
+            list(rv.context["requests"]), [self.first_req, self.second_req]
+        )
+
+        rv = self.client.get(
+            reverse("all_trainingrequests"),
+            {"items_per_page": 2, "cursor": rv.context["requests"].next_cursor},
+        )
+        self.assertEqual(list(rv.context["requests"]), [self.third_req])
+        self.assertFalse(rv.context["requests"].has_next())
+
+    def test_bulk_matching_many_trainees(self):
+        membership = Membership.objects.create(
+            variant="partner",
+            agreement_start=date.today(),
+            agreement_end=date.today() + timedelta(days=365),
+            contribution_type="financial",
+            public_instructor_training_seats=50,
+        )
+        persons = Person.objects.bulk_create(
+            Person(
+                personal="Trainee",
+                family=str(i),
+                email=f"trainee{i}@example.org",
+                username=f"trainee_{i}",
+                github=None,
+            )
+            for i in range(30)
+        )
+        requests = [
+            create_training_request(state="p", person=person) for person in persons
+        ]
+        # one of trainees is already matched to this training
+        Task.objects.create(
+            person=persons[0], role=self.learner, event=self.second_training
+        )
+        data = {
+            "match": "",
+            "event": self.second_training.pk,
+            "requests": [r.pk for r in requests],
+            "seat_membership": membership.pk,
+            "seat_public": "True",
+        }
+
+        rv = self.client.post(reverse("all_trainingrequests"), data, follow=True)
+
+        self.assertContains(
+            rv, "Successfully accepted and matched selected people to training."
+        )
+        self.assertEqual(
+            TrainingRequest.objects.filter(pk__in=data["requests"], state="a").count(),
+            30,
+        )
+        self.assertEqual(
+            Task.objects.filter(event=self.second_training, role=self.learner).count(),
+            30,
+        )
+        self.assertEqual(
+            Task.objects.filter(seat_membership=membership, seat_public=True).count(),
+            29,
+        )
+        self.assertEqual(membership.usage.public_instructor_training_seats_utilized, 29)
+
+    def test_bulk_match_number_of_queries(self):
+        persons = Person.objects.bulk_create(
+            Person(
+                personal="Trainee",
+                family=str(i),
+                email=f"trainee{i}@example.org",
+                username=f"trainee_{i}",
+                github=None,
+            )
+            for i in range(20)
+        )
+        requests = [
+            create_training_request(state="p", person=person) for person in persons
+        ]
+
+        # Number of queries doesn't depend on number of requests: select requests,
+        # update their state, select already matched trainees, insert tasks, save
+        # event (with its search document), plus savepoints.
+        with self.assertNumQueries(12):
+            _bulk_match_training_requests(
+                TrainingRequest.objects.filter(pk__in=[r.pk for r in requests]),
+                event=self.second_training,
+                role=self.learner,
+            )
+
 
 class TestMatchingTrainingRequestAndDetailedView(TestBase):
     def setUp(self):
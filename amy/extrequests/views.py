@@ -2,6 +2,7 @@ import csv
 import datetime
 import io
 import logging
+from typing import List, Optional
 
 from django.conf import settings
 from django.contrib import messages
@@ -12,8 +13,10 @@ from django.db import IntegrityError, transaction
 from django.db.models import Prefetch, ProtectedError, Q
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
+from django.utils import timezone
 import django_rq
 from requests.exceptions import HTTPError, RequestException
+import reversion
 
 from autoemails.actions import PostWorkshopAction, SelfOrganisedRequestAction
 from autoemails.base_views import ActionManageMixin
@@ -38,6 +41,7 @@ from extrequests.forms import (
     WorkshopRequestAdminForm,
 )
 from extrequests.models import SelfOrganisedSubmission, WorkshopInquiryRequest
+from fiscal.usage import refresh_usage
 from workshops.base_views import (
     AMYDetailView,
     AMYListView,
@@ -56,6 +60,7 @@ from workshops.forms import (
 from workshops.models import (
     Event,
     Language,
+    Membership,
     Organization,
     Person,
     Role,
@@ -67,11 +72,13 @@ from workshops.util import (
     InternalError,
     OnlyForAdminsMixin,
     WrongWorkshopURL,
+    add_to_revision,
     admin_required,
     clean_upload_trainingrequest_manual_score,
     create_username,
     failed_to_delete,
     fetch_workshop_metadata,
+    get_keyset_pagination_items,
     merge_objects,
     parse_workshop_metadata,
     redirect_with_next_support,
@@ -520,11 +527,76 @@ class SelfOrganisedSubmissionAssign(OnlyForAdminsMixin, AssignView):
 # ------------------------------------------------------------
 
 
+def _bulk_change_training_requests_state(requests, state: str) -> int:
+    """Change state of many training requests with a single UPDATE query.
+
+    `TrainingRequest.save` isn't used, because state doesn't affect the automatic
+    score which `save` recalculates. Changed requests are added to the current
+    revision (if any), which `save` would do."""
+    changed = TrainingRequest.objects.filter(pk__in=[r.pk for r in requests]).exclude(
+        state=state
+    )
+    if reversion.is_active():
+        changed = TrainingRequest.objects.filter(
+            pk__in=list(changed.values_list("pk", flat=True))
+        )
+
+    count = changed.update(state=state, last_updated_at=timezone.now())
+    if count:
+        # refetched in a single query
+        add_to_revision(changed)
+    return count
+
+
+@transaction.atomic
+def _bulk_match_training_requests(
+    requests,
+    event: Event,
+    role: Role,
+    seat_membership: Optional[Membership] = None,
+    seat_public: bool = True,
+    seat_open_training: bool = False,
+) -> List[Task]:
+    """Accept training requests and match their trainees to the training.
+
+    Trainees already having the role in the event are skipped; tasks for the
+    remaining ones are inserted with a single `bulk_create`."""
+    _bulk_change_training_requests_state(requests, "a")
+
+    person_ids = {r.person_id for r in requests}
+    matched = set(
+        Task.objects.filter(event=event, role=role, person__in=person_ids)
+        .order_by()
+        .values_list("person", flat=True)
+    )
+    tasks = Task.objects.bulk_create(
+        Task(
+            event=event,
+            person_id=person_id,
+            role=role,
+            seat_membership=seat_membership,
+            seat_public=seat_public,
+            seat_open_training=seat_open_training,
+        )
+        for person_id in sorted(person_ids - matched)
+    )
+
+    add_to_revision(tasks)
+
+    if tasks:
+        # `bulk_create` doesn't call `Task.save`, which updates event attendance,
+        # nor sends signals updating membership usage
+        event.save()
+        if seat_membership:
+            refresh_usage([seat_membership.pk])
+    return tasks
+
+
 @admin_required
 def all_trainingrequests(request):
     filter_ = TrainingRequestFilter(
         request.GET,
-        queryset=TrainingRequest.objects.all().prefetch_related(
+        queryset=TrainingRequest.objects.select_related("person").prefetch_related(
             Prefetch(
                 "person__task_set",
                 to_attr="training_tasks",
@@ -551,22 +623,14 @@ def all_trainingrequests(request):
             role = Role.objects.get(name="learner")
 
             # Perform bulk match
-            for r in match_form.cleaned_data["requests"]:
-                # automatically accept this request
-                r.state = "a"
-                r.save()
-
-                # assign to an event
-                Task.objects.get_or_create(
-                    event=event,
-                    person=r.person,
-                    role=role,
-                    defaults=dict(
-                        seat_membership=membership,
-                        seat_public=seat_public,
-                        seat_open_training=open_seat,
-                    ),
-                )
+            _bulk_match_training_requests(
+                match_form.cleaned_data["requests"],
+                event=event,
+                role=role,
+                seat_membership=membership,
+                seat_public=seat_public,
+                seat_open_training=open_seat,
+            )
 
             today = datetime.date.today()
 
@@ -615,10 +679,8 @@ def all_trainingrequests(request):
         form = BulkChangeTrainingRequestForm(request.POST)
 
         if form.is_valid():
-            # Perform bulk discard
-            for r in form.cleaned_data["requests"]:
-                r.state = "a"
-                r.save()
+            # Perform bulk accept
+            _bulk_change_training_requests_state(form.cleaned_data["requests"], "a")
 
             messages.success(request, "Successfully accepted selected " "requests.")
 
@@ -628,9 +690,7 @@ def all_trainingrequests(request):
 
         if form.is_valid():
             # Perform bulk discard
-            for r in form.cleaned_data["requests"]:
-                r.state = "d"
-                r.save()
+            _bulk_change_training_requests_state(form.cleaned_data["requests"], "d")
 
             messages.success(request, "Successfully discarded selected " "requests.")
 
@@ -642,8 +702,11 @@ def all_trainingrequests(request):
         form.check_person_matched = True
         if form.is_valid():
             # Perform bulk unmatch
-            for r in form.cleaned_data["requests"]:
-                r.person.get_training_tasks().delete()
+            Task.objects.filter(
+                person__in={r.person_id for r in form.cleaned_data["requests"]},
+                role__name="learner",
+                event__tags__name="TTT",
+            ).delete()
 
             messages.success(
                 request, "Successfully unmatched selected " "people from trainings."
@@ -651,7 +714,7 @@ def all_trainingrequests(request):
 
     context = {
         "title": "Training Requests",
-        "requests": filter_.qs,
+        "requests": get_keyset_pagination_items(request, filter_.qs),
         "filter": filter_,
         "form": form,
         "match_form": match_form,
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class FiscalConfig(AppConfig):
     name = "fiscal"
+
+    def ready(self):
+        super().ready()
+        from fiscal import receivers  # noqa
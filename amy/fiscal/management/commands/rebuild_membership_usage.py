@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from fiscal.usage import rebuild_usage, refresh_outdated_usage
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild precomputed membership usage (workshops and instructor training "
+        "seats). Run it daily so that completed/planned workshop counts stay "
+        "current."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--outdated-only",
+            action="store_true",
+            default=False,
+            help="Only rebuild missing usage or usage computed before today.",
+        )
+
+    def handle(self, *args, **options):
+        if options["outdated_only"]:
+            count = refresh_outdated_usage()
+        else:
+            count = rebuild_usage()
+        self.stdout.write("Rebuilt usage of {} memberships.".format(count))
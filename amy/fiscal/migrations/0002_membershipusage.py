@@ -0,0 +1,28 @@
+# Generated by Django 2.2.28 on 2026-10-18 20:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workshops', '0253_event_repository_metadata_etag'),
+        ('fiscal', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MembershipUsage',
+            fields=[
+                ('membership', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='usage', serialize=False, to='workshops.Membership')),
+                ('workshops_without_admin_fee_completed_count', models.PositiveIntegerField(default=0)),
+                ('workshops_without_admin_fee_planned_count', models.PositiveIntegerField(default=0)),
+                ('self_organized_workshops_completed', models.PositiveIntegerField(default=0)),
+                ('self_organized_workshops_planned', models.PositiveIntegerField(default=0)),
+                ('public_instructor_training_seats_utilized', models.PositiveIntegerField(default=0)),
+                ('inhouse_instructor_training_seats_utilized', models.PositiveIntegerField(default=0)),
+                ('computed_on', models.DateField()),
+            ],
+        ),
+    ]
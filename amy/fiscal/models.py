@@ -24,3 +24,30 @@ class MembershipTask(models.Model):
 
     def __str__(self):
         return f"{self.role} {self.person} ({self.membership})"
+
+
+class MembershipUsage(models.Model):
+    """Precomputed numbers of workshops and instructor training seats used by a
+    membership.
+
+    Rows are kept up to date by signal receivers (see `fiscal.receivers`) and can
+    be rebuilt with `rebuild_membership_usage` management command. Counts of
+    completed and planned workshops depend on the current date, so they're only
+    valid on the day stored in `computed_on`."""
+
+    membership = models.OneToOneField(
+        Membership,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="usage",
+    )
+    workshops_without_admin_fee_completed_count = models.PositiveIntegerField(default=0)
+    workshops_without_admin_fee_planned_count = models.PositiveIntegerField(default=0)
+    self_organized_workshops_completed = models.PositiveIntegerField(default=0)
+    self_organized_workshops_planned = models.PositiveIntegerField(default=0)
+    public_instructor_training_seats_utilized = models.PositiveIntegerField(default=0)
+    inhouse_instructor_training_seats_utilized = models.PositiveIntegerField(default=0)
+    computed_on = models.DateField()
+
+    def __str__(self):
+        return f"Usage of {self.membership_id} computed on {self.computed_on}"
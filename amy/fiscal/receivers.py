@@ -0,0 +1,163 @@
+"""Keep `MembershipUsage` rows up to date when objects they're computed from change.
+
+Only changes that send signals are followed; changes made with `QuerySet.update()`
+or `bulk_create()` (and the passage of time, moving events from planned to
+completed) are picked up by the `rebuild_membership_usage --outdated-only`
+command run daily, which calls `fiscal.usage.refresh_outdated_usage`.
+"""
+from django.db.models import DEFERRED
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_init,
+    post_save,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from fiscal.usage import refresh_usage
+from workshops.models import Event, Membership, Organization, Task
+
+# fields used when calculating membership usage; `update_fields` contain
+# attnames when a model instance with deferred fields is saved
+EVENT_USAGE_FIELDS = {
+    "membership",
+    "membership_id",
+    "administrator",
+    "administrator_id",
+    "start",
+}
+TASK_USAGE_FIELDS = {
+    "seat_membership",
+    "seat_membership_id",
+    "seat_public",
+    "role",
+    "role_id",
+}
+ORGANIZATION_USAGE_FIELDS = {"domain"}
+
+# field (attname) whose previous value is needed to refresh usage after save
+TRACKED_FIELDS = {
+    Event: "membership_id",
+    Task: "seat_membership_id",
+    Organization: "domain",
+}
+
+
+def _skip_update(update_fields, usage_fields) -> bool:
+    return bool(update_fields) and not set(update_fields) & usage_fields
+
+
+def _remember_value(instance) -> None:
+    attname = TRACKED_FIELDS[type(instance)]
+    # deferred fields aren't known until they're loaded
+    instance._usage_tracked_value = instance.__dict__.get(attname, DEFERRED)
+
+
+def _previous_value(instance):
+    """Value of the tracked field when the object was loaded or last saved."""
+    value = getattr(instance, "_usage_tracked_value", DEFERRED)
+    return None if value is DEFERRED else value
+
+
+@receiver(post_init, sender=Event)
+@receiver(post_init, sender=Task)
+@receiver(post_init, sender=Organization)
+def remember_loaded_value(sender, instance, **kwargs) -> None:
+    """Store value of the tracked field as loaded from the database, so that
+    saving the object doesn't require a query for its previous value."""
+    _remember_value(instance)
+
+
+@receiver(pre_save, sender=Event)
+@receiver(pre_save, sender=Task)
+def load_deferred_previous_value(sender, instance, raw=False, **kwargs) -> None:
+    """Query for the previous value only if the field was deferred on load."""
+    value = getattr(instance, "_usage_tracked_value", DEFERRED)
+    if instance.pk and not raw and value is DEFERRED:
+        attname = TRACKED_FIELDS[sender]
+        instance._usage_tracked_value = (
+            sender._base_manager.filter(pk=instance.pk)
+            .values_list(attname, flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Event)
+def update_usage_on_event_save(sender, instance: Event, **kwargs) -> None:
+    previous = _previous_value(instance)
+    _remember_value(instance)
+    if _skip_update(kwargs.get("update_fields"), EVENT_USAGE_FIELDS):
+        return
+    if instance.membership_id or previous:
+        refresh_usage([instance.membership_id, previous])
+
+
+@receiver(post_delete, sender=Event)
+def update_usage_on_event_delete(sender, instance: Event, **kwargs) -> None:
+    if instance.membership_id:
+        refresh_usage([instance.membership_id])
+
+
+@receiver(m2m_changed, sender=Event.tags.through)
+def update_usage_on_event_tags_change(sender, **kwargs) -> None:
+    """Cancelled or stalled events aren't counted towards membership usage."""
+    if kwargs["action"] not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if kwargs["reverse"]:
+        # `tag.event_set` changed; the cleared events aren't known anymore
+        if kwargs["action"] == "post_clear":
+            return
+        membership_ids = (
+            Event.objects.filter(pk__in=kwargs["pk_set"], membership__isnull=False)
+            .values_list("membership", flat=True)
+            .distinct()
+        )
+        refresh_usage(membership_ids)
+    elif kwargs["instance"].membership_id:
+        refresh_usage([kwargs["instance"].membership_id])
+
+
+@receiver(post_save, sender=Task)
+def update_usage_on_task_save(sender, instance: Task, **kwargs) -> None:
+    previous = _previous_value(instance)
+    _remember_value(instance)
+    if _skip_update(kwargs.get("update_fields"), TASK_USAGE_FIELDS):
+        return
+    if instance.seat_membership_id or previous:
+        refresh_usage([instance.seat_membership_id, previous])
+
+
+@receiver(post_delete, sender=Task)
+def update_usage_on_task_delete(sender, instance: Task, **kwargs) -> None:
+    if instance.seat_membership_id:
+        refresh_usage([instance.seat_membership_id])
+
+
+@receiver(post_save, sender=Membership)
+def create_usage_on_membership_create(
+    sender, instance: Membership, created: bool, **kwargs
+) -> None:
+    if created:
+        refresh_usage([instance.pk])
+
+
+@receiver(post_save, sender=Organization)
+def update_usage_on_organization_save(
+    sender, instance: Organization, created: bool, **kwargs
+) -> None:
+    """Domain of events' administrator decides whether they're centrally- or
+    self-organised."""
+    previous = _previous_value(instance)
+    _remember_value(instance)
+    if created or _skip_update(kwargs.get("update_fields"), ORGANIZATION_USAGE_FIELDS):
+        return
+    if previous == instance.domain:
+        return
+    membership_ids = (
+        Event.objects.filter(administrator=instance, membership__isnull=False)
+        .values_list("membership", flat=True)
+        .distinct()
+    )
+    refresh_usage(membership_ids)
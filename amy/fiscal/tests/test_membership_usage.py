@@ -0,0 +1,222 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+
+from fiscal.models import MembershipUsage
+from fiscal.usage import load_usage
+from workshops.models import Event, Membership, Organization, Role, Tag, Task
+from workshops.tests.base import TestBase
+
+
+class TestMembershipUsage(TestBase):
+    def setUp(self):
+        super().setUp()
+        self._setUpUsersAndLogin()
+        self._setUpRoles()
+        self._setUpTags()
+
+        self.learner = Role.objects.get(name="learner")
+        self.dc = Organization.objects.create(
+            domain="datacarpentry.org", fullname="Data Carpentry"
+        )
+        self.self_organized = Organization.objects.get(domain="self-organized")
+        self.membership = Membership.objects.create(
+            variant="partner",
+            agreement_start=date.today() - timedelta(days=180),
+            agreement_end=date.today() + timedelta(days=180),
+            contribution_type="financial",
+            workshops_without_admin_fee_per_agreement=10,
+            public_instructor_training_seats=25,
+            inhouse_instructor_training_seats=5,
+        )
+
+    def usage(self, membership=None) -> MembershipUsage:
+        return MembershipUsage.objects.get(membership=membership or self.membership)
+
+    def create_event(self, slug, start, administrator=None, **kwargs) -> Event:
+        return Event.objects.create(
+            slug=slug,
+            host=self.org_alpha,
+            membership=self.membership,
+            start=start,
+            administrator=administrator or self.dc,
+            **kwargs,
+        )
+
+    def test_usage_created_with_membership(self):
+        usage = self.usage()
+        self.assertEqual(usage.computed_on, date.today())
+        self.assertEqual(usage.workshops_without_admin_fee_completed_count, 0)
+        self.assertEqual(usage.public_instructor_training_seats_utilized, 0)
+
+    def test_usage_follows_events(self):
+        past = date.today() - timedelta(days=10)
+        future = date.today() + timedelta(days=10)
+        completed = self.create_event("completed", past)
+        self.create_event("planned", future)
+        self.create_event("self-organized", past, administrator=self.self_organized)
+
+        usage = self.usage()
+        self.assertEqual(usage.workshops_without_admin_fee_completed_count, 1)
+        self.assertEqual(usage.workshops_without_admin_fee_planned_count, 1)
+        self.assertEqual(usage.self_organized_workshops_completed, 1)
+        self.assertEqual(usage.self_organized_workshops_planned, 0)
+
+        # cancelled events aren't counted
+        completed.tags.add(Tag.objects.get(name="cancelled"))
+        self.assertEqual(self.usage().workshops_without_admin_fee_completed_count, 0)
+        completed.tags.clear()
+        self.assertEqual(self.usage().workshops_without_admin_fee_completed_count, 1)
+
+        # moving an event to a different membership updates both memberships
+        other = Membership.objects.create(
+            variant="bronze",
+            agreement_start=date.today(),
+            agreement_end=date.today() + timedelta(days=365),
+            contribution_type="financial",
+        )
+        completed.membership = other
+        completed.save()
+        self.assertEqual(self.usage().workshops_without_admin_fee_completed_count, 0)
+        self.assertEqual(
+            self.usage(other).workshops_without_admin_fee_completed_count, 1
+        )
+
+        completed.delete()
+        self.assertEqual(
+            self.usage(other).workshops_without_admin_fee_completed_count, 0
+        )
+
+    def test_usage_follows_tasks(self):
+        event = self.create_event("ttt", date.today())
+        task = Task.objects.create(
+            event=event,
+            person=self.spiderman,
+            role=self.learner,
+            seat_membership=self.membership,
+            seat_public=True,
+        )
+        Task.objects.create(
+            event=event,
+            person=self.ironman,
+            role=self.learner,
+            seat_membership=self.membership,
+            seat_public=False,
+        )
+        usage = self.usage()
+        self.assertEqual(usage.public_instructor_training_seats_utilized, 1)
+        self.assertEqual(usage.inhouse_instructor_training_seats_utilized, 1)
+
+        task.seat_public = False
+        task.save()
+        usage = self.usage()
+        self.assertEqual(usage.public_instructor_training_seats_utilized, 0)
+        self.assertEqual(usage.inhouse_instructor_training_seats_utilized, 2)
+
+        task.delete()
+        self.assertEqual(self.usage().inhouse_instructor_training_seats_utilized, 1)
+
+    def test_usage_follows_deferred_membership(self):
+        event = self.create_event("moved", date.today() - timedelta(days=1))
+        other = Membership.objects.create(
+            variant="bronze",
+            agreement_start=date.today(),
+            agreement_end=date.today() + timedelta(days=365),
+            contribution_type="financial",
+        )
+
+        event = Event.objects.only("slug").get(pk=event.pk)
+        event.membership = other
+        event.save()
+
+        self.assertEqual(self.usage().workshops_without_admin_fee_completed_count, 0)
+        self.assertEqual(
+            self.usage(other).workshops_without_admin_fee_completed_count, 1
+        )
+
+    def test_usage_follows_administrator_domain(self):
+        self.create_event("completed", date.today() - timedelta(days=1))
+        self.assertEqual(self.usage().workshops_without_admin_fee_completed_count, 1)
+
+        self.dc.domain = "datacarpentry.example.org"
+        self.dc.save()
+
+        self.assertEqual(self.usage().workshops_without_admin_fee_completed_count, 0)
+
+    def test_load_usage(self):
+        self.create_event("completed", date.today() - timedelta(days=1))
+        membership = Membership.objects.select_related("usage").get(
+            pk=self.membership.pk
+        )
+
+        with self.assertNumQueries(0):
+            load_usage(membership)
+            self.assertEqual(membership.workshops_without_admin_fee_completed, 1)
+            self.assertEqual(membership.workshops_without_admin_fee_remaining, 9)
+            self.assertEqual(membership.self_organized_workshops_planned, 0)
+            self.assertEqual(membership.public_instructor_training_seats_remaining, 25)
+
+    def test_load_usage_refreshes_outdated_counts(self):
+        self.create_event("today", date.today())
+        MembershipUsage.objects.update(computed_on=date.today() - timedelta(days=1))
+        membership = Membership.objects.select_related("usage").get(
+            pk=self.membership.pk
+        )
+
+        load_usage(membership)
+
+        self.assertEqual(membership.usage.computed_on, date.today())
+        self.assertEqual(membership.workshops_without_admin_fee_planned, 1)
+
+    def test_rebuild_command(self):
+        # bulk-created events don't trigger signals
+        Event.objects.bulk_create(
+            [
+                Event(
+                    slug=f"event-{i}",
+                    host=self.org_alpha,
+                    membership=self.membership,
+                    start=date.today() - timedelta(days=1),
+                    administrator=self.dc,
+                )
+                for i in range(3)
+            ]
+        )
+        self.assertEqual(self.usage().workshops_without_admin_fee_completed_count, 0)
+
+        out = StringIO()
+        call_command("rebuild_membership_usage", stdout=out)
+
+        self.assertEqual(self.usage().workshops_without_admin_fee_completed_count, 3)
+        self.assertIn("Rebuilt usage of 1 memberships.", out.getvalue())
+
+    def test_membership_trainings_stats(self):
+        event = self.create_event("ttt", date.today())
+        Task.objects.create(
+            event=event,
+            person=self.spiderman,
+            role=self.learner,
+            seat_membership=self.membership,
+            seat_public=True,
+        )
+        MembershipUsage.objects.all().delete()
+
+        rv = self.client.get(reverse("membership_trainings_stats"))
+
+        self.assertEqual(rv.status_code, 200)
+        result = rv.context["data"][0]
+        self.assertEqual(result.instructor_training_seats_public_utilized, 1)
+        self.assertEqual(result.instructor_training_seats_public_remaining, 24)
+        self.assertEqual(result.instructor_training_seats_inhouse_remaining, 5)
+
+    def test_membership_trainings_stats_reads_outdated_usage(self):
+        yesterday = date.today() - timedelta(days=1)
+        MembershipUsage.objects.update(computed_on=yesterday)
+
+        rv = self.client.get(reverse("membership_trainings_stats"))
+
+        self.assertEqual(rv.status_code, 200)
+        # refreshing outdated rows is left to `rebuild_membership_usage`
+        self.assertEqual(self.usage().computed_on, yesterday)
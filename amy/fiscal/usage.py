@@ -0,0 +1,184 @@
+"""Materialized membership usage statistics.
+
+Numbers of workshops and instructor training seats used by memberships are
+calculated with two grouped queries (one for events, one for learner tasks) for
+any number of memberships and stored in `MembershipUsage` rows. Membership
+detail page and membership trainings statistics read these rows instead of
+running a separate aggregate query for each `Membership` property.
+"""
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import Count, Q
+
+from fiscal.models import MembershipUsage
+from workshops.models import Event, Membership, Organization, Task
+
+CHUNK_SIZE = 500
+
+# `MembershipUsage` field -> `Membership` cached property it stands for
+USAGE_FIELDS = {
+    "workshops_without_admin_fee_completed_count": (
+        "_workshops_without_admin_fee_completed_count"
+    ),
+    "workshops_without_admin_fee_planned_count": (
+        "_workshops_without_admin_fee_planned_count"
+    ),
+    "self_organized_workshops_completed": "self_organized_workshops_completed",
+    "self_organized_workshops_planned": "self_organized_workshops_planned",
+    "public_instructor_training_seats_utilized": (
+        "public_instructor_training_seats_utilized"
+    ),
+    "inhouse_instructor_training_seats_utilized": (
+        "inhouse_instructor_training_seats_utilized"
+    ),
+}
+
+
+def calculate_usage(
+    membership_ids: Iterable[int], today: Optional[date] = None
+) -> Dict[int, MembershipUsage]:
+    """Calculate (without saving) usage of memberships with given IDs.
+
+    Criteria are the same as in `Membership._base_queryset` and related methods."""
+    membership_ids = list(membership_ids)
+    today = today or date.today()
+    usage = {
+        pk: MembershipUsage(membership_id=pk, computed_on=today)
+        for pk in membership_ids
+    }
+    if not usage:
+        return usage
+
+    centrally_organised = Q(
+        administrator__in=Organization.objects.administrators()
+    ) & ~Q(administrator__domain="self-organized")
+    self_organized = Q(administrator=None) | Q(administrator__domain="self-organized")
+    completed = Q(start__lt=today)
+    planned = Q(start__gte=today)
+    events = (
+        Event.objects.filter(membership__in=membership_ids)
+        .exclude(tags__name__in=["cancelled", "stalled"])
+        .order_by()
+        .values("membership")
+        .annotate(
+            workshops_without_admin_fee_completed_count=Count(
+                "pk", filter=centrally_organised & completed, distinct=True
+            ),
+            workshops_without_admin_fee_planned_count=Count(
+                "pk", filter=centrally_organised & planned, distinct=True
+            ),
+            self_organized_workshops_completed=Count(
+                "pk", filter=self_organized & completed, distinct=True
+            ),
+            self_organized_workshops_planned=Count(
+                "pk", filter=self_organized & planned, distinct=True
+            ),
+        )
+    )
+    tasks = (
+        Task.objects.filter(seat_membership__in=membership_ids, role__name="learner")
+        .order_by()
+        .values("seat_membership")
+        .annotate(
+            public_instructor_training_seats_utilized=Count(
+                "pk", filter=Q(seat_public=True)
+            ),
+            inhouse_instructor_training_seats_utilized=Count(
+                "pk", filter=Q(seat_public=False)
+            ),
+        )
+    )
+
+    for row in events:
+        obj = usage[row.pop("membership")]
+        for field, value in row.items():
+            setattr(obj, field, value)
+    for row in tasks:
+        obj = usage[row.pop("seat_membership")]
+        for field, value in row.items():
+            setattr(obj, field, value)
+
+    return usage
+
+
+def refresh_usage(
+    membership_ids: Iterable[int], today: Optional[date] = None
+) -> List[MembershipUsage]:
+    """Recalculate and store usage of memberships with given IDs."""
+    membership_ids = {pk for pk in membership_ids if pk is not None}
+    usage = calculate_usage(
+        Membership.objects.filter(pk__in=membership_ids).values_list("pk", flat=True),
+        today=today,
+    )
+    if not usage:
+        return []
+
+    with transaction.atomic():
+        existing = set(
+            MembershipUsage.objects.select_for_update()
+            .filter(membership__in=usage.keys())
+            .values_list("membership", flat=True)
+        )
+        MembershipUsage.objects.bulk_update(
+            [obj for pk, obj in usage.items() if pk in existing],
+            fields=list(USAGE_FIELDS) + ["computed_on"],
+        )
+        MembershipUsage.objects.bulk_create(
+            [obj for pk, obj in usage.items() if pk not in existing]
+        )
+    return list(usage.values())
+
+
+def rebuild_usage(today: Optional[date] = None) -> int:
+    """Recalculate usage of all memberships. Return number of memberships."""
+    membership_ids = Membership.objects.order_by("pk").values_list("pk", flat=True)
+    count = 0
+    chunk = []
+    for pk in membership_ids.iterator(chunk_size=CHUNK_SIZE):
+        chunk.append(pk)
+        if len(chunk) == CHUNK_SIZE:
+            count += len(refresh_usage(chunk, today=today))
+            chunk = []
+    count += len(refresh_usage(chunk, today=today))
+    return count
+
+
+def create_missing_usage(today: Optional[date] = None) -> int:
+    """Calculate usage of memberships which don't have it yet (e.g. created with
+    `bulk_create`). Return number of these memberships."""
+    missing = Membership.objects.filter(usage=None).values_list("pk", flat=True)
+    return len(refresh_usage(missing, today=today))
+
+
+def refresh_outdated_usage(today: Optional[date] = None) -> int:
+    """Recalculate usage of memberships without it, or with counts calculated
+    before `today`. Return number of refreshed memberships."""
+    today = today or date.today()
+    outdated = Membership.objects.filter(
+        Q(usage=None) | Q(usage__computed_on__lt=today)
+    ).values_list("pk", flat=True)
+    return len(refresh_usage(outdated, today=today))
+
+
+def apply_usage(membership: Membership, usage: MembershipUsage) -> Membership:
+    """Fill `Membership` cached properties with precomputed usage, so that
+    accessing them doesn't run any queries."""
+    for field, attr in USAGE_FIELDS.items():
+        membership.__dict__[attr] = getattr(usage, field)
+    return membership
+
+
+def load_usage(membership: Membership) -> Membership:
+    """Fill `Membership` cached properties with its stored usage, refreshing it
+    first if it's missing or outdated."""
+    try:
+        usage = membership.usage
+    except MembershipUsage.DoesNotExist:
+        usage = None
+
+    if usage is None or usage.computed_on != date.today():
+        (usage,) = refresh_usage([membership.pk])
+        membership.usage = usage
+    return apply_usage(membership, usage)
@@ -27,6 +27,7 @@ from fiscal.forms import (
     OrganizationForm,
 )
 from fiscal.models import MembershipTask
+from fiscal.usage import load_usage
 from workshops.base_views import (
     AMYCreateView,
     AMYDeleteView,
@@ -152,7 +153,7 @@ class MembershipDetails(OnlyForAdminsMixin, AMYDetailView):
     prefetch_awards = Prefetch(
         "person__award_set", queryset=Award.objects.select_related("badge")
     )
-    queryset = Membership.objects.prefetch_related(
+    queryset = Membership.objects.select_related("usage").prefetch_related(
         Prefetch(
             "member_set",
             queryset=Member.objects.select_related(
@@ -176,6 +177,10 @@ class MembershipDetails(OnlyForAdminsMixin, AMYDetailView):
     template_name = "fiscal/membership.html"
     pk_url_kwarg = "membership_id"
 
+    def get_object(self, queryset=None):
+        # workshop and seat counts are read from precomputed usage
+        return load_usage(super().get_object(queryset))
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["title"] = "{0}".format(self.object)
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Callable, Generic, Iterable, Iterator, Optional, TypeVar
+
+from django.db.models import QuerySet
+
+from recruitment.models import InstructorRecruitment, InstructorRecruitmentSignup
+from workshops.models import Event, Task
+
+T = TypeVar("T")
+DateRange = tuple[Optional[date], Optional[date]]
+
+
+def event_dates(event: Event) -> DateRange:
+    return event.start, event.end
+
+
+def signup_dates(signup: InstructorRecruitmentSignup) -> DateRange:
+    return event_dates(signup.recruitment.event)
+
+
+class IntervalIndex(Generic[T]):
+    """Index of items spanning date ranges, built once and queried many times.
+
+    Items are kept sorted by their start date. The longest indexed range bounds how
+    early an item overlapping the queried range can start, so each query is a binary
+    search followed by a scan of the candidates only, instead of a scan of all items.
+    Items without a start date are kept (e.g. for iteration), but never overlap."""
+
+    def __init__(self, items: Iterable[T], dates: Callable[[T], DateRange]) -> None:
+        self.items: list[T] = list(items)
+
+        entries = []
+        for item in self.items:
+            start, end = dates(item)
+            if start is not None:
+                entries.append((start, end or start, item))
+        entries.sort(key=lambda entry: entry[0])
+
+        self._entries = entries
+        self._starts = [start for start, _, _ in entries]
+        self._max_length = max(
+            (end - start for start, end, _ in entries), default=timedelta(0)
+        )
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def overlapping(self, start: Optional[date], end: Optional[date]) -> list[T]:
+        """Items overlapping with the range (inclusive), ordered by start date."""
+        if start is None:
+            return []
+        end = end or start
+
+        lo = bisect_left(self._starts, start - max(self._max_length, timedelta(0)))
+        hi = bisect_right(self._starts, end)
+        return [item for _, item_end, item in self._entries[lo:hi] if item_end >= start]
+
+
+def instructor_tasks(people: Iterable[int]) -> QuerySet[Task]:
+    return Task.objects.filter(
+        role__name="instructor", person__in=people
+    ).select_related("event")
+
+
+def get_signup_conflicts_map(
+    recruitments: Iterable[InstructorRecruitment],
+) -> dict[int, list[Event]]:
+    """Map IDs of signups for given recruitments to events, at which the signed-up
+    people teach at the same time as the recruitment's event.
+
+    Instructor tasks of all signed-up people are fetched in a single query and
+    indexed per person."""
+    signups = [
+        (recruitment, signup)
+        for recruitment in recruitments
+        for signup in recruitment.instructorrecruitmentsignup_set.all()
+    ]
+    if not signups:
+        return {}
+
+    events_per_person = defaultdict(list)
+    for task in instructor_tasks({signup.person_id for _, signup in signups}):
+        events_per_person[task.person_id].append(task.event)
+    indexes = {
+        person_id: IntervalIndex(events, event_dates)
+        for person_id, events in events_per_person.items()
+    }
+    no_events = IntervalIndex([], event_dates)
+
+    return {
+        signup.pk: [
+            event
+            for event in indexes.get(signup.person_id, no_events).overlapping(
+                *event_dates(recruitment.event)
+            )
+            if event != recruitment.event
+        ]
+        for recruitment, signup in signups
+    }
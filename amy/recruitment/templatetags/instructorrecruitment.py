@@ -1,9 +1,10 @@
 from datetime import timedelta
-from typing import Sequence
+from typing import Sequence, Union
 
 from django import template
 from django.conf import settings
 
+from recruitment.conflicts import IntervalIndex, event_dates, signup_dates
 from recruitment.models import InstructorRecruitment, InstructorRecruitmentSignup
 from workshops.models import Event
 
@@ -19,52 +20,56 @@ def is_instructor_recruitment_enabled() -> bool:
 
 
 @register.simple_tag
-def get_event_conflicts(events: Sequence[Event], event: Event) -> list[Event]:
-    conflicts: list[Event] = []
-
-    for event_to_check in events:
-        if event == event_to_check:
-            continue
-
-        if event.start <= event_to_check.end and event.end >= event_to_check.start:
-            conflicts.append(event_to_check)
+def get_event_conflicts(
+    events: Union[Sequence[Event], IntervalIndex[Event]], event: Event
+) -> list[Event]:
+    if not isinstance(events, IntervalIndex):
+        events = IntervalIndex(events, event_dates)
 
-    return conflicts
+    return [
+        event_to_check
+        for event_to_check in events.overlapping(event.start, event.end)
+        if event != event_to_check
+    ]
 
 
 @register.simple_tag
 def get_events_nearby(
-    events: Sequence[Event], event: Event, days_before: int = 14, days_after: int = 14
+    events: Union[Sequence[Event], IntervalIndex[Event]],
+    event: Event,
+    days_before: int = 14,
+    days_after: int = 14,
 ) -> list[Event]:
-    nearby: list[Event] = []
-
-    for event_to_check in events:
-        if event == event_to_check:
-            continue
+    if not isinstance(events, IntervalIndex):
+        events = IntervalIndex(events, event_dates)
+    if event.start is None:
+        return []
 
-        if (
-            event.start - timedelta(days=days_before) <= event_to_check.end
-            and event.end + timedelta(days=days_after) >= event_to_check.start
-        ):
-            nearby.append(event_to_check)
-
-    return nearby
+    return [
+        event_to_check
+        for event_to_check in events.overlapping(
+            event.start - timedelta(days=days_before),
+            (event.end or event.start) + timedelta(days=days_after),
+        )
+        if event != event_to_check
+    ]
 
 
 @register.simple_tag
 def get_signup_conflicts(
-    signups: Sequence[InstructorRecruitmentSignup], recruitment: InstructorRecruitment
+    signups: Union[
+        Sequence[InstructorRecruitmentSignup],
+        IntervalIndex[InstructorRecruitmentSignup],
+    ],
+    recruitment: InstructorRecruitment,
 ) -> list[InstructorRecruitmentSignup]:
-    conflicts: list[InstructorRecruitmentSignup] = []
-
-    for signup_to_check in signups:
-        if recruitment == signup_to_check.recruitment:
-            continue
-
-        if (
-            recruitment.event.start <= signup_to_check.recruitment.event.end
-            and recruitment.event.end >= signup_to_check.recruitment.event.start
-        ):
-            conflicts.append(signup_to_check)
-
-    return conflicts
+    if not isinstance(signups, IntervalIndex):
+        signups = IntervalIndex(signups, signup_dates)
+
+    return [
+        signup_to_check
+        for signup_to_check in signups.overlapping(
+            recruitment.event.start, recruitment.event.end
+        )
+        if recruitment != signup_to_check.recruitment
+    ]
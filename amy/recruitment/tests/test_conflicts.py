@@ -0,0 +1,52 @@
+from datetime import date
+
+from django.test import TestCase
+
+from recruitment.conflicts import IntervalIndex, event_dates
+from workshops.models import Event
+
+
+class TestIntervalIndex(TestCase):
+    def setUp(self) -> None:
+        self.long_event = Event(
+            slug="2022-01-01-long", start=date(2022, 1, 1), end=date(2022, 1, 31)
+        )
+        self.event1 = Event(
+            slug="2022-01-10-test", start=date(2022, 1, 10), end=date(2022, 1, 11)
+        )
+        self.event2 = Event(
+            slug="2022-02-01-test", start=date(2022, 2, 1), end=date(2022, 2, 2)
+        )
+        self.no_end = Event(slug="2022-02-05-test", start=date(2022, 2, 5))
+        self.no_dates = Event(slug="no-dates")
+        self.index = IntervalIndex(
+            [self.event2, self.no_dates, self.event1, self.no_end, self.long_event],
+            event_dates,
+        )
+
+    def test_iteration(self) -> None:
+        self.assertEqual(len(self.index), 5)
+        self.assertEqual(
+            list(self.index),
+            [self.event2, self.no_dates, self.event1, self.no_end, self.long_event],
+        )
+
+    def test_overlapping(self) -> None:
+        # items are ordered by start date; long ranges starting much earlier than
+        # the queried range are found too
+        self.assertEqual(
+            self.index.overlapping(date(2022, 1, 20), date(2022, 2, 1)),
+            [self.long_event, self.event2],
+        )
+        self.assertEqual(
+            self.index.overlapping(date(2022, 1, 11), date(2022, 1, 11)),
+            [self.long_event, self.event1],
+        )
+        # a missing end date means a single-day range
+        self.assertEqual(self.index.overlapping(date(2022, 2, 5), None), [self.no_end])
+        self.assertEqual(self.index.overlapping(date(2022, 2, 6), None), [])
+        self.assertEqual(self.index.overlapping(None, date(2022, 2, 6)), [])
+
+    def test_empty(self) -> None:
+        index = IntervalIndex([], event_dates)
+        self.assertEqual(index.overlapping(date(2022, 1, 1), date(2022, 1, 2)), [])
@@ -68,27 +68,49 @@ class TestInstructorRecruitmentListView(TestBase):
         # Act
         context = view.get_context_data()
         # Assert
-        self.assertIn("personal_conflicts", context.keys())
-        self.assertEqual(
-            list(context["personal_conflicts"]), list(Person.objects.none())
-        )
+        self.assertEqual(context["signup_conflicts"], {})
 
     def test_get_context_data(self) -> None:
         # Arrange
         request = RequestFactory().get("/")
         request.user = mock.MagicMock()
-        view = InstructorRecruitmentList(request=request, object_list=[], filter=None)
         host = Organization.objects.first()
-        event = Event.objects.create(slug="test-event", host=host)
+        instructor = Role.objects.create(name="instructor")
+        event = Event.objects.create(
+            slug="test-event", host=host, start=date(2022, 3, 4), end=date(2022, 3, 5)
+        )
+        conflicting_event = Event.objects.create(
+            slug="conflicting-event",
+            host=host,
+            start=date(2022, 3, 5),
+            end=date(2022, 3, 6),
+        )
+        other_event = Event.objects.create(
+            slug="other-event", host=host, start=date(2022, 3, 7), end=date(2022, 3, 8)
+        )
         recruitment = InstructorRecruitment.objects.create(event=event)
         person = Person.objects.create(username="test_user")
-        InstructorRecruitmentSignup.objects.create(
+        other_person = Person.objects.create(username="other_user", email="o@o.com")
+        for e in (event, conflicting_event, other_event):
+            Task.objects.create(event=e, person=person, role=instructor)
+        signup = InstructorRecruitmentSignup.objects.create(
             recruitment=recruitment, person=person, interest="session"
         )
+        other_signup = InstructorRecruitmentSignup.objects.create(
+            recruitment=recruitment, person=other_person, interest="session"
+        )
+        view = InstructorRecruitmentList(
+            request=request,
+            object_list=InstructorRecruitmentList.queryset.all(),
+            filter=None,
+        )
         # Act
         context = view.get_context_data()
         # Assert
-        self.assertEqual(list(context["personal_conflicts"]), [person])
+        self.assertEqual(
+            context["signup_conflicts"],
+            {signup.pk: [conflicting_event], other_signup.pk: []},
+        )
 
     @override_settings(INSTRUCTOR_RECRUITMENT_ENABLED=True)
     def test_integration(self) -> None:
@@ -364,6 +386,7 @@ class TestInstructorRecruitmentDetailsView(TestBase):
                 "title": str(recruitment),
                 "instructorrecruitment": recruitment,
                 "object": recruitment,
+                "signup_conflicts": {},
                 "view": view,
             },
         )
@@ -392,6 +415,102 @@ class TestInstructorRecruitmentDetailsView(TestBase):
         self.assertEqual(response.context["object"], recruitment)
 
 
+class TestInstructorRecruitmentConflictsView(TestBase):
+    def setUp(self) -> None:
+        super().setUp()
+        super()._setUpUsersAndLogin()
+        organization = Organization.objects.first()
+        instructor = Role.objects.create(name="instructor")
+        self.event1 = Event.objects.create(
+            slug="event1",
+            host=organization,
+            start=date(2022, 3, 1),
+            end=date(2022, 3, 2),
+        )
+        self.event2 = Event.objects.create(
+            slug="event2",
+            host=organization,
+            start=date(2022, 3, 10),
+            end=date(2022, 3, 11),
+        )
+        recruitment = InstructorRecruitment.objects.create(
+            event=Event.objects.create(
+                slug="recruitment-event",
+                host=organization,
+                start=date(2022, 3, 2),
+                end=date(2022, 3, 3),
+            )
+        )
+        self.person1 = Person.objects.create(username="user1", email="u1@example.org")
+        self.person2 = Person.objects.create(username="user2", email="u2@example.org")
+        Task.objects.create(event=self.event1, person=self.person1, role=instructor)
+        Task.objects.create(event=self.event2, person=self.person2, role=instructor)
+        InstructorRecruitmentSignup.objects.create(
+            recruitment=recruitment, person=self.person1
+        )
+        InstructorRecruitmentSignup.objects.create(
+            recruitment=recruitment, person=self.person2
+        )
+        self.url = reverse("instructorrecruitment_conflicts")
+
+    @override_settings(INSTRUCTOR_RECRUITMENT_ENABLED=True)
+    def test_conflicts_in_window(self) -> None:
+        # Act
+        response = self.client.get(
+            self.url, {"start": "2022-03-02", "end": "2022-03-10"}
+        )
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "start": "2022-03-02",
+                "end": "2022-03-10",
+                "conflicts": {
+                    str(self.person1.pk): [
+                        {
+                            "slug": "event1",
+                            "start": "2022-03-01",
+                            "end": "2022-03-02",
+                            "url": self.event1.get_absolute_url(),
+                        }
+                    ],
+                    str(self.person2.pk): [
+                        {
+                            "slug": "event2",
+                            "start": "2022-03-10",
+                            "end": "2022-03-11",
+                            "url": self.event2.get_absolute_url(),
+                        }
+                    ],
+                },
+            },
+        )
+
+    @override_settings(INSTRUCTOR_RECRUITMENT_ENABLED=True)
+    def test_conflicts_for_selected_people(self) -> None:
+        # Act
+        response = self.client.get(
+            self.url, {"start": "2022-03-01", "person": [self.person2.pk]}
+        )
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["conflicts"], {})
+
+    @override_settings(INSTRUCTOR_RECRUITMENT_ENABLED=True)
+    def test_invalid_parameters(self) -> None:
+        for params in [
+            {},
+            {"start": "invalid"},
+            {"start": "2022-03-01", "person": "a"},
+        ]:
+            with self.subTest(params=params):
+                # Act
+                response = self.client.get(self.url, params)
+                # Assert
+                self.assertEqual(response.status_code, 400)
+
+
 class TestInstructorRecruitmentSignupChangeState(FakeRedisTestCaseMixin, TestBase):
     def setUp(self):
         super().setUp()
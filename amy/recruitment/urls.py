@@ -8,6 +8,11 @@ urlpatterns = [
         views.InstructorRecruitmentList.as_view(),
         name="all_instructorrecruitment",
     ),
+    path(
+        "processes/conflicts/",
+        views.InstructorRecruitmentConflicts.as_view(),
+        name="instructorrecruitment_conflicts",
+    ),
     path(
         "process/add/<int:event_id>/",
         views.InstructorRecruitmentCreate.as_view(),
@@ -1,3 +1,5 @@
+from collections import defaultdict
+from datetime import date
 import logging
 from typing import Optional
 
@@ -6,7 +8,12 @@ from django.contrib import messages
 from django.contrib.auth.mixins import PermissionRequiredMixin
 from django.db import IntegrityError
 from django.db.models import Case, Count, IntegerField, Prefetch, Value, When
-from django.http import HttpResponse, HttpResponseRedirect
+from django.http import (
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseRedirect,
+    JsonResponse,
+)
 from django.urls import reverse
 from django.views.generic import View
 from django.views.generic.edit import FormMixin
@@ -17,6 +24,7 @@ from autoemails.base_views import ActionManageMixin
 from autoemails.job import Job
 from autoemails.models import RQJob, Trigger
 from autoemails.utils import safe_next_or_default_url
+from recruitment.conflicts import get_signup_conflicts_map, instructor_tasks
 from recruitment.filters import InstructorRecruitmentFilter
 from recruitment.forms import (
     InstructorRecruitmentCreateForm,
@@ -107,20 +115,7 @@ class InstructorRecruitmentList(
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["personal_conflicts"] = (
-            Person.objects.filter(
-                instructorrecruitmentsignup__recruitment__in=self.get_queryset()
-            )
-            .distinct()
-            .prefetch_related(
-                Prefetch(
-                    "task_set",
-                    Task.objects.select_related("event", "role").filter(
-                        role__name="instructor"
-                    ),
-                )
-            )
-        )
+        context["signup_conflicts"] = get_signup_conflicts_map(context["object_list"])
         return context
 
 
@@ -235,9 +230,58 @@ class InstructorRecruitmentDetails(
     def get_context_data(self, **kwargs) -> dict:
         context = super().get_context_data(**kwargs)
         context["title"] = str(self.object)
+        context["signup_conflicts"] = get_signup_conflicts_map([self.object])
         return context
 
 
+class InstructorRecruitmentConflicts(
+    OnlyForAdminsMixin,
+    RecruitmentEnabledMixin,
+    ConditionallyEnabledMixin,
+    View,
+):
+    """Return instructor tasks overlapping with given dates window as JSON.
+
+    By default all people signed up for open recruitments are checked; this can be
+    narrowed down with `person` parameter (many allowed)."""
+
+    def get(self, request, *args, **kwargs) -> HttpResponse:
+        try:
+            start = date.fromisoformat(request.GET["start"])
+            end = date.fromisoformat(request.GET.get("end") or request.GET["start"])
+        except (KeyError, ValueError):
+            return HttpResponseBadRequest(
+                "Parameters `start` and `end` must be dates in YYYY-MM-DD format."
+            )
+        try:
+            people = [int(pk) for pk in request.GET.getlist("person")]
+        except ValueError:
+            return HttpResponseBadRequest("Parameter `person` must be an ID.")
+
+        if not people:
+            people = InstructorRecruitmentSignup.objects.filter(
+                recruitment__status="o"
+            ).values("person_id")
+
+        conflicts = defaultdict(list)
+        tasks = (
+            instructor_tasks(people)
+            .filter(event__start__lte=end, event__end__gte=start)
+            .order_by("event__start", "event__slug")
+        )
+        for task in tasks:
+            conflicts[task.person_id].append(
+                {
+                    "slug": task.event.slug,
+                    "start": task.event.start,
+                    "end": task.event.end,
+                    "url": task.event.get_absolute_url(),
+                }
+            )
+
+        return JsonResponse({"start": start, "end": end, "conflicts": conflicts})
+
+
 class InstructorRecruitmentSignupChangeState(
     OnlyForAdminsMixin,
     RecruitmentEnabledMixin,
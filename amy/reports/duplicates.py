@@ -0,0 +1,224 @@
+"""Set-based detection of possibly duplicated persons and training requests.
+
+Exact candidates (same name, switched names, same email) are found with
+`EXISTS` subqueries, so the database answers them with a single semi-join
+instead of a long chain of `OR`-ed name conditions. Fuzzy candidates (names
+equal after normalization, same email local part) are first narrowed down by
+a grouped query on coarse keys computed in the database, then grouped in one
+pass over `values_list` rows of these candidates only.
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+from django.db.models import (
+    CharField,
+    Count,
+    Exists,
+    Func,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+    Value,
+)
+from django.db.models.functions import Coalesce, Concat, Greatest, Least, Lower, Trim
+
+from workshops.util import normalize_name
+
+CHUNK_SIZE = 2000
+
+# Local parts of addresses shared by many unrelated people, e.g. of an office.
+# Objects with such emails are similar only when their whole addresses match.
+GENERIC_EMAIL_LOCAL_PARTS = frozenset(
+    [
+        "admin",
+        "contact",
+        "hello",
+        "info",
+        "mail",
+        "office",
+        "support",
+    ]
+)
+
+
+def switched_names(queryset: QuerySet) -> QuerySet:
+    """Objects whose personal and family names appear swapped in another (or the
+    same) object from the queryset."""
+    switched = queryset.filter(
+        personal=OuterRef("family"),
+        family=OuterRef("personal"),
+    ).order_by()
+    return queryset.annotate(has_switched_name=Exists(switched)).filter(
+        has_switched_name=True
+    )
+
+
+def duplicate_values(queryset: QuerySet, *fields: str) -> QuerySet:
+    """Objects sharing the same values of `fields` with at least one other object
+    from the queryset."""
+    same_values = (
+        queryset.filter(**{field: OuterRef(field) for field in fields})
+        .exclude(pk=OuterRef("pk"))
+        .order_by()
+    )
+    return queryset.annotate(has_duplicate=Exists(same_values)).filter(
+        has_duplicate=True
+    )
+
+
+def duplicate_groups(queryset: QuerySet, *fields: str) -> QuerySet:
+    """Grouped query returning values of `fields` shared by more than one object.
+
+    Each group is a dictionary; result can be paginated as any other queryset and
+    then expanded with `objects_in_groups`."""
+    return (
+        duplicate_values(queryset, *fields).order_by(*fields).values(*fields).distinct()
+    )
+
+
+def objects_in_groups(queryset: QuerySet, groups: Iterable[Dict[str, str]]) -> QuerySet:
+    """Objects belonging to given (usually one page of) groups."""
+    criteria = Q(pk__in=[])
+    for group in groups:
+        criteria |= Q(**group)
+    return queryset.filter(criteria)
+
+
+class RegexpReplace(Func):
+    function = "REGEXP_REPLACE"
+    output_field = CharField()
+
+    def __init__(self, expression, pattern: str, replacement: str, **extra):
+        super().__init__(
+            expression, Value(pattern), Value(replacement), Value("g"), **extra
+        )
+
+
+class SplitPart(Func):
+    function = "SPLIT_PART"
+    output_field = CharField()
+
+    def __init__(self, expression, delimiter: str, field: int, **extra):
+        super().__init__(expression, Value(delimiter), Value(field), **extra)
+
+
+def _coarse_name(field: str):
+    # Lower-cased ASCII letters and digits. Names equal after `normalize_name`
+    # have equal coarse names, too.
+    return Lower(RegexpReplace(Coalesce(field, Value("")), "[^a-zA-Z0-9]", ""))
+
+
+def _coarse_keys(queryset: QuerySet) -> QuerySet:
+    """Annotate objects with database counterparts of `_name_key` and
+    `_email_local_part`. Objects with equal keys in Python have equal coarse keys,
+    so the coarse keys can be used to find all candidates for similar objects."""
+    personal, family = _coarse_name("personal"), _coarse_name("family")
+    local_part = SplitPart(
+        RegexpReplace(Coalesce("email", Value("")), "@[^@]*$", ""), "+", 1
+    )
+    return queryset.order_by().annotate(
+        coarse_name=Concat(
+            Least(personal, family), Value("/"), Greatest(personal, family)
+        ),
+        coarse_email=Lower(Trim(local_part)),
+    )
+
+
+def _shared_keys(queryset: QuerySet, key: str, empty: str) -> QuerySet:
+    """Grouped query returning values of the annotated `key` shared by more than
+    one object."""
+    return (
+        queryset.exclude(**{key: empty})
+        .values(key)
+        .annotate(count=Count("pk"))
+        .filter(count__gt=1)
+        .values(key)
+    )
+
+
+def similar_candidates(queryset: QuerySet) -> QuerySet:
+    """Objects which may belong to a group returned by `similar_groups`."""
+    annotated = _coarse_keys(queryset)
+    return annotated.filter(
+        Q(coarse_name__in=Subquery(_shared_keys(annotated, "coarse_name", "/")))
+        | Q(coarse_email__in=Subquery(_shared_keys(annotated, "coarse_email", "")))
+    )
+
+
+def _email_local_part(email: str) -> str:
+    """Lower-cased local part of the email, without a "+tag" suffix."""
+    local_part = (email or "").rsplit("@", 1)[0]
+    return local_part.split("+", 1)[0].strip().lower()
+
+
+def _email_key(email: str) -> str:
+    """Email local part, or whole lower-cased address if the local part is
+    generic (see `GENERIC_EMAIL_LOCAL_PARTS`)."""
+    local_part = _email_local_part(email)
+    if local_part in GENERIC_EMAIL_LOCAL_PARTS:
+        return (email or "").strip().lower()
+    return local_part
+
+
+def _name_key(personal: str, family: str) -> str:
+    """Normalized name, regardless of order of personal and family names."""
+    return "/".join(
+        sorted([normalize_name(personal or ""), normalize_name(family or "")])
+    )
+
+
+def similar_groups(queryset: QuerySet) -> List[List[int]]:
+    """Group primary keys of objects with similar names or email local parts.
+
+    Objects are considered similar when their normalized names (see
+    `workshops.util.normalize_name`; order of names is ignored) or the local parts
+    of their emails are the same; generic local parts, like "info", must be
+    followed by the same domain. Groups are transitive: two objects similar to
+    a third one end up in the same group. Groups consisting only of objects with
+    exactly the same name are skipped, because `duplicate_groups` already reports
+    them.
+
+    Only objects returned by `similar_candidates` are read. The queryset must
+    provide `personal`, `family` and `email` fields."""
+    parent: Dict[int, int] = {}
+
+    def find(pk: int) -> int:
+        root = pk
+        while parent[root] != root:
+            root = parent[root]
+        while parent[pk] != root:
+            parent[pk], pk = root, parent[pk]
+        return root
+
+    names: Dict[int, tuple] = {}
+    first_by_key: Dict[tuple, int] = {}
+    rows = similar_candidates(queryset).values_list("pk", "personal", "family", "email")
+    for pk, personal, family, email in rows.iterator(chunk_size=CHUNK_SIZE):
+        parent[pk] = pk
+        names[pk] = (personal, family)
+
+        keys = [("name", _name_key(personal, family))]
+        email_key = _email_key(email)
+        if email_key:
+            keys.append(("email", email_key))
+
+        for key in keys:
+            if key[1] in ("", "/"):
+                continue
+            first = first_by_key.setdefault(key, pk)
+            if first != pk:
+                parent[find(pk)] = find(first)
+
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for pk in parent:
+        groups[find(pk)].append(pk)
+
+    return sorted(
+        (
+            sorted(group)
+            for group in groups.values()
+            if len(group) > 1 and len({names[pk] for pk in group}) > 1
+        ),
+        key=lambda group: group[0],
+    )
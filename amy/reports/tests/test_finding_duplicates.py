@@ -3,7 +3,8 @@ from datetime import timedelta
 from django.urls import reverse
 from django.utils import timezone
 
-from workshops.models import Person
+from reports.duplicates import similar_candidates, similar_groups
+from workshops.models import Person, TrainingRequest
 from workshops.tests.base import TestBase
 
 
@@ -296,3 +297,156 @@ class TestFindingReviewedDuplicates(TestBase):
         self.ron.refresh_from_db()
         self.assertTrue(self.harry.duplication_reviewed_on)
         self.assertTrue(self.ron.duplication_reviewed_on)
+
+
+class TestFindingSimilarPersons(TestBase):
+    def setUp(self):
+        self._setUpUsersAndLogin()
+
+        self.harry = Person.objects.create(
+            personal="Harry",
+            family="Potter",
+            username="potter_harry",
+            email="hp@hogwart.edu",
+        )
+        self.harry2 = Person.objects.create(
+            personal="harry ",
+            family="Potter.",
+            username="potter_harry_2",
+            email="harry.potter@gmail.com",
+        )
+        self.harry3 = Person.objects.create(
+            personal="H.",
+            family="Potter",
+            username="potter_harry_3",
+            email="harry.potter+amy@hogwart.edu",
+        )
+        self.ron = Person.objects.create(
+            personal="Ron",
+            family="Weasley",
+            username="weasley_ron",
+            email="rw@hogwart.edu",
+        )
+        self.ron2 = Person.objects.create(
+            personal="Ron",
+            family="Weasley",
+            username="weasley_ron_2",
+            email="rw+1@hogwart.edu",
+        )
+
+        self.url = reverse("duplicate_persons")
+
+    def test_similar_persons(self):
+        rv = self.client.get(self.url)
+        groups = rv.context["similar_persons_groups"]
+        # Harry's accounts are linked by normalized name or email local part;
+        # Ron's accounts have exactly the same names and are reported elsewhere
+        self.assertEqual(groups, [[self.harry, self.harry2, self.harry3]])
+
+    def test_generic_email_local_parts(self):
+        """People sharing a generic address of different offices aren't similar."""
+        info1 = Person.objects.create(
+            personal="Albus",
+            family="Dumbledore",
+            username="dumbledore_albus",
+            email="info@hogwart.edu",
+        )
+        Person.objects.create(
+            personal="Minerva",
+            family="McGonagall",
+            username="mcgonagall_minerva",
+            email="info@ministry.gov",
+        )
+        info3 = Person.objects.create(
+            personal="Severus",
+            family="Snape",
+            username="snape_severus",
+            email="INFO@hogwart.edu",
+        )
+
+        groups = similar_groups(Person.objects.all())
+        self.assertIn([info1.pk, info3.pk], groups)
+        self.assertEqual(len(groups), 2)
+
+    def test_similar_candidates(self):
+        candidates = similar_candidates(Person.objects.all())
+        self.assertEqual(
+            set(candidates),
+            {self.harry, self.harry2, self.harry3, self.ron, self.ron2},
+        )
+
+    def test_duplicate_names_paginated(self):
+        Person.objects.create(
+            personal="Hermione",
+            family="Granger",
+            username="granger_hermione",
+            email="hermione@hogwart.edu",
+        )
+        Person.objects.create(
+            personal="Hermione",
+            family="Granger",
+            username="granger_hermione_2",
+            email="granger@hogwart.edu",
+        )
+
+        rv = self.client.get(self.url, {"items_per_page": 1, "page": 2})
+        duplicated = rv.context["duplicate_persons"]
+        self.assertEqual(set(duplicated), {self.ron, self.ron2})
+
+
+class TestFindingDuplicateTrainingRequests(TestBase):
+    def setUp(self):
+        self._setUpUsersAndLogin()
+
+        self.request1 = TrainingRequest.objects.create(
+            personal="Harry", family="Potter", email="hp@hogwart.edu"
+        )
+        self.request2 = TrainingRequest.objects.create(
+            personal="Harry", family="Potter", email="harry@potter.com"
+        )
+        self.request3 = TrainingRequest.objects.create(
+            personal="Ron", family="Weasley", email="hp@hogwart.edu"
+        )
+        self.request4 = TrainingRequest.objects.create(
+            personal="Hermione", family="Granger", email="hg@hogwart.edu"
+        )
+        self.request5 = TrainingRequest.objects.create(
+            personal="Granger", family="Hermione", email="hermione@granger.com"
+        )
+
+        self.url = reverse("duplicate_training_requests")
+
+    def test_duplicate_names(self):
+        rv = self.client.get(self.url)
+        self.assertEqual(
+            set(rv.context["duplicate_names"]), {self.request1, self.request2}
+        )
+
+    def test_duplicate_emails(self):
+        rv = self.client.get(self.url)
+        self.assertEqual(
+            set(rv.context["duplicate_emails"]), {self.request1, self.request3}
+        )
+
+    def test_duplicate_names_and_emails_paginated_separately(self):
+        rv = self.client.get(
+            self.url, {"items_per_page": 1, "names_page": 2, "emails_page": 1}
+        )
+        names = rv.context["duplicate_names"]
+        emails = rv.context["duplicate_emails"]
+        self.assertEqual(names.number, 2)
+        self.assertEqual(emails.number, 1)
+        self.assertEqual(len(names), 1)
+        self.assertEqual(len(emails), 1)
+        self.assertIn(names[0], {self.request1, self.request2})
+        self.assertIn(emails[0], {self.request1, self.request3})
+
+    def test_similar_requests(self):
+        rv = self.client.get(self.url)
+        self.assertEqual(
+            rv.context["similar_requests_groups"],
+            [
+                [self.request1, self.request2, self.request3],
+                [self.request4, self.request5],
+            ],
+        )
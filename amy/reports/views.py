@@ -1,3 +1,4 @@
+from itertools import chain
 from typing import Optional
 
 from django.contrib import messages
@@ -9,6 +10,14 @@ from django.utils import timezone
 
 from dashboard.forms import AssignmentForm
 from fiscal.filters import MembershipTrainingsFilter
+from fiscal.usage import create_missing_usage
+from reports.duplicates import (
+    duplicate_groups,
+    duplicate_values,
+    objects_in_groups,
+    similar_groups,
+    switched_names,
+)
 from workshops.models import (
     Badge,
     Event,
@@ -25,23 +34,25 @@ from workshops.util import admin_required, get_pagination_items
 @admin_required
 def membership_trainings_stats(request):
     """Display basic statistics for memberships and instructor trainings."""
-    data = Membership.objects.prefetch_related("organizations", "task_set").annotate(
+    # seat counts come from precomputed usage, one row per membership; they don't
+    # depend on the current date, so rows computed on earlier days (refreshed
+    # daily by `rebuild_membership_usage`) are good enough
+    create_missing_usage()
+    public_utilized = F("usage__public_instructor_training_seats_utilized")
+    inhouse_utilized = F("usage__inhouse_instructor_training_seats_utilized")
+    data = Membership.objects.prefetch_related("organizations").annotate(
         instructor_training_seats_public_total=(
             F("public_instructor_training_seats")
             + F("additional_public_instructor_training_seats")
             # Coalesce returns first non-NULL value
             + Coalesce("public_instructor_training_seats_rolled_from_previous", 0)
         ),
-        instructor_training_seats_public_utilized=(
-            Count("task", filter=Q(task__role__name="learner", task__seat_public=True))
-        ),
+        instructor_training_seats_public_utilized=public_utilized,
         instructor_training_seats_public_remaining=(
             F("public_instructor_training_seats")
             + F("additional_public_instructor_training_seats")
             + Coalesce("public_instructor_training_seats_rolled_from_previous", 0)
-            - Count(
-                "task", filter=Q(task__role__name="learner", task__seat_public=True)
-            )
+            - public_utilized
             - Coalesce("public_instructor_training_seats_rolled_over", 0)
         ),
         instructor_training_seats_inhouse_total=(
@@ -50,20 +61,12 @@ def membership_trainings_stats(request):
             # Coalesce returns first non-NULL value
             + Coalesce("inhouse_instructor_training_seats_rolled_from_previous", 0)
         ),
-        instructor_training_seats_inhouse_utilized=(
-            Count(
-                "task",
-                filter=Q(task__role__name="learner", task__seat_public=False),
-            )
-        ),
+        instructor_training_seats_inhouse_utilized=inhouse_utilized,
         instructor_training_seats_inhouse_remaining=(
             F("inhouse_instructor_training_seats")
             + F("additional_inhouse_instructor_training_seats")
             + Coalesce("inhouse_instructor_training_seats_rolled_from_previous", 0)
-            - Count(
-                "task",
-                filter=Q(task__role__name="learner", task__seat_public=False),
-            )
+            - inhouse_utilized
             - Coalesce("inhouse_instructor_training_seats_rolled_over", 0)
         ),
     )
@@ -213,51 +216,35 @@ def duplicate_persons(request):
 
     Criteria for persons:
     * switched personal/family names
-    * same name on different people."""
+    * same name on different people
+    * similar names (after normalization) or email local parts."""
 
-    names_normal = set(
-        Person.objects.duplication_review_expired().values_list("personal", "family")
-    )
-    names_switched = set(
-        Person.objects.duplication_review_expired().values_list("family", "personal")
-    )
-    names = names_normal & names_switched  # intersection
-
-    switched_criteria = Q(id=0)
-    # empty query results if names is empty
-    for personal, family in names:
-        # get people who appear in `names`
-        switched_criteria |= Q(personal=personal) & Q(family=family)
-
-    switched_persons = (
-        Person.objects.duplication_review_expired()
-        .filter(switched_criteria)
-        .order_by("email")
-    )
+    persons = Person.objects.duplication_review_expired()
 
-    duplicate_names = (
-        Person.objects.duplication_review_expired()
-        .values("personal", "family")
-        .order_by("family", "personal")
-        .annotate(count_id=Count("id"))
-        .filter(count_id__gt=1)
-    )
+    switched_persons = switched_names(persons).order_by("email")
 
-    duplicate_criteria = Q(id=0)
-    for name in duplicate_names:
-        # get people who appear in `names`
-        duplicate_criteria |= Q(personal=name["personal"]) & Q(family=name["family"])
+    duplicate_names = get_pagination_items(
+        request, duplicate_groups(persons, "personal", "family")
+    )
+    duplicate_persons = objects_in_groups(persons, duplicate_names).order_by(
+        "family", "personal", "email"
+    )
 
-    duplicate_persons = (
-        Person.objects.duplication_review_expired()
-        .filter(duplicate_criteria)
-        .order_by("family", "personal", "email")
+    similar_persons = get_pagination_items(
+        request, similar_groups(persons), page_param="similar_page"
     )
+    similar_persons_by_id = persons.in_bulk(list(chain.from_iterable(similar_persons)))
+    similar_persons_groups = [
+        [similar_persons_by_id[pk] for pk in group] for group in similar_persons
+    ]
 
     context = {
         "title": "Possible duplicate persons",
         "switched_persons": switched_persons,
+        "duplicate_names": duplicate_names,
         "duplicate_persons": duplicate_persons,
+        "similar_persons": similar_persons,
+        "similar_persons_groups": similar_persons_groups,
     }
 
     return render(request, "reports/duplicate_persons.html", context)
@@ -285,41 +272,38 @@ def duplicate_training_requests(request):
 
     Criteria:
     * the same name
-    * the same email.
+    * the same email
+    * similar names (after normalization) or email local parts.
     """
-    names = (
-        TrainingRequest.objects.values("personal", "family")
-        .order_by("family", "personal")
-        .annotate(count_id=Count("id"))
-        .filter(count_id__gt=1)
-    )
-    duplicate_names_criteria = Q(id=0)
-    for name in names:
-        duplicate_names_criteria |= Q(personal=name["personal"]) & Q(
-            family=name["family"]
-        )
+    requests = TrainingRequest.objects.all()
 
-    emails = (
-        TrainingRequest.objects.values_list("email", flat=True)
-        .order_by("family", "personal")
-        .annotate(count_id=Count("id"))
-        .filter(count_id__gt=1)
+    duplicate_names = get_pagination_items(
+        request,
+        duplicate_values(requests, "personal", "family").order_by("family", "personal"),
+        page_param="names_page",
+    )
+    duplicate_emails = get_pagination_items(
+        request,
+        duplicate_values(requests, "email").order_by("email"),
+        page_param="emails_page",
     )
-    duplicate_emails_criteria = Q(id=0)
-    for email in emails:
-        duplicate_emails_criteria |= Q(email=email)
 
-    duplicate_names = TrainingRequest.objects.filter(duplicate_names_criteria).order_by(
-        "family", "personal"
+    similar_requests = get_pagination_items(
+        request, similar_groups(requests), page_param="similar_page"
+    )
+    similar_requests_by_id = requests.in_bulk(
+        list(chain.from_iterable(similar_requests))
     )
-    duplicate_emails = TrainingRequest.objects.filter(
-        duplicate_emails_criteria
-    ).order_by("email")
+    similar_requests_groups = [
+        [similar_requests_by_id[pk] for pk in group] for group in similar_requests
+    ]
 
     context = {
         "title": "Possible duplicate training requests",
         "duplicate_names": duplicate_names,
         "duplicate_emails": duplicate_emails,
+        "similar_requests": similar_requests,
+        "similar_requests_groups": similar_requests_groups,
     }
 
     return render(request, "reports/duplicate_training_requests.html", context)
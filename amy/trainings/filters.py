@@ -76,7 +76,7 @@ def filter_trainees_by_instructor_status(queryset, name, choice):
         # Instructor eligible but without any badge.
         # This code is kept in Q()-expressions to allow for fast condition
         # change.
-        return queryset.filter(Q(instructor_eligible__gte=1) & Q(is_instructor=False))
+        return queryset.filter(Q(instructor_eligible=True) & Q(is_instructor=False))
     elif choice == "no":
         return queryset.filter(
             is_instructor=False,
@@ -7,7 +7,7 @@ from django.forms import RadioSelect, TextInput
 # see issue #1330: https://github.com/swcarpentry/amy/issues/1330
 from workshops.fields import ModelSelect2Widget
 from workshops.forms import SELECT2_SIDEBAR, BootstrapHelper
-from workshops.models import Event, Person, TrainingProgress
+from workshops.models import Event, Person, Task, TrainingProgress
 
 
 class TrainingProgressForm(forms.ModelForm):
@@ -125,15 +125,18 @@ class BulkAddTrainingProgressForm(forms.ModelForm):
         trainees = cleaned_data.get("trainees")
 
         # check if all trainees have at least one training task
-        for trainee in trainees:
-            training_tasks = trainee.get_training_tasks()
-
-            if not training_tasks:
-                raise ValidationError(
-                    "It's not possible to add training "
-                    "progress to a trainee without any "
-                    "training task."
-                )
+        training_tasks = Task.objects.filter(
+            role__name="learner", event__tags__name="TTT"
+        )
+        if (
+            trainees is not None
+            and trainees.exclude(pk__in=training_tasks.values("person_id")).exists()
+        ):
+            raise ValidationError(
+                "It's not possible to add training "
+                "progress to a trainee without any "
+                "training task."
+            )
 
 
 class BulkDiscardProgressesForm(forms.Form):
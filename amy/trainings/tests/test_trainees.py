@@ -2,6 +2,7 @@ from datetime import date, datetime
 from functools import partial
 
 from django.urls import reverse
+from reversion.models import Version
 
 from trainings.filters import filter_trainees_by_instructor_status
 from trainings.views import all_trainees_queryset
@@ -80,6 +81,32 @@ class TestTraineesView(TestBase):
         }
         self.assertEqual(got, expected)
 
+        # added progresses are recorded in history
+        for progress in TrainingProgress.objects.filter(state="a"):
+            self.assertEqual(Version.objects.get_for_object(progress).count(), 1)
+
+    def test_bulk_add_progress_requires_training_task(self):
+        self.spiderman.task_set.create(
+            event=self.ttt_event,
+            role=Role.objects.get(name="learner"),
+        )
+        data = {
+            "trainees": [self.spiderman.pk, self.ironman.pk],
+            "requirement": self.discussion.pk,
+            "state": "a",
+            "submit": "",
+        }
+
+        rv = self.client.post(reverse("all_trainees"), data)
+
+        self.assertEqual(rv.status_code, 200)
+        self.assertContains(
+            rv,
+            "It&#39;s not possible to add training progress to a trainee without "
+            "any training task.",
+        )
+        self.assertFalse(TrainingProgress.objects.exists())
+
     def test_bulk_discard_progress(self):
         spiderman_progress = TrainingProgress.objects.create(
             trainee=self.spiderman, requirement=self.discussion, state="n"
@@ -327,6 +354,7 @@ class TestFilterTraineesByInstructorStatus(TestBase):
             self.instructor2,
             self.instructor3,
             self.instructor4,
+            self.trainee2,
         ]
         self.assertQuerysetEqual(rv, values, transform=lambda x: x)
 
@@ -345,7 +373,7 @@ class TestFilterTraineesByInstructorStatus(TestBase):
     def test_lc_instructors(self):
         # only LC instructors should be returned
         rv = self.filter(choice="lc")
-        values = [self.instructor3, self.instructor4]
+        values = [self.instructor3, self.instructor4, self.trainee2]
         self.assertQuerysetEqual(rv, values, transform=lambda x: x)
 
     def test_eligible_trainees(self):
@@ -362,97 +390,95 @@ class TestFilterTraineesByInstructorStatus(TestBase):
             # self.instructor1
             dict(
                 username="instructor1_instructor1",
-                is_swc_instructor=1,
-                is_dc_instructor=0,
-                is_lc_instructor=0,
-                is_instructor=1,
-                instructor_eligible=0,
+                is_swc_instructor=True,
+                is_dc_instructor=False,
+                is_lc_instructor=False,
+                is_instructor=True,
+                instructor_eligible=False,
             ),
             # self.instructor2
             dict(
                 username="instructor2_instructor2",
-                is_swc_instructor=0,
-                is_dc_instructor=1,
-                is_lc_instructor=0,
-                is_instructor=1,
-                instructor_eligible=0,
+                is_swc_instructor=False,
+                is_dc_instructor=True,
+                is_lc_instructor=False,
+                is_instructor=True,
+                instructor_eligible=False,
             ),
             # self.instructor3
             dict(
                 username="instructor3_instructor3",
-                is_swc_instructor=0,
-                is_dc_instructor=0,
-                is_lc_instructor=1,
-                is_instructor=1,
-                instructor_eligible=0,
+                is_swc_instructor=False,
+                is_dc_instructor=False,
+                is_lc_instructor=True,
+                is_instructor=True,
+                instructor_eligible=False,
             ),
             # self.instructor4
             dict(
                 username="instructor4_instructor4",
-                is_swc_instructor=1,
-                is_dc_instructor=1,
-                is_lc_instructor=1,
-                is_instructor=3,
-                instructor_eligible=0,
+                is_swc_instructor=True,
+                is_dc_instructor=True,
+                is_lc_instructor=True,
+                is_instructor=True,
+                instructor_eligible=False,
             ),
             # self.trainee1
             dict(
                 username="trainee1_trainee1",
-                is_swc_instructor=0,
-                is_dc_instructor=0,
-                is_lc_instructor=0,
-                is_instructor=0,
-                passed_training=1,
-                passed_discussion=1,
-                passed_swc_homework=1,
-                passed_dc_homework=1,
-                passed_lc_homework=0,
-                passed_homework=2,
-                passed_swc_demo=0,
-                passed_dc_demo=0,
-                passed_lc_demo=1,
-                passed_demo=1,
-                instructor_eligible=2,
+                is_swc_instructor=False,
+                is_dc_instructor=False,
+                is_lc_instructor=False,
+                is_instructor=False,
+                passed_training=True,
+                passed_discussion=True,
+                passed_swc_homework=True,
+                passed_dc_homework=True,
+                passed_lc_homework=False,
+                passed_homework=True,
+                passed_swc_demo=False,
+                passed_dc_demo=False,
+                passed_lc_demo=True,
+                passed_demo=True,
+                instructor_eligible=True,
             ),
             # self.trainee2
             dict(
                 username="trainee2_trainee2",
-                is_swc_instructor=0,
-                is_dc_instructor=0,
-                # no idea why this is counting this way, but
-                # bool(5) == True so we're cool?
-                is_lc_instructor=5,
-                is_instructor=5,
-                passed_training=1,
-                passed_discussion=1,
-                passed_swc_homework=0,
-                passed_dc_homework=1,
-                passed_lc_homework=0,
-                passed_homework=1,
-                passed_swc_demo=1,
-                passed_dc_demo=0,
-                passed_lc_demo=1,
-                passed_demo=2,
-                instructor_eligible=2,
+                is_swc_instructor=False,
+                is_dc_instructor=False,
+                is_lc_instructor=True,
+                is_instructor=True,
+                passed_training=True,
+                passed_discussion=True,
+                passed_swc_homework=False,
+                passed_dc_homework=True,
+                passed_lc_homework=False,
+                passed_homework=True,
+                passed_swc_demo=True,
+                passed_dc_demo=False,
+                passed_lc_demo=True,
+                passed_demo=True,
+                instructor_eligible=True,
             ),
             # self.trainee3
             dict(
                 username="trainee3_trainee3",
-                is_swc_instructor=0,
-                is_dc_instructor=0,
-                is_lc_instructor=0,
-                is_instructor=0,
-                passed_training=1,
-                passed_discussion=0,
-                passed_swc_homework=0,
-                passed_dc_homework=0,
-                passed_lc_homework=1,
-                passed_homework=1,
-                passed_swc_demo=0,
-                passed_dc_demo=0,
-                passed_lc_demo=1,
-                passed_demo=1,
-                instructor_eligible=0,
+                is_swc_instructor=False,
+                is_dc_instructor=False,
+                is_lc_instructor=False,
+                is_instructor=False,
+                passed_training=True,
+                passed_discussion=False,
+                passed_swc_homework=False,
+                passed_dc_homework=False,
+                passed_lc_homework=True,
+                passed_homework=True,
+                passed_swc_demo=False,
+                passed_dc_demo=False,
+                passed_lc_demo=True,
+                passed_demo=True,
+                instructor_eligible=False,
             ),
         ]
         for person, conditions in zip(rv, conditions_per_person):
@@ -468,3 +494,20 @@ class TestFilterTraineesByInstructorStatus(TestBase):
         rv = self.filter(choice="no")
         values = [self.trainee1, self.trainee3]
         self.assertQuerysetEqual(rv, values, transform=lambda x: x)
+
+    def test_discarded_progress_not_counted(self):
+        TrainingProgress.objects.filter(trainee=self.trainee1).update(discarded=True)
+        rv = self.filter(choice="eligible")
+        self.assertQuerysetEqual(rv, [], transform=lambda x: x)
+
+    def test_eligibility_not_multiplied_by_joins(self):
+        # many progresses and badges must not cause duplicated people
+        TrainingProgress.objects.create(
+            trainee=self.trainee2, requirement=self.swc_homework, state="p"
+        )
+        rv = all_trainees_queryset()
+        self.assertEqual(rv.count(), Person.objects.count())
+        trainee2 = rv.get(pk=self.trainee2.pk)
+        self.assertIs(trainee2.passed_homework, True)
+        self.assertIs(trainee2.instructor_eligible, True)
+        self.assertIs(trainee2.is_lc_instructor, True)
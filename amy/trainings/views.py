@@ -1,5 +1,5 @@
 from django.contrib import messages
-from django.db.models import Case, Count, F, IntegerField, Prefetch, Sum, When
+from django.db.models import Case, Count, F, IntegerField, Prefetch, When
 from django.shortcuts import redirect, render
 from django.urls import reverse_lazy
 
@@ -25,7 +25,12 @@ from workshops.models import (
     TrainingProgress,
     TrainingRequirement,
 )
-from workshops.util import OnlyForAdminsMixin, admin_required, get_pagination_items
+from workshops.util import (
+    OnlyForAdminsMixin,
+    add_to_revision,
+    admin_required,
+    get_pagination_items,
+)
 
 
 class AllTrainings(OnlyForAdminsMixin, AMYListView):
@@ -93,15 +98,9 @@ class TrainingProgressDelete(RedirectSupportMixin, OnlyForAdminsMixin, AMYDelete
 
 
 def all_trainees_queryset():
-    def has_badge(badge):
-        return Sum(
-            Case(
-                When(badges__name=badge, then=1), default=0, output_field=IntegerField()
-            )
-        )
-
     return (
         Person.objects.annotate_with_instructor_eligibility()
+        .annotate_with_instructor_badges()
         .prefetch_related(
             Prefetch(
                 "task_set",
@@ -116,18 +115,6 @@ def all_trainees_queryset():
             "trainingprogress_set__requirement",
             "trainingprogress_set__evaluated_by",
         )
-        .annotate(
-            is_swc_instructor=has_badge("swc-instructor"),
-            is_dc_instructor=has_badge("dc-instructor"),
-            is_lc_instructor=has_badge("lc-instructor"),
-            is_instructor=Sum(
-                Case(
-                    When(badges__name__in=Badge.INSTRUCTOR_BADGES, then=1),
-                    default=0,
-                    output_field=IntegerField(),
-                )
-            ),
-        )
         .order_by("family", "personal")
     )
 
@@ -145,8 +132,9 @@ def all_trainees(request):
         form = BulkAddTrainingProgressForm()
         discard_form = BulkDiscardProgressesForm(request.POST)
         if discard_form.is_valid():
-            for trainee in discard_form.cleaned_data["trainees"]:
-                TrainingProgress.objects.filter(trainee=trainee).update(discarded=True)
+            TrainingProgress.objects.filter(
+                trainee__in=discard_form.cleaned_data["trainees"]
+            ).update(discarded=True)
             messages.success(
                 request, "Successfully discarded progress of " "all selected trainees."
             )
@@ -161,8 +149,8 @@ def all_trainees(request):
         form = BulkAddTrainingProgressForm(request.POST, instance=instance)
         discard_form = BulkDiscardProgressesForm()
         if form.is_valid():
-            for trainee in form.cleaned_data["trainees"]:
-                TrainingProgress.objects.create(
+            progresses = TrainingProgress.objects.bulk_create(
+                TrainingProgress(
                     trainee=trainee,
                     evaluated_by=request.user,
                     requirement=form.cleaned_data["requirement"],
@@ -172,6 +160,9 @@ def all_trainees(request):
                     url=form.cleaned_data["url"],
                     notes=form.cleaned_data["notes"],
                 )
+                for trainee in form.cleaned_data["trainees"]
+            )
+            add_to_revision(progresses)
             messages.success(
                 request, "Successfully changed progress of " "all selected trainees."
             )
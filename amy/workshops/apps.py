@@ -47,3 +47,12 @@ class WorkshopsConfig(AppConfig):
             sender=TrainingRequest.previous_involvement.through,
         )
         from workshops import receivers  # noqa
+        from workshops.facets import watch_models
+
+        # models with cached filter choices
+        watch_models(
+            self.get_model("Event"),
+            self.get_model("Organization"),
+            self.get_model("Person"),
+            self.get_model("WorkshopRequest"),
+        )
@@ -23,7 +23,14 @@ from django.views.generic import (
 from django.views.generic.detail import SingleObjectMixin
 
 from workshops.forms import BootstrapHelper
-from workshops.util import Paginator, assign, failed_to_delete, get_pagination_items
+from workshops.util import (
+    Paginator,
+    assign,
+    failed_to_delete,
+    get_keyset_pagination_items,
+    get_pagination_items,
+    keyset_pagination_supported,
+)
 
 
 class FormInvalidMessageMixin:
@@ -176,6 +183,10 @@ class AMYListView(ListView):
     filter_class = None
     queryset = None
     title = None
+    # Paginate with cursors instead of page numbers, so that the cost of a page
+    # depends neither on its number nor on the number of all objects. Orderings
+    # which can't be used with cursors fall back to page numbers.
+    keyset_pagination = False
 
     def get_filter_data(self):
         """Datasource for the filter."""
@@ -192,6 +203,8 @@ class AMYListView(ListView):
                 self.get_filter_data(), super().get_queryset(), request=self.request
             )
             self.qs = self.filter.qs
+        if self.keyset_pagination and keyset_pagination_supported(self.qs):
+            return get_keyset_pagination_items(self.request, self.qs, with_count=True)
         paginated = get_pagination_items(self.request, self.qs)
         return paginated
 
@@ -0,0 +1,76 @@
+"""Streaming exports of (possibly large) querysets.
+
+Objects are read from the database in chunks (with a server-side cursor), and
+their `prefetch_related()` lookups are done separately for each chunk. Rows are
+sent to the client as soon as they're generated, so neither memory usage nor the
+time to first byte depends on the number of exported objects."""
+import csv
+from itertools import islice
+import json
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet, prefetch_related_objects
+from django.http import StreamingHttpResponse
+
+EXPORT_CHUNK_SIZE = 500
+
+
+def iterate_in_chunks(
+    queryset: QuerySet, chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[Any]:
+    """Like `queryset.iterator(chunk_size)`, but with queryset's prefetch lookups
+    done for each chunk of objects (`QuerySet.iterator()` ignores them)."""
+    lookups = queryset._prefetch_related_lookups
+    iterator = queryset.prefetch_related(None).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        prefetch_related_objects(chunk, *lookups)
+        yield from chunk
+
+
+class Echo:
+    """File-like object which returns written value instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(
+    rows: Iterable[Sequence[Any]], header: Optional[Sequence[str]] = None
+) -> Iterator[str]:
+    writer = csv.writer(Echo())
+    if header is not None:
+        yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def json_lines(items: Iterable[Any]) -> Iterator[str]:
+    for item in items:
+        yield json.dumps(item, cls=DjangoJSONEncoder) + "\n"
+
+
+def _streaming_response(
+    content: Iterator[str], content_type: str, filename: Optional[str]
+) -> StreamingHttpResponse:
+    response = StreamingHttpResponse(content, content_type=content_type)
+    if filename:
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def streaming_csv_response(
+    rows: Iterable[Sequence[Any]],
+    header: Optional[Sequence[str]] = None,
+    filename: Optional[str] = None,
+) -> StreamingHttpResponse:
+    return _streaming_response(csv_lines(rows, header), "text/csv", filename)
+
+
+def streaming_json_lines_response(
+    items: Iterable[Any], filename: Optional[str] = None
+) -> StreamingHttpResponse:
+    return _streaming_response(json_lines(items), "application/jsonl", filename)
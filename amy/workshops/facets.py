@@ -0,0 +1,141 @@
+"""Cache of facet values (e.g. all countries of events) used by list filters.
+
+Building a filter form requires distinct values of a field over a whole table,
+so they're kept in the default cache. Each cached value is tagged with versions
+of the models it was computed from; a model's version is bumped whenever any of
+its objects is saved or deleted. Only models passed to `watch_models()` are
+cached, facets of other models are always computed from the database.
+"""
+from typing import Any, Callable, Iterable, List, Tuple, Type
+
+from django.core.cache import cache
+from django.db import connections, models, transaction
+from django.db.models import Count
+from django.db.models.signals import post_delete, post_save
+
+FACET_KEY = "facets:{db}:{name}"
+FACET_VERSION_KEY = "facets:{db}:version:{model}"
+# safety net for changes which don't send signals, e.g. `QuerySet.update()`
+FACET_TIMEOUT = 60 * 60  # 1 hour
+
+_watched_models = set()
+
+
+def _db_name(model: Type[models.Model]) -> str:
+    # several databases (e.g. test ones) may share a single cache
+    return connections[model._default_manager.db].settings_dict["NAME"]
+
+
+def _version_key(model: Type[models.Model]) -> str:
+    return FACET_VERSION_KEY.format(db=_db_name(model), model=model._meta.label_lower)
+
+
+def _bump_version(model: Type[models.Model]) -> None:
+    try:
+        cache.incr(_version_key(model))
+    except ValueError:
+        # key doesn't exist, so nothing was cached with it
+        pass
+
+
+def invalidate_facets(model: Type[models.Model]) -> None:
+    """Invalidate all cached facets computed from given model.
+
+    Invalidation happens both immediately and after the current transaction
+    commits, so that facets computed from not yet committed data by a concurrent
+    request aren't kept in the cache."""
+    _bump_version(model)
+    transaction.on_commit(lambda: _bump_version(model))
+
+
+def _invalidate_facets_receiver(sender, **kwargs):
+    invalidate_facets(sender)
+
+
+def watch_models(*models_: Type[models.Model]) -> None:
+    """Enable caching of facets of given models; the cache is invalidated when
+    any of their objects is saved or deleted."""
+    for model in models_:
+        uid = f"invalidate_facets_{model._meta.label_lower}"
+        post_save.connect(_invalidate_facets_receiver, sender=model, dispatch_uid=uid)
+        post_delete.connect(_invalidate_facets_receiver, sender=model, dispatch_uid=uid)
+        _watched_models.add(model)
+
+
+def cached_facet(
+    name: str, models_: Iterable[Type[models.Model]], compute: Callable[[], Any]
+) -> Any:
+    """Return `compute()` result, cached until any object of `models_` changes.
+    Usually uses a single cache round-trip."""
+    models_ = list(models_)
+    if not _watched_models.issuperset(models_):
+        return compute()
+
+    key = FACET_KEY.format(db=_db_name(models_[0]), name=name)
+    version_keys = [_version_key(model) for model in models_]
+    values = cache.get_many([*version_keys, key])
+
+    missing = [version_key for version_key in version_keys if version_key not in values]
+    if missing:
+        for version_key in missing:
+            cache.add(version_key, 1, timeout=None)
+        values.update(cache.get_many(missing))
+    versions = [values.get(version_key) for version_key in version_keys]
+
+    try:
+        cached_versions, result = values[key]
+    except (KeyError, TypeError, ValueError):
+        pass
+    else:
+        if cached_versions == versions:
+            return result
+
+    result = compute()
+    cache.set(key, (versions, result), timeout=FACET_TIMEOUT)
+    return result
+
+
+def distinct_values(
+    model: Type[models.Model], field_name: str, counts: bool = False
+) -> List[Any]:
+    """Ordered, non-empty distinct values of the field, or (value, count) pairs
+    when `counts` is set."""
+
+    def compute():
+        qs = model._default_manager.order_by(field_name)
+        if counts:
+            qs = qs.values_list(field_name).annotate(count=Count("pk"))
+        else:
+            qs = qs.values_list(field_name, flat=True).distinct()
+        return [row for row in qs if (row[0] if counts else row)]
+
+    name = f"{model._meta.label_lower}:{field_name}:{'counts' if counts else ''}"
+    return cached_facet(name, [model], compute)
+
+
+def related_choices(
+    model: Type[models.Model],
+    field_name: str,
+    related_model: Type[models.Model],
+    counts: bool = False,
+) -> List[Tuple[Any, str]]:
+    """Choices (pk, label) of `related_model` objects referenced by the field;
+    the label includes number of referencing objects when `counts` is set."""
+
+    def compute():
+        referenced = dict(
+            model._default_manager.order_by()
+            .values_list(field_name)
+            .annotate(count=Count("pk"))
+        )
+        referenced.pop(None, None)
+        objects = related_model._default_manager.filter(pk__in=referenced.keys())
+        if counts:
+            return [(obj.pk, f"{obj} ({referenced[obj.pk]})") for obj in objects]
+        return [(obj.pk, str(obj)) for obj in objects]
+
+    name = (
+        f"{model._meta.label_lower}:{field_name}:"
+        f"{related_model._meta.label_lower}:{'counts' if counts else ''}"
+    )
+    return cached_facet(name, [model, related_model], compute)
@@ -7,6 +7,7 @@ from django_countries import Countries
 import django_filters
 
 from dashboard.models import Continent
+from workshops.facets import distinct_values, related_choices
 from workshops.fields import (
     ModelSelect2MultipleWidget,
     ModelSelect2Widget,
@@ -49,12 +50,19 @@ def extend_country_choices(
     return countries
 
 
-class AllCountriesFilter(django_filters.ChoiceFilter):
+class CountriesFacetMixin:
+    """Choices are countries which are used by the model, optionally with number
+    of objects in each country. They're cached (see `workshops.facets`)."""
+
+    def __init__(self, *args, counts: bool = False, **kwargs):
+        self.counts = counts
+        super().__init__(*args, **kwargs)
+
     def _get_countries(self):
-        qs = self.model._default_manager.distinct()
-        qs = qs.order_by(self.field_name).values_list(self.field_name, flat=True)
-        choices = [o for o in qs if o]
-        return choices
+        return distinct_values(self.model, self.field_name)
+
+    def _get_counts(self):
+        return dict(distinct_values(self.model, self.field_name, counts=True))
 
     @property
     def field(self):
@@ -63,42 +71,41 @@ class AllCountriesFilter(django_filters.ChoiceFilter):
         countries = Countries()
         countries.only = overrides
 
-        self.extra["choices"] = list(countries)
+        choices = list(countries)
+        if self.counts:
+            counts = self._get_counts()
+            choices = [
+                (code, f"{name} ({counts.get(code, 0)})") for code, name in choices
+            ]
+
+        self.extra["choices"] = choices
         return super().field
 
 
-class AllCountriesMultipleFilter(django_filters.MultipleChoiceFilter):
-    def _get_countries(self):
-        qs = self.model._default_manager.distinct()
-        qs = qs.order_by(self.field_name).values_list(self.field_name, flat=True)
-        choices = [o for o in qs if o]
-        return choices
+class AllCountriesFilter(CountriesFacetMixin, django_filters.ChoiceFilter):
+    pass
 
-    @property
-    def field(self):
-        choices = self._get_countries()
-        overrides = extend_country_choices(choices, settings.COUNTRIES_OVERRIDE)
-        countries = Countries()
-        countries.only = overrides
 
-        self.extra["choices"] = list(countries)
-        return super().field
+class AllCountriesMultipleFilter(
+    CountriesFacetMixin, django_filters.MultipleChoiceFilter
+):
+    pass
 
 
 class ForeignKeyAllValuesFilter(django_filters.ChoiceFilter):
-    def __init__(self, model, *args, **kwargs):
+    """Choices are objects referenced by the model, optionally with number of
+    referencing objects. They're cached (see `workshops.facets`)."""
+
+    def __init__(self, model, *args, counts: bool = False, **kwargs):
         self.lookup_model = model
+        self.counts = counts
         super().__init__(*args, **kwargs)
 
     @property
     def field(self):
-        name = self.field_name
-        model = self.lookup_model
-
-        qs1 = self.model._default_manager.distinct()
-        qs1 = qs1.order_by(name).values_list(name, flat=True)
-        qs2 = model.objects.filter(pk__in=qs1)
-        self.extra["choices"] = [(o.pk, str(o)) for o in qs2]
+        self.extra["choices"] = related_choices(
+            self.model, self.field_name, self.lookup_model, counts=self.counts
+        )
         return super().field
 
 
@@ -226,7 +233,7 @@ class EventFilter(AMYFilterSet):
         ),
     )
 
-    country = AllCountriesFilter(widget=Select2Widget)
+    country = AllCountriesFilter(widget=Select2Widget, counts=True)
     continent = ContinentFilter(widget=Select2Widget, label="Continent")
 
     order_by = django_filters.OrderingFilter(
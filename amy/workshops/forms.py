@@ -245,6 +245,12 @@ class WorkshopStaffForm(forms.Form):
         queryset=Airport.objects.all(),
         widget=ModelSelect2Widget(data_view="airport-lookup", attrs=SELECT2_SIDEBAR),
     )
+    radius = forms.FloatField(
+        label="Within distance (km)",
+        min_value=0.0,
+        required=False,
+        help_text="Only with an airport or coordinates.",
+    )
     languages = forms.ModelMultipleChoiceField(
         label="Languages",
         required=False,
@@ -320,6 +326,8 @@ class WorkshopStaffForm(forms.Form):
                     HTML("<hr>"),
                     "latitude",
                     "longitude",
+                    HTML("<hr>"),
+                    "radius",
                     css_class="card-body",
                 ),
                 css_class="card",
@@ -361,6 +369,13 @@ class WorkshopStaffForm(forms.Form):
                 "Must specify an airport OR a country, OR use coordinates, OR "
                 "none of them."
             )
+
+        # distance is calculated only from an airport or coordinates
+        if cleaned_data.get("radius") is not None and not (airport or latlng):
+            raise ValidationError(
+                "Must specify an airport or coordinates if searching within "
+                "a distance."
+            )
         return cleaned_data
 
 
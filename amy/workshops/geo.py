@@ -0,0 +1,87 @@
+"""Great-circle distances and bounding boxes for location-based searches.
+
+A radius search is done in two steps: a cheap bounding box condition on
+(indexed) latitude and longitude narrows down candidates, then the exact
+great-circle distance is compared with the radius only for rows inside the box."""
+import math
+from typing import List, Optional, Tuple
+
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+# mean Earth radius
+EARTH_RADIUS_KM = 6371.0088
+
+Range = Tuple[float, float]
+
+
+def great_circle_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Distance in kilometres between two points (haversine formula)."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = (
+        math.sin(d_phi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, a)))
+
+
+def great_circle_distance_expression(
+    lat: float, lng: float, lat_field: str = "latitude", lng_field: str = "longitude"
+):
+    """Database counterpart of `great_circle_distance()`: distance in kilometres
+    between given point and coordinates stored in `lat_field` and `lng_field`."""
+    phi = math.radians(lat)
+    a = Power(Sin((Radians(F(lat_field)) - Value(phi)) / Value(2.0)), 2) + Value(
+        math.cos(phi)
+    ) * Cos(Radians(F(lat_field))) * Power(
+        Sin((Radians(F(lng_field)) - Value(math.radians(lng))) / Value(2.0)), 2
+    )
+    return Value(2 * EARTH_RADIUS_KM) * ASin(
+        Sqrt(Least(Value(1.0), a, output_field=FloatField()))
+    )
+
+
+def bounding_box(
+    lat: float, lng: float, radius_km: float
+) -> Tuple[Range, Optional[List[Range]]]:
+    """Return latitude range and longitude ranges (or `None` if all longitudes
+    match) of a box containing every point within `radius_km` of given point.
+
+    There are two longitude ranges when the box crosses the antimeridian."""
+    angle = radius_km / EARTH_RADIUS_KM
+    d_lat = math.degrees(angle)
+    min_lat, max_lat = lat - d_lat, lat + d_lat
+
+    # a pole is within the radius: all longitudes are possible
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        return (max(min_lat, -90.0), min(max_lat, 90.0)), None
+
+    d_lng = math.degrees(math.asin(math.sin(angle) / math.cos(math.radians(lat))))
+    min_lng, max_lng = lng - d_lng, lng + d_lng
+    if min_lng < -180.0:
+        lng_ranges = [(min_lng + 360.0, 180.0), (-180.0, max_lng)]
+    elif max_lng > 180.0:
+        lng_ranges = [(min_lng, 180.0), (-180.0, max_lng - 360.0)]
+    else:
+        lng_ranges = [(min_lng, max_lng)]
+    return (min_lat, max_lat), lng_ranges
+
+
+def bounding_box_q(
+    lat: float,
+    lng: float,
+    radius_km: float,
+    lat_field: str = "latitude",
+    lng_field: str = "longitude",
+) -> Q:
+    """Condition matching coordinates inside `bounding_box()`."""
+    lat_range, lng_ranges = bounding_box(lat, lng, radius_km)
+    q = Q(**{f"{lat_field}__range": lat_range})
+    if lng_ranges is not None:
+        lng_q = Q()
+        for lng_range in lng_ranges:
+            lng_q |= Q(**{f"{lng_field}__range": lng_range})
+        q &= lng_q
+    return q
@@ -1,9 +1,14 @@
+from collections import namedtuple
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 import datetime
 from functools import partial
 import json
 import socket
 import sys
+import threading
+import time
+from urllib.parse import urlparse
 
 from django.core.management.base import BaseCommand
 from github import Github
@@ -14,10 +19,26 @@ from rest_framework.utils.encoders import JSONEncoder
 from workshops.models import Event
 from workshops.util import (
     WrongWorkshopURL,
-    fetch_workshop_metadata,
+    cache_workshop_metadata,
+    http_session,
     parse_workshop_metadata,
+    workshop_metadata_from_response,
 )
 
+GITHUB_API_URL = "https://api.github.com"
+
+# fields changed by checking event's website, saved in bulk at the end of the run
+EVENT_UPDATE_FIELDS = [
+    "repository_last_commit_hash",
+    "repository_metadata",
+    "repository_metadata_etag",
+    "repository_metadata_last_modified",
+    "metadata_all_changes",
+    "metadata_changed",
+]
+
+EventCheck = namedtuple("EventCheck", ["event", "changes", "modified", "error"])
+
 
 def datetime_match(string):
     """Convert string date/datetime/time to date/datetime/time."""
@@ -76,9 +97,37 @@ def datetime_decode(obj):
         return obj
 
 
+class HostRateLimiter:
+    """Space out requests to the same host by at least `interval` seconds.
+
+    Safe to use from many threads at once."""
+
+    def __init__(self, interval=0):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.next_request_at = dict()
+
+    def wait(self, url):
+        host = urlparse(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            request_at = max(now, self.next_request_at.get(host, now))
+            self.next_request_at[host] = request_at + self.interval
+
+        if request_at > now:
+            time.sleep(request_at - now)
+
+
 class Command(BaseCommand):
     help = "Check if events have had their metadata updated."
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.token = None
+        self.rate_limiter = HostRateLimiter()
+        # GitHub clients aren't shared between threads
+        self.local = threading.local()
+
     def add_arguments(self, parser):
         parser.add_argument(
             "-t",
@@ -103,6 +152,19 @@ class Command(BaseCommand):
             help="Age (in days) of the oldest events that can be checked.  "
             "Default: 180",
         )
+        parser.add_argument(
+            "--workers",
+            default=8,
+            type=int,
+            help="Number of events checked concurrently.  Default: 8",
+        )
+        parser.add_argument(
+            "--per-host-delay",
+            default=0.5,
+            type=float,
+            help="Minimum delay (in seconds) between requests sent to the same "
+            "host (e.g. GitHub API).  Default: 0.5",
+        )
 
     def get_events(self, cutoff_days=180):
         """Get all active events.
@@ -127,12 +189,54 @@ class Command(BaseCommand):
             return groups["name"], groups["repo"]
         raise WrongWorkshopURL("URL doesn't match Github repo format.")
 
-    def get_event_metadata(self, event_url):
-        """Get metadata from event (location, instructors, helpers, etc.)."""
-        metadata = fetch_workshop_metadata(event_url)
+    def get_github(self):
+        """Get GitHub API client of the current thread."""
+        if not hasattr(self.local, "github"):
+            self.local.github = Github(self.token)
+        return self.local.github
+
+    def http_get(self, url, **kwargs):
+        """Rate-limited GET request sent with the current thread's session."""
+        self.rate_limiter.wait(url)
+        return http_session().get(url, **kwargs)
+
+    def fetch_event_metadata(self, event, conditional=True):
+        """Get metadata (location, instructors, helpers, etc.) from event's
+        website and normalize them.
+
+        If `conditional`, the website is requested with ETag and Last-Modified
+        values stored from the previous fetch; None is returned when the website
+        hasn't been modified since then."""
+        headers = dict()
+        if conditional and event.repository_metadata_etag:
+            headers["If-None-Match"] = event.repository_metadata_etag
+        if conditional and event.repository_metadata_last_modified:
+            headers["If-Modified-Since"] = event.repository_metadata_last_modified
+
+        response = self.http_get(event.url, headers=headers, timeout=5)
+        if response.status_code == 304:
+            return None
+
+        metadata = workshop_metadata_from_response(
+            event.url, response, get=self.http_get
+        )
+        # views fetching the same website can use these metadata; they look them
+        # up by the normalized URL
+        cache_workshop_metadata(event.website_url, metadata, response)
+
+        # values too long to be stored are dropped; requests will be sent
+        # unconditionally then
+        for field_name, header in (
+            ("repository_metadata_etag", "ETag"),
+            ("repository_metadata_last_modified", "Last-Modified"),
+        ):
+            value = response.headers.get(header, "")
+            if len(value) > Event._meta.get_field(field_name).max_length:
+                value = ""
+            setattr(event, field_name, value)
+
         # normalize the metadata
-        metadata = parse_workshop_metadata(metadata)
-        return metadata
+        return parse_workshop_metadata(metadata)
 
     def empty_metadata(self):
         """Prepare basic, empty metadata."""
@@ -151,12 +255,16 @@ class Command(BaseCommand):
     def load_from_github(self, github, repo_url, default_branch="gh-pages"):
         """Fetch repository data from GitHub API."""
         owner, repo_name = self.parse_github_url(repo_url)
+        self.rate_limiter.wait(GITHUB_API_URL)
         repo = github.get_repo("{}/{}".format(owner, repo_name))
+        self.rate_limiter.wait(GITHUB_API_URL)
         branch = repo.get_branch("gh-pages")
         return branch
 
-    def detect_changes(self, branch, event, save_metadata=False):
-        """Detect changes made to event's metadata."""
+    def detect_changes(self, branch, event, save_metadata=False, commit=True):
+        """Detect changes made to event's metadata.
+
+        If not `commit`, the event is updated but not saved."""
         changes = []
 
         # compare commit hashes
@@ -164,7 +272,12 @@ class Command(BaseCommand):
             # Hashes differ? Update commit hash and compare stored metadata
             event.repository_last_commit_hash = branch.commit.sha
 
-            metadata_new = self.get_event_metadata(event.url)
+            metadata_new = self.fetch_event_metadata(event)
+            if metadata_new is None:
+                # website not modified since it was last fetched
+                if commit:
+                    event.save()
+                return changes
 
             try:
                 metadata_old = self.deserialize(event.repository_metadata)
@@ -198,22 +311,65 @@ class Command(BaseCommand):
                 if save_metadata:
                     # we may not want to update the metadata
                     event.repository_metadata = self.serialize(metadata_new)
+                else:
+                    # stored metadata are outdated, so the website can't be
+                    # reported as not modified next time
+                    event.repository_metadata_etag = ""
+                    event.repository_metadata_last_modified = ""
 
                 event.metadata_all_changes = "\n".join(changes)
                 event.metadata_changed = True
 
-            event.save()
+            if commit:
+                event.save()
 
         return changes
 
-    def init(self, branch, event):
-        """Load initial data into event's repository and metadata information."""
+    def init(self, branch, event, commit=True):
+        """Load initial data into event's repository and metadata information.
+
+        If not `commit`, the event is updated but not saved."""
         event.repository_last_commit_hash = branch.commit.sha
-        metadata = self.get_event_metadata(event.url)
+        metadata = self.fetch_event_metadata(event, conditional=False)
         event.repository_metadata = self.serialize(metadata)
         event.metadata_all_changes = ""
         event.metadata_changed = False
-        event.save()
+        if commit:
+            event.save()
+
+    def check_event(self, event, initial_run=False):
+        """Initialize or detect changes for a single event, without saving it.
+
+        Runs in worker threads, so it doesn't access the database."""
+        changes = []
+        error = None
+        commit_hash = event.repository_last_commit_hash
+        try:
+            branch = self.load_from_github(self.get_github(), event.repository_url)
+            if initial_run:
+                self.init(branch, event, commit=False)
+            else:
+                changes = self.detect_changes(branch, event, commit=False)
+
+        except GithubException:
+            error = "GitHub error when accessing {} repo".format(event.slug)
+
+        except socket.timeout:
+            error = "Timeout when accessing {} repo".format(event.slug)
+
+        except WrongWorkshopURL:
+            error = "Wrong URL for {}".format(event.slug)
+
+        except requests.exceptions.RequestException:
+            error = "Network error when accessing {}".format(event.slug)
+
+        except Exception as e:
+            error = "Unknown error ({}): {}".format(event.slug, e)
+
+        modified = error is None and (
+            initial_run or commit_hash != event.repository_last_commit_hash
+        )
+        return EventCheck(event, changes, modified, error)
 
     def handle(self, *args, **options):
         """Run."""
@@ -222,7 +378,8 @@ class Command(BaseCommand):
         slug = options["slug"]
         cutoff_days = options["cutoff_days"]
 
-        g = Github(token)
+        self.token = token
+        self.rate_limiter = HostRateLimiter(options["per_host_delay"])
 
         # get all events
         events = self.get_events(cutoff_days)
@@ -233,40 +390,26 @@ class Command(BaseCommand):
         # dict of events with changes that will be updated in
         # the separate loop
         events_for_update = dict()
+        modified_events = []
+
+        # go through all events; their websites are checked concurrently, but
+        # the results are processed (and saved) in this thread
+        with ThreadPoolExecutor(max_workers=max(options["workers"], 1)) as executor:
+            checks = executor.map(
+                partial(self.check_event, initial_run=initial_run), list(events)
+            )
+            for check in checks:
+                if check.error:
+                    print(check.error, file=sys.stderr)
+                    continue
+
+                if check.modified:
+                    modified_events.append(check.event)
 
-        # go through all events
-        for event in events:
-            try:
                 if initial_run:
-                    branch = self.load_from_github(g, event.repository_url)
-                    self.init(branch, event)
-                    print("Initialized {}".format(event.slug))
-                else:
-                    branch = self.load_from_github(g, event.repository_url)
-                    changes = self.detect_changes(branch, event)
-                    if changes:
-                        events_for_update[event.slug] = changes
-                        print("Detected changes in {}".format(event.slug))
-
-            except GithubException:
-                print(
-                    "GitHub error when accessing {} repo".format(event.slug),
-                    file=sys.stderr,
-                )
-
-            except socket.timeout:
-                print(
-                    "Timeout when accessing {} repo".format(event.slug), file=sys.stderr
-                )
-
-            except WrongWorkshopURL:
-                print("Wrong URL for {}".format(event.slug), file=sys.stderr)
-
-            except requests.exceptions.RequestException:
-                print(
-                    "Network error when accessing {}".format(event.slug),
-                    file=sys.stderr,
-                )
-
-            except Exception as e:
-                print("Unknown error ({}): {}".format(event.slug, e), file=sys.stderr)
+                    print("Initialized {}".format(check.event.slug))
+                elif check.changes:
+                    events_for_update[check.event.slug] = check.changes
+                    print("Detected changes in {}".format(check.event.slug))
+
+        Event.objects.bulk_update(modified_events, EVENT_UPDATE_FIELDS, batch_size=100)
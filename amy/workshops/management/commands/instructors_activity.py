@@ -1,11 +1,13 @@
+from collections import defaultdict
 import logging
 import os
 
 from django.core.mail import send_mail
 from django.core.management.base import BaseCommand
+from django.db.models import Prefetch
 from django.template.loader import get_template
 
-from workshops.models import Badge, Person, Role
+from workshops.models import Award, Badge, Person, Role, Task
 
 logger = logging.getLogger()
 
@@ -40,17 +42,46 @@ class Command(BaseCommand):
             default="workshops@carpentries.org",
             help='E-mail used in "from:" field.',
         )
+        parser.add_argument(
+            "-o",
+            "--output",
+            action="store",
+            default=None,
+            help="Write all emails to this file instead of sending them.",
+        )
 
     def foreign_tasks(self, tasks, person, roles):
         """List of other instructors' tasks, per event."""
+        tasks = list(tasks)
+        tasks_by_event = self.tasks_by_event(
+            Task.objects.filter(pk__in=[task.pk for task in tasks]).values("event"),
+            roles,
+        )
+        return self.foreign_tasks_from_map(tasks, person, tasks_by_event)
+
+    def foreign_tasks_from_map(self, tasks, person, tasks_by_event):
+        """Like `foreign_tasks`, but takes tasks from `tasks_by_event` map."""
         return [
-            task.event.task_set.filter(role__in=roles)
-            .exclude(person=person)
-            .select_related("person")
+            [t for t in tasks_by_event[task.event_id] if t.person_id != person.pk]
             for task in tasks
         ]
 
-    def fetch_activity(self, may_contact_only=True):
+    def tasks_by_event(self, events, roles):
+        """Map of event ID to tasks with given roles in that event, fetched in
+        a single query."""
+        result = defaultdict(list)
+        tasks = Task.objects.filter(event__in=events, role__in=roles).select_related(
+            "person"
+        )
+        for task in tasks:
+            result[task.event_id].append(task)
+        return result
+
+    def iter_activity(self, may_contact_only=True):
+        """Yield activity records of all instructors.
+
+        All data is fetched with a few bulk queries, regardless of the number of
+        instructors or their tasks."""
         roles = Role.objects.filter(name__in=["instructor", "helper"])
         instructor_badges = Badge.objects.instructor_badges()
 
@@ -59,30 +90,46 @@ class Command(BaseCommand):
         if may_contact_only:
             instructors = instructors.exclude(may_contact=False)
 
+        # don't repeat the records
+        instructors = instructors.distinct()
+
+        # tasks of all instructors and helpers in events of these instructors
+        tasks_by_event = self.tasks_by_event(
+            Task.objects.filter(person__in=instructors, role__in=roles).values("event"),
+            roles,
+        )
+
         # let's get some things faster
         instructors = instructors.select_related("airport").prefetch_related(
-            "task_set", "lessons", "award_set", "badges"
+            Prefetch(
+                "task_set",
+                queryset=Task.objects.filter(role__in=roles).select_related(
+                    "event", "role"
+                ),
+                to_attr="activity_tasks",
+            ),
+            "lessons",
+            Prefetch(
+                "award_set",
+                queryset=Award.objects.filter(
+                    badge__in=instructor_badges
+                ).select_related("badge"),
+                to_attr="instructor_awards",
+            ),
         )
 
-        # don't repeat the records
-        instructors = instructors.distinct()
-
-        result = []
         for person in instructors:
-            tasks = person.task_set.filter(role__in=roles).select_related(
-                "event", "role"
-            )
-            record = {
+            tasks = person.activity_tasks
+            foreign_tasks = self.foreign_tasks_from_map(tasks, person, tasks_by_event)
+            yield {
                 "person": person,
                 "lessons": person.lessons.all(),
-                "instructor_awards": person.award_set.filter(
-                    badge__in=person.badges.instructor_badges()
-                ),
-                "tasks": zip(tasks, self.foreign_tasks(tasks, person, roles)),
+                "instructor_awards": person.instructor_awards,
+                "tasks": zip(tasks, foreign_tasks),
             }
-            result.append(record)
 
-        return result
+    def fetch_activity(self, may_contact_only=True):
+        return list(self.iter_activity(may_contact_only))
 
     def make_message(self, record):
         tmplt = get_template("mailing/instructor_activity.txt")
@@ -123,6 +170,14 @@ class Command(BaseCommand):
             # write whole message out
             self.stdout.write(message + "\n")
 
+    def write_message(self, output, subject, message, sender, recipient):
+        """Write whole message out to the `output` file instead of sending it."""
+        output.write("-" * 40 + "\n")
+        output.write("To: {}\n".format(recipient))
+        output.write("Subject: {}\n".format(subject))
+        output.write("From: {}\n".format(sender))
+        output.write(message + "\n")
+
     def handle(self, *args, **options):
         # default is dummy run - only actually send mail if told to
         send_for_real = options["send_out_for_real"]
@@ -138,20 +193,34 @@ class Command(BaseCommand):
 
         sender = options["sender"]
 
-        results = self.fetch_activity(not no_may_contact_only)
-
-        for result in results:
-            message = self.make_message(result)
-            subject = self.subject(result)
-            recipient = self.recipient(result)
-            self.send_message(
-                subject,
-                message,
-                sender,
-                recipient,
-                for_real=send_for_real,
-                django_mailing=django_mailing,
-            )
+        output = options["output"]
+        output_file = open(output, "w", encoding="utf-8") if output else None
+
+        # records are rendered and sent one by one, as they are fetched
+        count = 0
+        try:
+            for result in self.iter_activity(not no_may_contact_only):
+                message = self.make_message(result)
+                subject = self.subject(result)
+                recipient = self.recipient(result)
+                if output_file:
+                    self.write_message(output_file, subject, message, sender, recipient)
+                else:
+                    self.send_message(
+                        subject,
+                        message,
+                        sender,
+                        recipient,
+                        for_real=send_for_real,
+                        django_mailing=django_mailing,
+                    )
+                count += 1
+        finally:
+            if output_file:
+                output_file.close()
 
         if self.verbosity >= 1:
-            self.stdout.write("Sent {} emails.\n".format(len(results)))
+            if output_file:
+                self.stdout.write("Wrote {} emails to {}.\n".format(count, output))
+            else:
+                self.stdout.write("Sent {} emails.\n".format(count))
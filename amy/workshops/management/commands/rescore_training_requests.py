@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from workshops.models import TrainingRequest
+from workshops.scoring import BATCH_SIZE, rescore_training_requests
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalculate automatic score of training requests, e.g. after the scoring "
+        "rubric has changed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--state",
+            choices=[state for state, _ in TrainingRequest.STATE_CHOICES],
+            help="Rescore only requests in this state (default: all requests).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Number of requests fetched and updated at once.",
+        )
+
+    def handle(self, *args, **options):
+        queryset = TrainingRequest.objects.all()
+        if options["state"]:
+            queryset = queryset.filter(state=options["state"])
+
+        count = rescore_training_requests(queryset, batch_size=options["batch_size"])
+        self.stdout.write("Updated score of {} training requests.".format(count))
@@ -0,0 +1,23 @@
+# Generated by Django 2.2.28 on 2026-10-18 20:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workshops', '0252_auto_20211231_1108'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='repository_metadata_etag',
+            field=models.CharField(blank=True, default='', help_text="ETag of event's website, used in conditional requests", max_length=255),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='repository_metadata_last_modified',
+            field=models.CharField(blank=True, default='', help_text="Last-Modified date of event's website, used in conditional requests", max_length=40),
+        ),
+    ]
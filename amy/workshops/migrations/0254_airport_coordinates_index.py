@@ -0,0 +1,17 @@
+# Generated by Django 2.2.28 on 2026-10-18 23:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workshops', '0253_event_repository_metadata_etag'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='airport',
+            index=models.Index(fields=['latitude', 'longitude'], name='workshops_a_latitud_d8ff0d_idx'),
+        ),
+    ]
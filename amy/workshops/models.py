@@ -12,13 +12,15 @@ from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
 from django.db import models, transaction
 from django.db.models import (
+    BooleanField,
     Case,
     Count,
+    Exists,
     F,
-    IntegerField,
+    OuterRef,
     PositiveIntegerField,
     Q,
-    Sum,
+    Value,
     When,
 )
 from django.db.models.functions import Greatest
@@ -362,6 +364,14 @@ class Membership(models.Model):
         b = self.workshops_without_admin_fee_rolled_over or 0
         return max(a - b, 0)
 
+    @cached_property
+    def _workshops_without_admin_fee_completed_count(self) -> int:
+        return self._workshops_without_admin_fee_completed_queryset().count()
+
+    @cached_property
+    def _workshops_without_admin_fee_planned_count(self) -> int:
+        return self._workshops_without_admin_fee_planned_queryset().count()
+
     @cached_property
     def workshops_without_admin_fee_completed(self) -> int:
         """Count centrally-organised workshops already hosted by this membership.
@@ -371,7 +381,7 @@ class Membership(models.Model):
 
         Excess is counted towards discounted-fee completed workshops."""
         return min(
-            self._workshops_without_admin_fee_completed_queryset().count(),
+            self._workshops_without_admin_fee_completed_count,
             self.workshops_without_admin_fee_available,
         )
 
@@ -384,7 +394,7 @@ class Membership(models.Model):
 
         Excess is counted towards discounted-fee planned workshops."""
         return min(
-            self._workshops_without_admin_fee_planned_queryset().count(),
+            self._workshops_without_admin_fee_planned_count,
             self.workshops_without_admin_fee_available
             - self.workshops_without_admin_fee_completed,
         )
@@ -404,7 +414,7 @@ class Membership(models.Model):
         """Any centrally-organised workshops exceeding the workshops without fee allowed
         number - already completed."""
         return max(
-            self._workshops_without_admin_fee_completed_queryset().count()
+            self._workshops_without_admin_fee_completed_count
             - self.workshops_without_admin_fee_available,
             0,
         )
@@ -414,7 +424,7 @@ class Membership(models.Model):
         """Any centrally-organised workshops exceeding the workshops without fee allowed
         number - to happen in future."""
         return max(
-            self._workshops_without_admin_fee_planned_queryset().count()
+            self._workshops_without_admin_fee_planned_count
             - self.workshops_without_admin_fee_available,
             0,
         )
@@ -526,12 +536,75 @@ class Airport(models.Model):
 
     class Meta:
         ordering = ("iata",)
+        # used by location-based searches (bounding box on coordinates)
+        indexes = [models.Index(fields=["latitude", "longitude"])]
 
 
 # ------------------------------------------------------------
 
 
-class PersonManager(BaseUserManager):
+class PersonQuerySet(models.query.QuerySet):
+    def annotate_with_instructor_eligibility(self):
+        """Annotate people with flags for passed instructor requirements and
+        with `instructor_eligible`, which is True when all of them are passed.
+
+        Every flag is a separate `EXISTS` subquery, so there's no join fan-out
+        and the queryset can be safely combined with other annotations."""
+
+        def passed(*requirements):
+            return Exists(
+                TrainingProgress.objects.filter(
+                    trainee=OuterRef("pk"),
+                    requirement__name__in=requirements,
+                    state="p",
+                    discarded=False,
+                )
+            )
+
+        return self.annotate(
+            passed_training=passed("Training"),
+            passed_swc_homework=passed("SWC Homework"),
+            passed_dc_homework=passed("DC Homework"),
+            passed_lc_homework=passed("LC Homework"),
+            passed_discussion=passed("Discussion"),
+            passed_swc_demo=passed("SWC Demo"),
+            passed_dc_demo=passed("DC Demo"),
+            passed_lc_demo=passed("LC Demo"),
+            passed_homework=passed("SWC Homework", "DC Homework", "LC Homework"),
+            passed_demo=passed("SWC Demo", "DC Demo", "LC Demo"),
+        ).annotate(
+            instructor_eligible=Case(
+                When(
+                    passed_training=True,
+                    passed_discussion=True,
+                    passed_homework=True,
+                    passed_demo=True,
+                    then=Value(True),
+                ),
+                default=Value(False),
+                output_field=BooleanField(),
+            )
+        )
+
+    def annotate_with_instructor_badges(self):
+        """Annotate people with flags for instructor badges they were awarded:
+        `is_swc_instructor`, `is_dc_instructor`, `is_lc_instructor` and
+        `is_instructor` (any of them)."""
+
+        def has_badge(*badges):
+            return Exists(
+                Award.objects.filter(person=OuterRef("pk"), badge__name__in=badges)
+            )
+
+        return self.annotate(
+            is_swc_instructor=has_badge("swc-instructor"),
+            is_dc_instructor=has_badge("dc-instructor"),
+            is_lc_instructor=has_badge("lc-instructor"),
+            is_instructor=has_badge(*Badge.INSTRUCTOR_BADGES),
+        )
+
+
+class PersonManager(BaseUserManager.from_queryset(PersonQuerySet)):
     """
     Create users and superusers from command line.
 
@@ -580,71 +653,6 @@ class PersonManager(BaseUserManager):
         else:
             return super().get_by_natural_key(username)
 
-    def annotate_with_instructor_eligibility(self):
-        def passed(requirement):
-            return Sum(
-                Case(
-                    When(
-                        trainingprogress__requirement__name=requirement,
-                        trainingprogress__state="p",
-                        trainingprogress__discarded=False,
-                        then=1,
-                    ),
-                    default=0,
-                    output_field=IntegerField(),
-                )
-            )
-
-        def passed_either(req_a, req_b, req_c):
-            return Sum(
-                Case(
-                    When(
-                        trainingprogress__requirement__name=req_a,
-                        trainingprogress__state="p",
-                        trainingprogress__discarded=False,
-                        then=1,
-                    ),
-                    When(
-                        trainingprogress__requirement__name=req_b,
-                        trainingprogress__state="p",
-                        trainingprogress__discarded=False,
-                        then=1,
-                    ),
-                    When(
-                        trainingprogress__requirement__name=req_c,
-                        trainingprogress__state="p",
-                        trainingprogress__discarded=False,
-                        then=1,
-                    ),
-                    default=0,
-                    output_field=IntegerField(),
-                )
-            )
-
-        return self.annotate(
-            passed_training=passed("Training"),
-            passed_swc_homework=passed("SWC Homework"),
-            passed_dc_homework=passed("DC Homework"),
-            passed_lc_homework=passed("LC Homework"),
-            passed_discussion=passed("Discussion"),
-            passed_swc_demo=passed("SWC Demo"),
-            passed_dc_demo=passed("DC Demo"),
-            passed_lc_demo=passed("LC Demo"),
-            passed_homework=passed_either("SWC Homework", "DC Homework", "LC Homework"),
-            passed_demo=passed_either("SWC Demo", "DC Demo", "LC Demo"),
-        ).annotate(
-            # We're using Maths to calculate "binary" score for a person to
-            # be instructor badge eligible. Legend:
-            # * means "AND"
-            # + means "OR"
-            instructor_eligible=(
-                F("passed_training")
-                * F("passed_discussion")
-                * F("passed_homework")
-                * F("passed_demo")
-            )
-        )
-
     def duplication_review_expired(self):
         return self.filter(
             Q(duplication_reviewed_on__isnull=True)
@@ -971,8 +979,13 @@ class Person(
             if github_username_has_changed:
                 UserSocialAuth.objects.filter(user=self).delete()
 
-        # save empty string as NULL to the database - otherwise there are
-        # issues with UNIQUE constraint failing
+        self.normalize_fields()
+        super().save(*args, **kwargs)
+
+    def normalize_fields(self):
+        """Strip names and save empty values as NULL to the database - otherwise
+        there are issues with UNIQUE constraint failing. Called on save, and
+        should be called before `bulk_create`."""
         self.personal = self.personal.strip()
         if self.family is not None:
             self.family = self.family.strip()
@@ -981,7 +994,6 @@ class Person(
         self.airport = self.airport or None
         self.github = self.github or None
         self.twitter = self.twitter or None
-        super().save(*args, **kwargs)
 
     def archive(self) -> None:
         """
@@ -1421,6 +1433,19 @@ class Event(AssignmentMixin, RQJobsMixin, models.Model):
         default="",
         help_text="JSON-serialized metadata from event's website",
     )
+    repository_metadata_etag = models.CharField(
+        max_length=STR_LONGEST,
+        blank=True,
+        default="",
+        help_text="ETag of event's website, used in conditional requests",
+    )
+    repository_metadata_last_modified = models.CharField(
+        max_length=STR_MED,
+        blank=True,
+        default="",
+        help_text="Last-Modified date of event's website, used in conditional "
+        "requests",
+    )
     metadata_all_changes = models.TextField(
         blank=True, default="", help_text="List of detected metadata changes"
     )
@@ -2234,114 +2259,43 @@ class TrainingRequest(
             )
 
     def recalculate_score_auto(self):
-        """Calculate automatic score according to the rubric:
-        https://github.com/carpentries/instructor-training/blob/gh-pages/files/rubric.md
-        """
-        score = 0
-
-        # location based points (country not on the list of countries)
-        # according to
-        # https://github.com/swcarpentry/amy/issues/1327#issuecomment-422539917
-        # and
-        # https://github.com/swcarpentry/amy/issues/1327#issuecomment-423292177
-        not_scoring_countries = [
-            "US",
-            "CA",
-            "NZ",
-            "GB",
-            "AU",
-            "AT",
-            "BE",
-            "CY",
-            "CZ",
-            "DK",
-            "EE",
-            "FI",
-            "FR",
-            "DE",
-            "GR",
-            "HU",
-            "IE",
-            "IT",
-            "LV",
-            "LT",
-            "LU",
-            "MT",
-            "NL",
-            "PL",
-            "PT",
-            "RO",
-            "SK",
-            "SI",
-            "ES",
-            "SE",
-            "CH",
-            "IS",
-            "NO",
-        ]
-        if self.country and self.country.code not in not_scoring_countries:
-            score += 1
-
-        if self.underresourced:
-            score += 1
-
-        # economics or social sciences, arts, humanities, library science, or
-        # chemistry
-        scoring_domains = [
-            "Humanities",
-            "Library and information science",
-            "Economics/business",
-            "Social sciences",
-            "Chemistry",
-        ]
-        for domain in self.domains.all():
-            if domain.name in scoring_domains:
-                score += 1
-                break
-
-        # Changed in https://github.com/swcarpentry/amy/issues/1468:
-        # +1 for underrepresented minority in research and/or computing
-        if self.underrepresented == "yes":
-            score += 1
-
-        # +1 for each previous involvement with The Carpentries (max. 3)
-        prev_inv_count = len(self.previous_involvement.all())
-        score += prev_inv_count if prev_inv_count <= 3 else 3
-
-        # previous training in teaching: "a certification or short course"
-        # or "a full degree"
-        if self.previous_training in ["course", "full"]:
-            score += 1
-
-        # previous experience in teaching: "TA for full course"
-        # or "primary instructor for full course"
-        if self.previous_experience in ["ta", "courses"]:
-            score += 1
-
-        # using tools "every day" or "a few times a week"
-        if self.programming_language_usage_frequency in ["daily", "weekly"]:
-            score += 1
-
-        return score
+        """Calculate automatic score according to the rubric (see
+        `workshops.scoring.calculate_score_auto`).
+
+        Related knowledge domains and previous involvement are read with
+        `.all()`, so no queries are run if they were prefetched."""
+        from workshops.scoring import calculate_score_auto
+
+        # M2M relations of not yet saved request are empty
+        domains = self.domains.all() if self.pk else []
+        previous_involvement = self.previous_involvement.all() if self.pk else []
+
+        return calculate_score_auto(
+            country=self.country.code if self.country else None,
+            underresourced=self.underresourced,
+            domains=[domain.name for domain in domains],
+            underrepresented=self.underrepresented,
+            previous_involvement_count=len(previous_involvement),
+            previous_training=self.previous_training,
+            previous_experience=self.previous_experience,
+            programming_language_usage_frequency=(
+                self.programming_language_usage_frequency
+            ),
+        )
 
     def save(self, *args, **kwargs):
-        """Run recalculation upon save."""
-        inserted = False
-
-        # save first so that there's an ID present
-        if not self.pk:
-            super().save(*args, **kwargs)
-            inserted = True
-
-        score = self.recalculate_score_auto()
-
-        if self.pk and score != self.score_auto:
-            self.score_auto = score
-
-        # we cannot force insert for the second time - this time it should
-        # be an UPDATE query
-        if inserted and "force_insert" in kwargs:
-            kwargs.pop("force_insert")
+        """Run recalculation upon save.
+
+        New requests are scored before they're inserted (they can't have any M2M
+        relations yet). Saving only specific fields recalculates the score only
+        if any of them is used by the rubric."""
+        from workshops.scoring import SCORE_FIELDS
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or set(update_fields) & set(SCORE_FIELDS):
+            self.score_auto = self.recalculate_score_auto()
+            if update_fields is not None:
+                kwargs["update_fields"] = set(update_fields) | {"score_auto"}
 
         super().save(*args, **kwargs)
 
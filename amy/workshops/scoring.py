@@ -0,0 +1,195 @@
+"""Automatic score of training requests.
+
+The rubric lives in `calculate_score_auto`, a pure function of request's data,
+used both by `TrainingRequest.save` (for a single request) and by
+`rescore_training_requests`, which scores whole querysets at once: scalar
+fields, whether any scoring knowledge domain was selected and the number of
+previous involvements are fetched in a single query, and only changed scores
+are written back.
+"""
+from typing import Iterable, Optional
+
+from django.contrib.postgres.fields import ArrayField
+from django.db.models import CharField, Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from workshops.models import TrainingRequest
+
+# location based points (country not on the list of countries)
+# according to
+# https://github.com/swcarpentry/amy/issues/1327#issuecomment-422539917
+# and
+# https://github.com/swcarpentry/amy/issues/1327#issuecomment-423292177
+NOT_SCORING_COUNTRIES = frozenset(
+    [
+        "US",
+        "CA",
+        "NZ",
+        "GB",
+        "AU",
+        "AT",
+        "BE",
+        "CY",
+        "CZ",
+        "DK",
+        "EE",
+        "FI",
+        "FR",
+        "DE",
+        "GR",
+        "HU",
+        "IE",
+        "IT",
+        "LV",
+        "LT",
+        "LU",
+        "MT",
+        "NL",
+        "PL",
+        "PT",
+        "RO",
+        "SK",
+        "SI",
+        "ES",
+        "SE",
+        "CH",
+        "IS",
+        "NO",
+    ]
+)
+
+# economics or social sciences, arts, humanities, library science, or
+# chemistry
+SCORING_DOMAINS = frozenset(
+    [
+        "Humanities",
+        "Library and information science",
+        "Economics/business",
+        "Social sciences",
+        "Chemistry",
+    ]
+)
+
+# max. number of points for previous involvement with The Carpentries
+MAX_PREVIOUS_INVOLVEMENT_SCORE = 3
+
+BATCH_SIZE = 1000
+
+SCORE_FIELDS = (
+    "country",
+    "underresourced",
+    "underrepresented",
+    "previous_training",
+    "previous_experience",
+    "programming_language_usage_frequency",
+)
+
+
+def calculate_score_auto(
+    *,
+    country: Optional[str],
+    underresourced: bool,
+    domains: Iterable[str],
+    underrepresented: str,
+    previous_involvement_count: int,
+    previous_training: str,
+    previous_experience: str,
+    programming_language_usage_frequency: str,
+) -> int:
+    """Calculate automatic score according to the rubric:
+    https://github.com/carpentries/instructor-training/blob/gh-pages/files/rubric.md
+
+    `country` is a country code and `domains` are names of selected knowledge
+    domains."""
+    score = 0
+
+    if country and country not in NOT_SCORING_COUNTRIES:
+        score += 1
+
+    if underresourced:
+        score += 1
+
+    if any(domain in SCORING_DOMAINS for domain in domains):
+        score += 1
+
+    # Changed in https://github.com/swcarpentry/amy/issues/1468:
+    # +1 for underrepresented minority in research and/or computing
+    if underrepresented == "yes":
+        score += 1
+
+    # +1 for each previous involvement with The Carpentries (max. 3)
+    score += min(previous_involvement_count, MAX_PREVIOUS_INVOLVEMENT_SCORE)
+
+    # previous training in teaching: "a certification or short course"
+    # or "a full degree"
+    if previous_training in ["course", "full"]:
+        score += 1
+
+    # previous experience in teaching: "TA for full course"
+    # or "primary instructor for full course"
+    if previous_experience in ["ta", "courses"]:
+        score += 1
+
+    # using tools "every day" or "a few times a week"
+    if programming_language_usage_frequency in ["daily", "weekly"]:
+        score += 1
+
+    return score
+
+
+def rescore_training_requests(queryset=None, batch_size: int = BATCH_SIZE) -> int:
+    """Recalculate automatic score of training requests (by default all of them)
+    and save the changed scores. Return number of changed requests."""
+    if queryset is None:
+        queryset = TrainingRequest.objects.all()
+
+    Domains = TrainingRequest.domains.through
+    PreviousInvolvement = TrainingRequest.previous_involvement.through
+    scoring_domains = Domains.objects.filter(
+        trainingrequest=OuterRef("pk"), knowledgedomain__name__in=SCORING_DOMAINS
+    ).values("knowledgedomain__name")
+    previous_involvement = (
+        PreviousInvolvement.objects.filter(trainingrequest=OuterRef("pk"))
+        .order_by()
+        .values("trainingrequest")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    rows = (
+        queryset.order_by()
+        .annotate(
+            scoring_domains=Subquery(
+                scoring_domains,
+                template="ARRAY(%(subquery)s)",
+                output_field=ArrayField(CharField()),
+            ),
+            previous_involvement_count=Coalesce(Subquery(previous_involvement), 0),
+        )
+        .values_list(
+            "pk",
+            "score_auto",
+            "scoring_domains",
+            "previous_involvement_count",
+            *SCORE_FIELDS,
+        )
+        .iterator(chunk_size=batch_size)
+    )
+
+    changed = []
+    count = 0
+    for pk, old_score, domains, previous_involvement_count, *values in rows:
+        score = calculate_score_auto(
+            domains=domains,
+            previous_involvement_count=previous_involvement_count,
+            **dict(zip(SCORE_FIELDS, values)),
+        )
+        if score != old_score:
+            changed.append(TrainingRequest(pk=pk, score_auto=score))
+        if len(changed) >= batch_size:
+            count += len(changed)
+            TrainingRequest.objects.bulk_update(changed, ["score_auto"])
+            changed = []
+
+    count += len(changed)
+    TrainingRequest.objects.bulk_update(changed, ["score_auto"])
+    return count
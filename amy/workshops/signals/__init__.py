@@ -6,3 +6,6 @@ create_comment_signal = Signal(
 )
 # signal generated when a Person object has been archived
 person_archived_signal = Signal(providing_args=["person"])
+# signal generated when Person objects have been created with `bulk_create`,
+# which doesn't send `post_save` signals
+persons_bulk_created_signal = Signal(providing_args=["persons"])
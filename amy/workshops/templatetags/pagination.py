@@ -1,17 +1,34 @@
 from django import template
 
+from workshops.util import KeysetPage
+
 register = template.Library()
 
 
 @register.inclusion_tag("pagination.html", takes_context=True)
-def pagination(context, objects):
+def pagination(context, objects, page_param="page"):
     # needed in set_page_query that's only called from 'pagination.html'
     request = context["request"]
-    return {"objects": objects, "request": request}
+    keyset = isinstance(objects, KeysetPage)
+    if keyset and page_param == "page":
+        page_param = "cursor"
+    return {
+        "objects": objects,
+        "request": request,
+        "page_param": page_param,
+        "keyset": keyset,
+    }
 
 
 @register.simple_tag(takes_context=True)
 def set_page_query(context, page):
     query = context["request"].GET.copy()
-    query["page"] = str(page)
+    query[context.get("page_param", "page")] = str(page)
     return query.urlencode()
+
+
+@register.inclusion_tag("keyset_pagination.html", takes_context=True)
+def keyset_pagination(context, objects, page_param="cursor"):
+    """Previous/next links for pages from `get_keyset_pagination_items`."""
+    request = context["request"]
+    return {"objects": objects, "request": request, "page_param": page_param}
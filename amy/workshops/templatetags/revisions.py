@@ -1,30 +1,38 @@
+from typing import Optional, Tuple
+
 from django import template
 from reversion.models import Version
 
 register = template.Library()
 
 
-@register.inclusion_tag("includes/last_modified.html")
-def last_modified(obj):
-    """Get all versions for specific object, display:
+def created_and_last_version(obj) -> Tuple[Optional[Version], Optional[Version]]:
+    """Get the earliest and the latest version of specific object.
 
-    "Created on ASD by DSA."
-    "Last modified on ASD by DSA."
-    """
+    Only these two versions are fetched (with two ordered, limited queries), so
+    the cost doesn't depend on the length of object's history. The latest version
+    is `None` if the object has only one version."""
     versions = Version.objects.get_for_object(obj).select_related(
         "revision", "revision__user"
     )
+    created = versions.order_by("pk").first()
+    if created is None:
+        return None, None
+
+    last = versions.order_by("-pk").first()
+    if last is None or last.pk == created.pk:
+        last = None
+    return created, last
 
-    try:
-        last, *_, created = versions
-    except ValueError:  # either len(versions) == 0 or len(versions) == 1
-        try:
-            created = versions[0]
-            last = None
-        except IndexError:  # len(versions) == 0
-            created = None
-            last = None
 
+@register.inclusion_tag("includes/last_modified.html")
+def last_modified(obj):
+    """Get first and last versions for specific object, display:
+
+    "Created on ASD by DSA."
+    "Last modified on ASD by DSA."
+    """
+    created, last = created_and_last_version(obj)
     return {
         "created": created,
         "last_modified": last,
@@ -4,25 +4,34 @@ from datetime import date, timedelta
 from io import StringIO
 
 from django.contrib.sessions.serializers import JSONSerializer
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+import reversion
+from reversion.models import Version
 
 from autoemails.models import EmailTemplate, RQJob, Trigger
 from autoemails.tests.base import FakeRedisTestCaseMixin
+from consents.models import Consent, Term
 from workshops.models import Event, Organization, Person, Role, Tag, Task
 from workshops.tests.base import TestBase
-from workshops.util import upload_person_task_csv, verify_upload_person_task
+from workshops.util import (
+    create_uploaded_persons_tasks,
+    upload_person_task_csv,
+    verify_upload_person_task,
+)
 import workshops.views
 
 
 class UploadPersonTaskCSVTestCase(TestBase):
     def compute_from_string(self, csv_str):
-        """ wrap up buffering the raw string & parsing """
+        """wrap up buffering the raw string & parsing"""
         csv_buf = StringIO(csv_str)
         # compute and return
         return upload_person_task_csv(csv_buf)
 
     def test_basic_parsing(self):
-        """ See Person.PERSON_UPLOAD_FIELDS for field ordering """
+        """See Person.PERSON_UPLOAD_FIELDS for field ordering"""
         csv = """personal,family,email
 john,doe,johndoe@email.com
 jane,doe,janedoe@email.com"""
@@ -35,14 +44,14 @@ jane,doe,janedoe@email.com"""
         self.assertTrue(set(person.keys()).issuperset(set(Person.PERSON_UPLOAD_FIELDS)))
 
     def test_csv_without_required_field(self):
-        """ All fields in Person.PERSON_UPLOAD_FIELDS must be in csv """
+        """All fields in Person.PERSON_UPLOAD_FIELDS must be in csv"""
         bad_csv = """personal,family
 john,doe"""
         person_tasks, empty_fields = self.compute_from_string(bad_csv)
         self.assertTrue("email" in empty_fields)
 
     def test_csv_with_mislabeled_field(self):
-        """ It pays to be strict """
+        """It pays to be strict"""
         bad_csv = """personal,family,emailaddress
 john,doe,john@doe.com"""
         person_tasks, empty_fields = self.compute_from_string(bad_csv)
@@ -58,7 +67,7 @@ john,doe,john@doe.com
         self.assertEqual(person["personal"], "john")
 
     def test_empty_field(self):
-        """ Ensure we don't mis-order fields given blank data """
+        """Ensure we don't mis-order fields given blank data"""
         csv = """personal,family,email
 john,,johndoe@email.com"""
         person_tasks, _ = self.compute_from_string(csv)
@@ -290,6 +299,21 @@ class VerifyUploadPersonTask(CSVBulkUploadTestBase):
         self.assertEqual(data[0]["similar_persons"][0][0], self.harry.pk)
         self.assertEqual(data[1]["similar_persons"][0][0], self.ron.pk)
 
+    def test_similar_person_matched_by_name_and_email_listed_once(self):
+        data = [
+            {
+                "personal": "Harry",
+                "family": "Potter",
+                "username": "supplied_username",
+                "email": self.harry.email,
+                "event": "",
+                "role": "",
+            },
+        ]
+        verify_upload_person_task(data)
+
+        self.assertEqual(data[0]["similar_persons"], [(self.harry.pk, str(self.harry))])
+
     def test_duplicate_errors(self):
         """Ensure errors about duplicate person in the database are present."""
         data = self.make_data()
@@ -303,6 +327,29 @@ class VerifyUploadPersonTask(CSVBulkUploadTestBase):
         )
         self.assertIn("Person with this username already exists.", data[0]["errors"])
 
+    def test_same_name_new_persons_get_distinct_usernames(self):
+        """Two new persons with the same name shouldn't receive the same
+        username."""
+        data = self.make_data() + self.make_data()
+        data[1]["email"] = "other@db.com"
+        has_errors = verify_upload_person_task(data, match=True)
+        self.assertFalse(has_errors)
+        self.assertEqual(data[0]["username"], "doe_john")
+        self.assertEqual(data[1]["username"], "doe_john_2")
+
+    def test_number_of_queries_doesnt_depend_on_number_of_rows(self):
+        """Lookups are batched, so verifying more rows doesn't run more
+        queries."""
+        csv_str = "personal,family,email,event,role\n" + "".join(
+            "John{0},Doe,john{0}@db.com,foobar,learner\n".format(i) for i in range(10)
+        )
+        data, _ = upload_person_task_csv(StringIO(csv_str))
+        # events, roles, persons by email, usernames and similar persons; tasks
+        # aren't queried, because no existing person is matched
+        with self.assertNumQueries(5):
+            has_errors = verify_upload_person_task(data, match=True)
+        self.assertFalse(has_errors)
+
 
 class BulkUploadUsersViewTestCase(CSVBulkUploadTestBase):
     def setUp(self):
@@ -474,6 +521,68 @@ Harry,Potter,harry@hogwarts.edu,foobar,learner
         self.assertEqual(foobar.attendance, 1)
 
 
+class CreateUploadedPersonsTasks(CSVBulkUploadTestBase):
+    def make_rows(self, number, start=0):
+        csv_str = "personal,family,email,event,role\n" + "".join(
+            "John{0},Doe,john{0}@db.com,foobar,learner\n".format(i)
+            for i in range(start, start + number)
+        )
+        data, _ = upload_person_task_csv(StringIO(csv_str))
+        verify_upload_person_task(data, match=True)
+        return data
+
+    def test_persons_and_tasks_created(self):
+        Term.objects.create(slug="test-term", content="Test term")
+        data = self.make_rows(3)
+
+        persons_created, tasks_created = create_uploaded_persons_tasks(data)
+
+        self.assertEqual(len(persons_created), 3)
+        self.assertEqual(len(tasks_created), 3)
+        for person in persons_created:
+            self.assertTrue(
+                Task.objects.filter(
+                    person=person, event__slug="foobar", role__name="learner"
+                ).exists()
+            )
+            # `post_save`-like side effects take place, too
+            self.assertTrue(
+                Consent.objects.filter(
+                    person=person, term__slug="test-term", term_option=None
+                ).exists()
+            )
+
+    def test_persons_and_tasks_recorded_in_revision(self):
+        data = self.make_rows(2)
+
+        with reversion.create_revision():
+            persons_created, tasks_created = create_uploaded_persons_tasks(data)
+
+        for obj in persons_created + tasks_created:
+            self.assertEqual(Version.objects.get_for_object(obj).count(), 1)
+
+    def test_existing_tasks_not_duplicated(self):
+        data = self.make_rows(2)
+        _, tasks_created = create_uploaded_persons_tasks(data)
+        self.assertEqual(len(tasks_created), 2)
+
+        data = self.make_rows(2)
+        _, tasks_created = create_uploaded_persons_tasks(data)
+        self.assertEqual(tasks_created, [])
+        self.assertEqual(Task.objects.filter(event__slug="foobar").count(), 2)
+
+    def test_number_of_queries_doesnt_depend_on_number_of_rows(self):
+        small_upload = self.make_rows(2)
+        with CaptureQueriesContext(connection) as small_upload_queries:
+            create_uploaded_persons_tasks(small_upload)
+
+        large_upload = self.make_rows(20, start=2)
+        with CaptureQueriesContext(connection) as large_upload_queries:
+            create_uploaded_persons_tasks(large_upload)
+
+        self.assertEqual(len(small_upload_queries), len(large_upload_queries))
+
+
 class BulkUploadRemoveEntryViewTestCase(CSVBulkUploadTestBase):
     def setUp(self):
         super().setUp()
@@ -4,10 +4,15 @@ These commands are run via `./manage.py command`."""
 
 from datetime import date, datetime, time
 from io import StringIO
+import os
+import tempfile
+from time import monotonic
 import unittest
 from unittest.mock import MagicMock
 
+from django.core.cache import cache
 from django.core.management import call_command
+from django.test import override_settings
 from faker import Faker
 import requests_mock
 
@@ -15,6 +20,7 @@ from workshops.management.commands.check_for_workshop_websites_updates import (
     Command as WebsiteUpdatesCommand,
 )
 from workshops.management.commands.check_for_workshop_websites_updates import (
+    HostRateLimiter,
     WrongWorkshopURL,
     datetime_decode,
     datetime_match,
@@ -25,6 +31,7 @@ from workshops.management.commands.instructors_activity import (
 )
 from workshops.models import Badge, Event, Organization, Role, Task
 from workshops.tests.base import TestBase
+from workshops.util import fetch_workshop_metadata_cached, parse_workshop_metadata
 
 
 class TestInstructorsActivityCommand(TestBase):
@@ -138,11 +145,61 @@ class TestInstructorsActivityCommand(TestBase):
         expecting_persons = [self.harry]
         self.assertEqual(set(persons), set(expecting_persons))
 
+    def test_fetching_activity_number_of_queries(self):
+        """Make sure activity is fetched with a constant number of queries."""
+        # tasks by event (with roles subquery), instructors, and prefetched
+        # tasks, lessons and awards
+        with self.assertNumQueries(5):
+            results = self.cmd.fetch_activity(may_contact_only=False)
+            for record in results:
+                record["tasks"] = list(record["tasks"])
+                list(record["lessons"])
+                list(record["instructor_awards"])
+
+        hermione = [r for r in results if r["person"] == self.hermione][0]
+        own_task, foreign_tasks = hermione["tasks"][0]
+        self.assertEqual(
+            {(t.person, t.role) for t in foreign_tasks},
+            {
+                (self.ron, self.instructor),
+                (self.ron, self.helper),
+                (self.harry, self.helper),
+            },
+        )
+
+    def test_writing_output_to_file(self):
+        """Make sure emails can be written to a file instead of being sent."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "output.txt")
+            out = StringIO()
+            call_command(
+                "instructors_activity",
+                "--no-may-contact-only",
+                "--output",
+                path,
+                stdout=out,
+            )
+            with open(path, encoding="utf-8") as f:
+                content = f.read()
+
+        self.assertIn("Wrote 3 emails to {}.".format(path), out.getvalue())
+        for person in [self.hermione, self.harry, self.ron]:
+            self.assertIn("To: {}\n".format(person.email), content)
+        self.assertIn(
+            "- Instructor at event-with-tasks with Harry Potter, Ron Weasley, "
+            "Ron Weasley",
+            content,
+        )
 
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
 class TestWebsiteUpdatesCommand(TestBase):
     maxDiff = None
 
     def setUp(self):
+        cache.clear()
         self.cmd = WebsiteUpdatesCommand()
         self.fake_cmd = FakeDatabaseCommand()
         self.seed = 12345
@@ -251,20 +308,6 @@ class TestWebsiteUpdatesCommand(TestBase):
             url = "https://swcarpentry.github.io/workshop-template"
             self.cmd.parse_github_url(url)
 
-    @requests_mock.Mocker()
-    def test_getting_event_metadata(self, mock):
-        """Ensure metadata are fetched and normalized by `get_event_metadata`."""
-        # underlying `fetch_event_metadata` and `parse_metadata_from_event_website`
-        # are tested in great detail in `test_util.py`, so here's just a short
-        # test
-        website_url = "https://github.com/swcarpentry/workshop-template"
-        mock_text = self.mocked_event_page
-        mock.get(website_url, text=mock_text, status_code=200)
-        # mock placed, let's test `get_event_metadata`
-
-        metadata = self.cmd.get_event_metadata(website_url)
-        self.assertEqual(metadata, self.expected_metadata_parsed)
-
     def test_deserialization_of_string(self):
         "Ensure our datetime matching function works correctly for strings."
         for test, expected in self.date_serialization_tests:
@@ -401,6 +444,157 @@ class TestWebsiteUpdatesCommand(TestBase):
         self.assertEqual(e.metadata_all_changes, "")
         self.assertEqual(e.metadata_changed, False)
 
+    @requests_mock.Mocker()
+    def test_conditional_requests(self, mock):
+        """Make sure ETag and Last-Modified are stored and used to skip fetching
+        not modified websites."""
+        e = Event.objects.create(
+            slug="with-changes",
+            host=Organization.objects.first(),
+            url="https://swcarpentry.github.io/workshop-template/",
+        )
+        branch = MagicMock()
+        branch.commit.sha = "abcdefghijklmnopqrstuvwxyz"
+        mock.get(
+            e.url,
+            text=self.mocked_event_page,
+            status_code=200,
+            headers={"ETag": '"12345"', "Last-Modified": "Mon, 13 Jul 2015 0:0:0 GMT"},
+        )
+
+        self.cmd.init(branch, e)
+        e.refresh_from_db()
+        self.assertEqual(e.repository_metadata_etag, '"12345"')
+        self.assertEqual(
+            e.repository_metadata_last_modified, "Mon, 13 Jul 2015 0:0:0 GMT"
+        )
+
+        # new commit, but the website isn't modified
+        branch.commit.sha = "zyxwvutsrqponmlkjihgfedcba"
+        mock.get(e.url, status_code=304)
+
+        changes = self.cmd.detect_changes(branch, e)
+
+        self.assertEqual(changes, [])
+        self.assertEqual(mock.last_request.headers["If-None-Match"], '"12345"')
+        self.assertEqual(
+            mock.last_request.headers["If-Modified-Since"],
+            "Mon, 13 Jul 2015 0:0:0 GMT",
+        )
+        e.refresh_from_db()
+        self.assertEqual(e.repository_last_commit_hash, "zyxwvutsrqponmlkjihgfedcba")
+        self.assertEqual(
+            self.cmd.deserialize(e.repository_metadata), self.expected_metadata_parsed
+        )
+
+    @requests_mock.Mocker()
+    def test_fetched_metadata_cached(self, mock):
+        """Make sure metadata fetched by the command are stored in the cache used
+        by views."""
+        e = Event.objects.create(
+            slug="with-changes",
+            host=Organization.objects.first(),
+            url="https://swcarpentry.github.io/workshop-template/",
+        )
+        branch = MagicMock()
+        branch.commit.sha = "abcdefghijklmnopqrstuvwxyz"
+        mock.get(
+            e.url,
+            text=self.mocked_event_page,
+            status_code=200,
+            headers={"ETag": '"12345"'},
+        )
+
+        self.cmd.init(branch, e)
+        metadata = fetch_workshop_metadata_cached(e.url)
+
+        self.assertEqual(mock.call_count, 1)
+        self.assertEqual(
+            parse_workshop_metadata(metadata), self.expected_metadata_parsed
+        )
+
+        # stale metadata are revalidated with the stored ETag
+        mock.get(e.url, status_code=304)
+        metadata = fetch_workshop_metadata_cached(e.url, max_age=0)
+        self.assertEqual(mock.last_request.headers["If-None-Match"], '"12345"')
+        self.assertEqual(
+            parse_workshop_metadata(metadata), self.expected_metadata_parsed
+        )
+
+    @requests_mock.Mocker()
+    def test_fetched_metadata_cached_under_website_url(self, mock):
+        """Make sure metadata fetched by the command are found by views, which use
+        normalized event's website URL."""
+        e = Event.objects.create(
+            slug="with-changes",
+            host=Organization.objects.first(),
+            url="http://swcarpentry.github.com/workshop-template",
+        )
+        branch = MagicMock()
+        branch.commit.sha = "abcdefghijklmnopqrstuvwxyz"
+        mock.get(e.url, text=self.mocked_event_page, status_code=200)
+
+        self.cmd.init(branch, e)
+        metadata = fetch_workshop_metadata_cached(e.website_url)
+
+        self.assertEqual(mock.call_count, 1)
+        self.assertEqual(
+            parse_workshop_metadata(metadata), self.expected_metadata_parsed
+        )
+
+    @requests_mock.Mocker()
+    def test_checking_events_concurrently(self, mock):
+        """Make sure all events are checked and then saved in bulk."""
+        events = [
+            Event.objects.create(
+                slug="event-{}".format(i),
+                host=Organization.objects.first(),
+                start=date.today(),
+                url="https://swcarpentry.github.io/workshop-{}/".format(i),
+                repository_last_commit_hash="abcdefghijklmnopqrstuvwxyz",
+                repository_metadata=self.cmd.serialize(self.cmd.empty_metadata()),
+            )
+            for i in range(5)
+        ]
+        for event in events:
+            mock.get(event.url, text=self.mocked_event_page, status_code=200)
+
+        branch = MagicMock()
+        branch.commit.sha = "zyxwvutsrqponmlkjihgfedcba"
+        self.cmd.load_from_github = MagicMock(return_value=branch)
+
+        with self.assertNumQueries(2):  # fetch events, and update them
+            self.cmd.handle(
+                token="token",
+                init=False,
+                slug=None,
+                cutoff_days=180,
+                workers=3,
+                per_host_delay=0,
+            )
+
+        self.assertEqual(self.cmd.load_from_github.call_count, 5)
+        for event in events:
+            event.refresh_from_db()
+            self.assertEqual(
+                event.repository_last_commit_hash, "zyxwvutsrqponmlkjihgfedcba"
+            )
+            self.assertTrue(event.metadata_changed)
+            self.assertIn("Instructors changed", event.metadata_all_changes)
+
+    def test_rate_limiting_per_host(self):
+        """Make sure requests to the same host are spaced out."""
+        rate_limiter = HostRateLimiter(interval=0.05)
+
+        start = monotonic()
+        rate_limiter.wait("https://api.github.com/repos/a")
+        rate_limiter.wait("https://swcarpentry.github.io/workshop-template/")
+        self.assertLess(monotonic() - start, 0.05)
+
+        rate_limiter.wait("https://api.github.com/repos/b")
+        rate_limiter.wait("https://api.github.com/repos/c")
+        self.assertGreaterEqual(monotonic() - start, 0.1)
+
     @unittest.skip("This command requires internet connection")
     def test_running(self):
         """Test running whole command."""
@@ -3,7 +3,8 @@ from reversion import revisions as reversion
 from reversion.models import Version
 from reversion.revisions import create_revision
 
-from workshops.models import Event, Person, Tag
+from workshops.models import Event, Organization, Person, Tag
+from workshops.templatetags.revisions import created_and_last_version
 from workshops.tests.base import TestBase
 
 
@@ -85,6 +86,56 @@ class TestRevisions(TestBase):
             rv, '<a class="label label-success" href="#">+2</a>', html=True
         )
 
+    def test_created_and_last_version(self):
+        for i in range(5):
+            with create_revision():
+                self.event.slug = f"event-{i}"
+                self.event.save()
+        versions = Version.objects.get_for_object(self.event)
+
+        with self.assertNumQueries(2):
+            created, last = created_and_last_version(self.event)
+
+        self.assertEqual(created, self.older)
+        self.assertEqual(last, versions[0])
+
+    def test_created_and_last_version_single_version(self):
+        with create_revision():
+            org = Organization.objects.create(domain="new.org", fullname="New")
+
+        created, last = created_and_last_version(org)
+
+        self.assertEqual(created, Version.objects.get_for_object(org).get())
+        self.assertIsNone(last)
+
+    def test_created_and_last_version_no_versions(self):
+        org = Organization.objects.create(domain="new.org", fullname="New")
+        self.assertEqual(created_and_last_version(org), (None, None))
+
+    def test_action_list_paginated(self):
+        for i in range(3):
+            with create_revision():
+                self.event.slug = f"event-{i}"
+                self.event.save()
+        versions = list(Version.objects.get_for_object(self.event))
+
+        rv = self.client.get(
+            reverse("object_changes", args=[self.newer.pk]),
+            {"items_per_page": 2, "page": 2},
+        )
+
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(
+            [action["version"] for action in rv.context["action_list"]],
+            versions[2:4],
+        )
+        self.assertTrue(rv.context["comparable"])
+        # no radio buttons are preselected outside of the first page
+        for action in rv.context["action_list"]:
+            self.assertNotIn("first", action)
+            self.assertNotIn("second", action)
+        self.assertNotIn("Wrong version IDs.", rv.content.decode("utf-8"))
+
 
 class TestRegression1083(TestBase):
     def setUp(self):
@@ -0,0 +1,70 @@
+import json
+
+from workshops.exports import (
+    csv_lines,
+    iterate_in_chunks,
+    json_lines,
+    streaming_csv_response,
+    streaming_json_lines_response,
+)
+from workshops.models import Lesson, Person
+from workshops.tests.base import TestBase
+
+
+class TestIterateInChunks(TestBase):
+    def setUp(self):
+        super().setUp()
+        lessons = list(Lesson.objects.all()[:2])
+        for person in Person.objects.all():
+            for lesson in lessons:
+                person.lessons.add(lesson)
+
+    def test_all_objects_in_order(self):
+        queryset = Person.objects.order_by("pk")
+        self.assertEqual(
+            list(iterate_in_chunks(queryset, chunk_size=2)), list(queryset)
+        )
+
+    def test_prefetching_per_chunk(self):
+        queryset = Person.objects.order_by("pk").prefetch_related("lessons")
+        count = queryset.count()
+        chunks = (count + 1) // 2
+
+        # one query for people, then one per chunk for lessons
+        with self.assertNumQueries(1 + chunks):
+            people = list(iterate_in_chunks(queryset, chunk_size=2))
+            lessons = [list(person.lessons.all()) for person in people]
+
+        self.assertEqual(len(people), count)
+        self.assertEqual(lessons, [list(person.lessons.all()) for person in queryset])
+
+
+class TestStreamingResponses(TestBase):
+    def test_csv_lines(self):
+        lines = csv_lines([[1, "a,b"], [2, None]], header=["id", "value"])
+        self.assertEqual(list(lines), ["id,value\r\n", '1,"a,b"\r\n', "2,\r\n"])
+
+    def test_streaming_csv_response(self):
+        rows = iter([[1, 2]])
+        rv = streaming_csv_response(rows, header=["a", "b"], filename="test.csv")
+
+        self.assertTrue(rv.streaming)
+        self.assertEqual(rv["Content-Type"], "text/csv")
+        self.assertEqual(rv["Content-Disposition"], 'attachment; filename="test.csv"')
+        self.assertEqual(b"".join(rv.streaming_content), b"a,b\r\n1,2\r\n")
+
+    def test_json_lines(self):
+        items = [{"id": 1}, {"date": self.hermione.created_at}]
+
+        lines = list(json_lines(items))
+
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[0]), {"id": 1})
+        self.assertTrue(lines[1].endswith("\n"))
+
+    def test_streaming_json_lines_response(self):
+        rv = streaming_json_lines_response(iter([{"id": 1}, {"id": 2}]))
+
+        self.assertTrue(rv.streaming)
+        self.assertNotIn("Content-Disposition", rv)
+        self.assertEqual(b"".join(rv.streaming_content), b'{"id": 1}\n{"id": 2}\n')
@@ -0,0 +1,92 @@
+from django.test import override_settings
+
+from workshops.facets import distinct_values, related_choices
+from workshops.filters import AllCountriesFilter, ForeignKeyAllValuesFilter
+from workshops.models import Airport, Event, Person
+from workshops.tests.base import TestBase
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class TestFacets(TestBase):
+    def setUp(self):
+        super().setUp()
+        self.event = Event.objects.create(
+            slug="2020-01-01-test", host=self.org_alpha, country="PL"
+        )
+        Event.objects.create(slug="2020-01-02-test", host=self.org_alpha, country="PL")
+        Event.objects.create(
+            slug="2020-01-03-test",
+            host=self.org_beta,
+            country="GB",
+            assigned_to=self.hermione,
+        )
+
+    def test_distinct_values(self):
+        self.assertEqual(distinct_values(Event, "country"), ["GB", "PL"])
+        self.assertEqual(
+            distinct_values(Event, "country", counts=True), [("GB", 1), ("PL", 2)]
+        )
+
+    def test_distinct_values_cached(self):
+        distinct_values(Event, "country")
+        with self.assertNumQueries(0):
+            self.assertEqual(distinct_values(Event, "country"), ["GB", "PL"])
+
+    def test_invalidated_on_save_and_delete(self):
+        distinct_values(Event, "country")
+
+        self.event.country = "US"
+        self.event.save()
+        self.assertEqual(distinct_values(Event, "country"), ["GB", "PL", "US"])
+
+        self.event.delete()
+        self.assertEqual(distinct_values(Event, "country"), ["GB", "PL"])
+
+    def test_unwatched_model_not_cached(self):
+        distinct_values(Airport, "country")
+        with self.assertNumQueries(1):
+            distinct_values(Airport, "country")
+
+    def test_related_choices(self):
+        self.assertEqual(
+            related_choices(Event, "assigned_to", Person),
+            [(self.hermione.pk, str(self.hermione))],
+        )
+        self.assertEqual(
+            related_choices(Event, "host", type(self.org_alpha), counts=True),
+            [
+                (self.org_alpha.pk, f"{self.org_alpha} (2)"),
+                (self.org_beta.pk, f"{self.org_beta} (1)"),
+            ],
+        )
+
+    def test_related_choices_invalidated_by_related_model(self):
+        related_choices(Event, "assigned_to", Person)
+        with self.assertNumQueries(0):
+            related_choices(Event, "assigned_to", Person)
+
+        self.hermione.personal = "Hermiona"
+        self.hermione.save()
+
+        self.assertEqual(
+            related_choices(Event, "assigned_to", Person),
+            [(self.hermione.pk, str(self.hermione))],
+        )
+        self.assertIn("Hermiona", str(self.hermione))
+
+    def test_filters(self):
+        country = AllCountriesFilter(field_name="country", counts=True)
+        country.model = Event
+        assigned_to = ForeignKeyAllValuesFilter(Person, field_name="assigned_to")
+        assigned_to.model = Event
+
+        country.field
+        assigned_to.field
+
+        self.assertIn(("PL", "Poland (2)"), country.extra["choices"])
+        self.assertIn(("GB", "United Kingdom (1)"), country.extra["choices"])
+        self.assertEqual(
+            assigned_to.extra["choices"], [(self.hermione.pk, str(self.hermione))]
+        )
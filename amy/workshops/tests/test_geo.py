@@ -0,0 +1,77 @@
+from django.test import TestCase
+
+from workshops.geo import (
+    bounding_box,
+    bounding_box_q,
+    great_circle_distance,
+    great_circle_distance_expression,
+)
+from workshops.models import Airport
+
+
+class TestGreatCircleDistance(TestCase):
+    def setUp(self):
+        self.waw = Airport.objects.create(
+            iata="WAW", fullname="Warsaw", latitude=52.1657, longitude=20.9671
+        )
+        self.jfk = Airport.objects.create(
+            iata="JFK", fullname="New York", latitude=40.6398, longitude=-73.7789
+        )
+        self.suv = Airport.objects.create(
+            iata="SUV", fullname="Suva", latitude=-18.0433, longitude=178.5592
+        )
+        self.tvu = Airport.objects.create(
+            iata="TVU", fullname="Taveuni", latitude=-16.6906, longitude=-179.8770
+        )
+        # airports added in migrations are ignored
+        self.airports = Airport.objects.filter(
+            pk__in=[self.waw.pk, self.jfk.pk, self.suv.pk, self.tvu.pk]
+        )
+
+    def test_distance(self):
+        self.assertAlmostEqual(great_circle_distance(0, 0, 0, 0), 0.0)
+        self.assertAlmostEqual(
+            great_circle_distance(52.1657, 20.9671, 40.6398, -73.7789), 6857, delta=10
+        )
+        # a quarter of the equator
+        self.assertAlmostEqual(great_circle_distance(0, 0, 0, 90), 10007.5, delta=1)
+        # antipodes
+        self.assertAlmostEqual(great_circle_distance(0, 0, 0, 180), 20015, delta=1)
+
+    def test_distance_expression(self):
+        airport = Airport.objects.annotate(
+            distance=great_circle_distance_expression(52.1657, 20.9671)
+        ).get(pk=self.jfk.pk)
+        self.assertAlmostEqual(
+            airport.distance,
+            great_circle_distance(52.1657, 20.9671, 40.6398, -73.7789),
+            places=3,
+        )
+
+    def test_bounding_box(self):
+        (min_lat, max_lat), lng_ranges = bounding_box(0, 0, 111.195)
+        self.assertAlmostEqual(min_lat, -1.0, places=3)
+        self.assertAlmostEqual(max_lat, 1.0, places=3)
+        self.assertEqual(len(lng_ranges), 1)
+        self.assertAlmostEqual(lng_ranges[0][1], 1.0, places=3)
+
+    def test_bounding_box_near_pole(self):
+        lat_range, lng_ranges = bounding_box(89.5, 0, 100)
+        self.assertEqual(lat_range[1], 90.0)
+        self.assertIsNone(lng_ranges)
+
+    def test_bounding_box_across_antimeridian(self):
+        distance = great_circle_distance(-18.0433, 178.5592, -16.6906, -179.8770)
+        box = bounding_box_q(-18.0433, 178.5592, distance + 1)
+
+        self.assertEqual(set(self.airports.filter(box)), {self.suv, self.tvu})
+
+    def test_bounding_box_contains_radius(self):
+        radius = 7000
+        box = bounding_box_q(52.1657, 20.9671, radius)
+        within_radius = self.airports.annotate(
+            distance=great_circle_distance_expression(52.1657, 20.9671)
+        ).filter(distance__lte=radius)
+
+        self.assertEqual(set(within_radius), {self.waw, self.jfk})
+        self.assertTrue(set(within_radius) <= set(self.airports.filter(box)))
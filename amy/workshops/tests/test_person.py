@@ -541,6 +541,41 @@ class TestPerson(TestBase):
         self.assertIn(comment, Comment.objects.for_model(obj))
 
 
+class TestAllPersons(TestBase):
+    def setUp(self):
+        super().setUp()
+        self._setUpUsersAndLogin()
+
+    def test_keyset_pagination(self):
+        url = reverse("all_persons")
+        expected = list(Person.objects.order_by("family", "personal", "pk"))
+
+        persons = []
+        rv = self.client.get(url, {"items_per_page": 2})
+        while True:
+            self.assertEqual(rv.status_code, 200)
+            page = rv.context["all_persons"]
+            self.assertEqual(page.count, len(expected))
+            persons += list(page)
+            if not page.has_next():
+                break
+            rv = self.client.get(url, {"items_per_page": 2, "cursor": page.next_cursor})
+
+        self.assertEqual(persons, expected)
+
+    def test_ordering_by_nullable_field(self):
+        Person.objects.filter(pk=self.hermione.pk).update(email=None)
+        url = reverse("all_persons")
+
+        rv = self.client.get(url, {"items_per_page": "all", "order_by": "-email"})
+
+        self.assertEqual(
+            list(rv.context["all_persons"]),
+            list(Person.objects.order_by("-email", "pk")),
+        )
+        self.assertEqual(rv.context["all_persons"][0], self.hermione)
+
+
 class TestPersonPassword(TestBase):
     """Separate tests for testing password setting.
 
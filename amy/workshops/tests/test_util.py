@@ -1,9 +1,12 @@
 # coding: utf-8
 import datetime
 from datetime import timedelta
+from unittest.mock import patch
 
+from django.core.cache import cache
+from django.db.models import F
 from django.http import Http404
-from django.test import RequestFactory
+from django.test import RequestFactory, override_settings
 from django.utils import timezone
 import requests.exceptions
 import requests_mock
@@ -29,11 +32,15 @@ from workshops.util import (
     create_username,
     default_membership_cutoff,
     fetch_workshop_metadata,
+    fetch_workshop_metadata_cached,
     find_workshop_HTML_metadata,
     find_workshop_YAML_metadata,
     generate_url_to_event_index,
+    get_approximate_count,
+    get_keyset_pagination_items,
     get_members,
     human_daterange,
+    keyset_pagination_supported,
     match_notification_email,
     parse_workshop_metadata,
     reports_link,
@@ -943,6 +950,253 @@ class TestPaginatorSections(TestBase):
         )
 
 
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestKeysetPagination(TestBase):
+    def setUp(self):
+        # pairs of persons with the same names, so that primary key has to be used
+        # to order them
+        self.persons = [
+            Person.objects.create(
+                personal=personal,
+                family="Keyset",
+                email=f"keyset{i}@example.org",
+                username=f"keyset_{i}",
+            )
+            for i, personal in enumerate("AABBCCD")
+        ]
+        self.queryset = Person.objects.filter(family="Keyset")
+        self.factory = RequestFactory()
+
+    def get_page(self, queryset=None, **params):
+        params.setdefault("items_per_page", 2)
+        request = self.factory.get("/", params)
+        return get_keyset_pagination_items(request, queryset or self.queryset)
+
+    def test_first_page(self):
+        page = self.get_page()
+        self.assertEqual(list(page), self.persons[:2])
+        self.assertTrue(page.has_next())
+        self.assertFalse(page.has_previous())
+
+    def test_walking_forward_and_back(self):
+        pages = [self.get_page()]
+        while pages[-1].has_next():
+            pages.append(self.get_page(cursor=pages[-1].next_cursor))
+
+        self.assertEqual(
+            [list(page) for page in pages],
+            [self.persons[0:2], self.persons[2:4], self.persons[4:6], self.persons[6:]],
+        )
+        self.assertFalse(pages[-1].has_next())
+
+        previous = self.get_page(cursor=pages[2].previous_cursor)
+        self.assertEqual(list(previous), self.persons[2:4])
+        self.assertTrue(previous.has_next())
+        self.assertTrue(previous.has_previous())
+        first = self.get_page(cursor=previous.previous_cursor)
+        self.assertEqual(list(first), self.persons[:2])
+        self.assertFalse(first.has_previous())
+
+    def test_descending_ordering(self):
+        queryset = self.queryset.order_by("-personal", "-pk")
+        page = self.get_page(queryset)
+        page = self.get_page(queryset, cursor=page.next_cursor)
+        self.assertEqual(list(page), [self.persons[4], self.persons[3]])
+
+    def test_number_of_queries(self):
+        page = self.get_page()
+        with self.assertNumQueries(1):
+            self.get_page(cursor=page.next_cursor)
+
+    def test_invalid_cursor(self):
+        for cursor in ["invalid", "e30=", "W10="]:
+            with self.subTest(cursor=cursor):
+                page = self.get_page(cursor=cursor)
+                self.assertEqual(list(page), self.persons[:2])
+
+    def test_cursor_from_different_ordering_is_ignored(self):
+        page = self.get_page()
+        page = self.get_page(self.queryset.order_by("-pk"), cursor=page.next_cursor)
+        self.assertEqual(list(page), [self.persons[6], self.persons[5]])
+
+    def test_all_items(self):
+        page = self.get_page(items_per_page="all")
+        self.assertEqual(list(page), self.persons)
+        self.assertFalse(page.has_other_pages())
+
+    def walk(self, queryset):
+        """Objects from all pages, walking forward and then back."""
+        pages = [self.get_page(queryset)]
+        while pages[-1].has_next():
+            pages.append(self.get_page(queryset, cursor=pages[-1].next_cursor))
+        forward = [obj for page in pages for obj in page]
+
+        backward = list(pages[-1])
+        page = pages[-1]
+        while page.has_previous():
+            page = self.get_page(queryset, cursor=page.previous_cursor)
+            backward = list(page) + backward
+        self.assertEqual(forward, backward)
+        return forward
+
+    def test_nullable_ordering(self):
+        Person.objects.filter(pk__in=[self.persons[1].pk, self.persons[4].pk]).update(
+            email=None
+        )
+        for ordering in ["email", "-email"]:
+            with self.subTest(ordering=ordering):
+                queryset = self.queryset.order_by(ordering)
+                self.assertEqual(
+                    self.walk(queryset), list(queryset.order_by(ordering, "pk"))
+                )
+
+    def test_ordering_by_relation(self):
+        # Task is ordered by `event`, which means Event's ordering (`-start`)
+        host = Organization.objects.first()
+        role = Role.objects.create(name="keyset")
+        events = [
+            Event.objects.create(
+                slug=f"keyset-{i}", host=host, start=datetime.date(2020, 1, i % 3 + 1)
+            )
+            for i in range(4)
+        ] + [Event.objects.create(slug="keyset-no-start", host=host)]
+        for event in events:
+            for person in self.persons[:2]:
+                Task.objects.create(event=event, person=person, role=role)
+        queryset = Task.objects.filter(role=role)
+
+        self.assertEqual(
+            self.walk(queryset), list(queryset.order_by(*Task._meta.ordering, "pk"))
+        )
+
+    def test_keyset_pagination_supported(self):
+        self.assertTrue(keyset_pagination_supported(self.queryset))
+        self.assertTrue(keyset_pagination_supported(Task.objects.order_by("-event")))
+        self.assertFalse(keyset_pagination_supported(self.queryset.order_by("?")))
+        self.assertFalse(
+            keyset_pagination_supported(self.queryset.order_by(F("email").asc()))
+        )
+
+    def test_count(self):
+        cache.clear()
+        request = self.factory.get("/", {"items_per_page": 2})
+
+        page = get_keyset_pagination_items(request, self.queryset, with_count=True)
+        self.assertEqual(page.count, 7)
+        self.assertIsNone(self.get_page().count)
+
+        # "all" objects are simply counted
+        request = self.factory.get("/", {"items_per_page": "all"})
+        with self.assertNumQueries(1):
+            page = get_keyset_pagination_items(request, self.queryset, with_count=True)
+        self.assertEqual(page.count, 7)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestApproximateCount(TestBase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_count_cached(self):
+        queryset = Person.objects.filter(personal="Hermione")
+        self.assertEqual(get_approximate_count(queryset), 1)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_approximate_count(queryset), 1)
+        self.assertEqual(
+            get_approximate_count(Person.objects.filter(personal="Ron")), 1
+        )
+
+    def test_empty_queryset(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(get_approximate_count(Person.objects.none()), 0)
+
+    @patch("workshops.util._estimated_table_rows", return_value=123456)
+    def test_large_table_estimated(self, mock):
+        self.assertEqual(get_approximate_count(Person.objects.all()), 123456)
+        # filtered querysets are counted
+        self.assertEqual(
+            get_approximate_count(Person.objects.filter(personal="Hermione")), 1
+        )
+
+    @patch("workshops.util._estimated_table_rows", return_value=100)
+    def test_small_table_counted(self, mock):
+        self.assertEqual(
+            get_approximate_count(Person.objects.all()), Person.objects.count()
+        )
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestFetchWorkshopMetadataCached(TestBase):
+    website_url = "https://pbanaszkiewicz.github.io/workshop"
+    html_content = TestHandlingEventMetadata.html_content
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    @requests_mock.Mocker()
+    def test_fresh_metadata_not_fetched_again(self, mock):
+        mock.get(self.website_url, text=self.html_content)
+
+        metadata1 = fetch_workshop_metadata_cached(self.website_url)
+        metadata1["slug"] = "changed"
+        metadata2 = fetch_workshop_metadata_cached(self.website_url)
+
+        self.assertEqual(mock.call_count, 1)
+        self.assertEqual(metadata2["slug"], "2015-07-13-test")
+
+    @requests_mock.Mocker()
+    def test_revalidation_with_etag(self, mock):
+        mock.get(
+            self.website_url,
+            [
+                dict(text=self.html_content, headers={"ETag": '"v1"'}),
+                dict(status_code=304),
+            ],
+        )
+
+        fetch_workshop_metadata_cached(self.website_url)
+        metadata = fetch_workshop_metadata_cached(self.website_url, max_age=0)
+
+        self.assertEqual(mock.call_count, 2)
+        self.assertEqual(mock.last_request.headers["If-None-Match"], '"v1"')
+        self.assertEqual(metadata["slug"], "2015-07-13-test")
+
+    @requests_mock.Mocker()
+    def test_failures_cached(self, mock):
+        mock.get(self.website_url, status_code=404)
+
+        for _ in range(2):
+            with self.assertRaises(requests.exceptions.HTTPError) as cm:
+                fetch_workshop_metadata_cached(self.website_url)
+            self.assertEqual(cm.exception.response.status_code, 404)
+
+        self.assertEqual(mock.call_count, 1)
+
+    @requests_mock.Mocker()
+    def test_failures_not_cached_when_revalidating(self, mock):
+        mock.get(
+            self.website_url,
+            [
+                dict(exc=requests.exceptions.ConnectTimeout),
+                dict(text=self.html_content),
+            ],
+        )
+
+        with self.assertRaises(requests.exceptions.ConnectTimeout):
+            fetch_workshop_metadata_cached(self.website_url)
+        metadata = fetch_workshop_metadata_cached(self.website_url, max_age=0)
+
+        self.assertEqual(metadata["slug"], "2015-07-13-test")
+
+
 class TestAssignUtil(TestBase):
     def setUp(self):
         """Set up RequestFactory for making fast fake requests."""
@@ -15,12 +15,12 @@ class TestViewsFor404ing(TestBase):
         self.assertEqual(rv.status_code, 404)
 
     def test_person_details(self):
-        url = reverse("person_details", args=[404])
+        url = reverse("person_details", args=[404404])
         rv = self.client.get(url)
         self.assertEqual(rv.status_code, 404)
 
     def test_person_edit(self):
-        url = reverse("person_edit", args=[404])
+        url = reverse("person_edit", args=[404404])
         rv = self.client.get(url)
         self.assertEqual(rv.status_code, 404)
 
@@ -35,7 +35,7 @@ class TestViewsFor404ing(TestBase):
         self.assertEqual(rv.status_code, 404)
 
     def test_task_details(self):
-        url = reverse("task_details", args=[404])
+        url = reverse("task_details", args=[404404])
         rv = self.client.get(url)
         self.assertEqual(rv.status_code, 404)
 
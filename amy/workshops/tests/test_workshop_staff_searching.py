@@ -309,6 +309,48 @@ class TestLocateWorkshopStaff(TestBase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(list(response.context["persons"]), [self.blackwidow])
 
+    def test_ordering_by_distance(self):
+        """Ensure people closest to the airport are shown first."""
+        response = self.client.get(self.url, {"airport": self.airport_0_0.pk})
+        self.assertEqual(response.status_code, 200)
+        persons = list(response.context["persons"])
+        self.assertEqual(persons[0], self.hermione)
+        self.assertEqual(persons[-1], self.spiderman)
+        distances = [person.distance for person in persons]
+        self.assertEqual(distances, sorted(distances))
+        self.assertAlmostEqual(persons[0].distance, 0.0)
+
+    def test_match_within_radius(self):
+        """Ensure only people with airports within given distance are returned."""
+        # (55, 105) is about 640 km from (50, 100)
+        response = self.client.get(
+            self.url, {"airport": self.airport_50_100.pk, "radius": 1000}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            set(response.context["persons"]), {self.ron, self.ironman, self.spiderman}
+        )
+        self.assertEqual(list(response.context["persons"])[-1], self.spiderman)
+
+        response = self.client.get(
+            self.url, {"latitude": 50, "longitude": 100, "radius": 500}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.context["persons"]), {self.ron, self.ironman})
+
+    def test_role_counts(self):
+        """Ensure roles are counted correctly for people with many badges."""
+        self._setUpEvents()
+        instructor = Role.objects.get(name="instructor")
+        for event in Event.objects.all()[:2]:
+            Task.objects.create(role=instructor, person=self.hermione, event=event)
+        self.assertGreater(self.hermione.badges.count(), 1)
+
+        person = _workshop_staff_query().get(pk=self.hermione.pk)
+
+        self.assertEqual(person.num_taught, 2)
+        self.assertEqual(person.num_helper, 0)
+
     def test_form_logic(self):
         """Check if logic preventing searching from multiple fields,
         except lat+lng pair, and allowing searching from no location field,
@@ -319,6 +361,11 @@ class TestLocateWorkshopStaff(TestBase):
             (False, {"latitude": 1}),
             (False, {"longitude": 1, "country": ["BG"]}),
             (False, {"latitude": 1, "longitude": 2, "country": ["BG"]}),
+            (True, {"latitude": 1, "longitude": 2, "radius": 100}),
+            (True, {"airport": self.airport_0_0.pk, "radius": 100}),
+            (False, {"radius": 100}),
+            (False, {"country": ["BG"], "radius": 100}),
+            (False, {"airport": self.airport_0_0.pk, "radius": -1}),
             (
                 False,
                 {
@@ -423,7 +470,8 @@ class TestWorkshopStaffCSV(TestBase):
     def test_header_row(self):
         """Ensure header contains the data we want."""
         rv = self.client.get(self.url)
-        first_row = rv.content.decode("utf-8").splitlines()[0]
+        self.assertTrue(rv.streaming)
+        first_row = b"".join(rv.streaming_content).decode("utf-8").splitlines()[0]
         first_row_expected = (
             "Name,Email,Some badges,Has Trainer badge,Taught times,"
             "Is trainee,Airport,Country,Lessons,Affiliation"
@@ -434,8 +482,10 @@ class TestWorkshopStaffCSV(TestBase):
     def test_results(self):
         """Test for the workshop staff CSV output."""
         rv = self.client.get(self.url)
-        reader = csv.DictReader(io.StringIO(rv.content.decode("utf-8")))
+        content = b"".join(rv.streaming_content).decode("utf-8")
+        reader = list(csv.DictReader(io.StringIO(content)))
         results = _workshop_staff_query()
+        self.assertEqual(len(reader), len(results))
         for row, expected in zip(reader, results):
             self.assertEqual(row["Name"], expected.full_name)
             self.assertEqual(row["Email"] or None, expected.email)
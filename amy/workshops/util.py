@@ -1,12 +1,19 @@
 # coding: utf-8
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+import binascii
 from collections import defaultdict, namedtuple
+from copy import deepcopy
 import csv
 import datetime
 from functools import wraps
 from hashlib import sha1
 from itertools import chain
+import json
 import logging
+from operator import attrgetter
 import re
+import threading
+import time
 from typing import Optional, Union
 
 from django.conf import settings
@@ -15,11 +22,12 @@ from django.contrib.auth.decorators import user_passes_test
 from django.contrib.auth.mixins import UserPassesTestMixin
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.sites.models import Site
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist, ObjectDoesNotExist
 from django.core.paginator import EmptyPage, PageNotAnInteger
 from django.core.paginator import Paginator as DjangoPaginator
 from django.core.validators import ValidationError
-from django.db import IntegrityError, models, transaction
+from django.db import IntegrityError, connections, models, transaction
 from django.db.models import Q
 from django.http import Http404
 from django.shortcuts import redirect, render
@@ -28,6 +36,7 @@ from django.utils.http import is_safe_url
 from django_comments.models import Comment
 import django_rq
 import requests
+import reversion
 import yaml
 
 from autoemails.actions import NewInstructorAction, NewSupportingInstructorAction
@@ -36,12 +45,29 @@ from autoemails.models import Trigger
 from consents.models import Consent
 from dashboard.models import Criterium
 from workshops.models import STR_LONG, STR_MED, Badge, Event, Person, Role, Task
+from workshops.signals import persons_bulk_created_signal
 
 logger = logging.getLogger("amy.signals")
 scheduler = django_rq.get_scheduler("default")
 
 ITEMS_PER_PAGE = 25
 
+# Exact counts used by keyset pagination are cached for this many seconds.
+COUNT_CACHE_TIMEOUT = 60
+# Unfiltered tables estimated by the database planner to have more rows than this
+# aren't counted; the estimate is used instead.
+COUNT_ESTIMATE_THRESHOLD = 10000
+
+# Maximum number of connections kept open to a single host by `http_session()`.
+HTTP_POOL_SIZE = 10
+
+# Metadata fetched from workshop websites are cached (see
+# `fetch_workshop_metadata_cached`); times are in seconds.
+METADATA_CACHE_KEY = "workshop-metadata:{digest}"
+METADATA_MAX_AGE = 10 * 60
+METADATA_ERROR_TIMEOUT = 60
+METADATA_CACHE_TIMEOUT = 24 * 60 * 60  # kept longer for revalidation
+
 WORD_SPLIT = re.compile(r"""([\s<>"']+)""")
 SIMPLE_EMAIL = re.compile(r"^\S+@\S+\.\S+$")
 
@@ -114,38 +140,79 @@ def upload_person_task_csv(stream):
     return result, list(empty_fields)
 
 
+def add_to_revision(objects) -> None:
+    """Record objects saved without `Model.save()` (e.g. with `bulk_create` or
+    `QuerySet.update`) in the current revision, so that they don't lose their
+    history. Does nothing outside of a revision (e.g. in management commands)."""
+    if reversion.is_active():
+        for obj in objects:
+            reversion.add_to_revision(obj)
+
+
+def _group_by(objects, *attrs):
+    """Group objects in a dictionary of lists, keyed by an attribute value (or
+    a tuple of values, if more attributes are given)."""
+    key = attrgetter(*attrs)
+    result = defaultdict(list)
+    for obj in objects:
+        result[key(obj)].append(obj)
+    return result
+
+
 def verify_upload_person_task(data, match=False):
     """
     Verify that uploaded data is correct.  Show errors by populating `errors`
     dictionary item.  This function changes `data` in place.
 
     If `match` provided, it will try to match with first similar person.
+
+    Events, roles, persons and tasks referenced by the upload are fetched with
+    a handful of `IN` queries upfront, so the number of queries doesn't depend
+    on the number of rows.
     """
 
-    errors_occur = False
+    slugs = {item.get("event") for item in data if item.get("event")}
+    events_by_slug = _group_by(Event.objects.filter(slug__in=slugs), "slug")
+
+    role_names = {item.get("role") for item in data if item.get("role")}
+    roles_by_name = _group_by(Role.objects.filter(name__in=role_names), "name")
+
+    emails = {item.get("email") for item in data if item.get("email")}
+    persons_by_email = _group_by(Person.objects.filter(email__in=emails), "email")
+
+    # usernames supplied in the upload, and all usernames that could be generated
+    # for rows without one
+    usernames = Q(
+        username__in={item.get("username") for item in data if item.get("username")}
+    )
+    stems = {
+        _username_stem(item.get("personal"), item.get("family"))
+        for item in data
+        if not item.get("username")
+    }
+    for stem in stems:
+        usernames |= Q(username__startswith=stem)
+    existing_usernames = set(
+        Person.objects.filter(usernames).values_list("username", flat=True)
+    )
+
+    person_ids = set()
     for item in data:
-        errors = []
-        info = []
+        try:
+            person_ids.add(int(item.get("existing_person_id")))
+        except (ValueError, TypeError):
+            pass
+    persons_by_id = Person.objects.in_bulk(person_ids)
 
-        event = item.get("event", None)
-        existing_event = None
-        if event:
-            try:
-                existing_event = Event.objects.get(slug=event)
-            except Event.DoesNotExist:
-                errors.append('Event with slug "{0}" does not exist.'.format(event))
-            except Event.MultipleObjectsReturned:
-                errors.append('More than one event named "{0}" exists.'.format(event))
+    # usernames generated for new persons in this upload are added here, so that
+    # two new persons with the same name don't receive the same username
+    taken_usernames = set(existing_usernames)
 
-        role = item.get("role", None)
-        existing_role = None
-        if role:
-            try:
-                existing_role = Role.objects.get(name=role)
-            except Role.DoesNotExist:
-                errors.append('Role with name "{0}" does not exist.'.format(role))
-            except Role.MultipleObjectsReturned:
-                errors.append('More than one role named "{0}" exists.'.format(role))
+    # first pass: match rows with existing persons
+    matched_persons = []
+    for item in data:
+        errors = []
+        info = []
 
         # check if the user exists, and if so: check if existing user's
         # personal and family names are the same as uploaded
@@ -155,41 +222,39 @@ def verify_upload_person_task(data, match=False):
         person_id = item.get("existing_person_id", None)
         person = None
 
+        # `Person.objects.get(email=email)` equivalent: there must be exactly
+        # one person with this email
+        persons_with_email = persons_by_email.get(email, []) if email else []
+        person_with_email = (
+            persons_with_email[0] if len(persons_with_email) == 1 else None
+        )
+
         # try to match with first similar person
         if match is True:
-            try:
-                person = Person.objects.get(email=email)
-            except (Person.DoesNotExist, Person.MultipleObjectsReturned):
-                person = None
-            else:
+            person = person_with_email
+            if person:
                 info.append("Existing record for person will be used.")
                 person_id = person.pk
 
         elif person_id:
             try:
-                person = Person.objects.get(id=int(person_id))
-            except (ValueError, TypeError, Person.DoesNotExist):
+                person = persons_by_id.get(int(person_id))
+            except (ValueError, TypeError):
                 person = None
+
+            if person:
+                info.append("Existing record for person will be used.")
+            else:
                 info.append(
                     "Could not match selected person. New record will " "be created."
                 )
-            else:
-                info.append("Existing record for person will be used.")
 
         elif not person_id:
-            try:
-                Person.objects.get(email=email)
-            except (Person.DoesNotExist, Person.MultipleObjectsReturned):
-                pass
-            else:
+            if person_with_email:
                 errors.append("Person with this email address already exists.")
 
-            try:
-                if item.get("username"):
-                    Person.objects.get(username=item.get("username"))
-            except Person.DoesNotExist:
-                pass
-            else:
+            username = item.get("username")
+            if not username or username in existing_usernames:
                 errors.append("Person with this username already exists.")
 
         if not email and not person:
@@ -197,44 +262,93 @@ def verify_upload_person_task(data, match=False):
 
         if person:
             # force details from existing record
-            item["personal"] = personal = person.personal
-            item["family"] = family = person.family
-            item["email"] = email = person.email
+            item["personal"] = person.personal
+            item["family"] = person.family
+            item["email"] = person.email
             item["username"] = person.username
             item["existing_person_id"] = person_id
             item["person_exists"] = True
         else:
             # force a newly created username
             if not item.get("username"):
-                item["username"] = create_username(personal, family)
+                item["username"] = create_username(
+                    personal, family, taken=taken_usernames
+                )
+                taken_usernames.add(item["username"])
             item["person_exists"] = False
 
             info.append("Person and task will be created.")
 
-        # let's check if there's someone else named this way
-        similar_persons = Person.objects.filter(
-            Q(personal=personal, family=family)
-            | Q(email=email) & ~Q(email="") & Q(email__isnull=False)
-        )
-        # need to cast to list, otherwise it won't JSON-ify
-        item["similar_persons"] = list(
-            zip(
-                similar_persons.values_list("id", flat=True),
-                map(lambda x: str(x), similar_persons),
+        matched_persons.append((person, errors, info))
+
+    # let's check if there's someone else named this way
+    names = {(item["personal"], item["family"]) for item in data}
+    emails = {item["email"] for item in data if item["email"]}
+    similar_candidates = list(
+        Person.objects.filter(
+            Q(
+                personal__in={personal for personal, _ in names},
+                family__in={family for _, family in names},
             )
+            | Q(email__in=emails)
         )
+    )
+    similar_by_name = _group_by(similar_candidates, "personal", "family")
+    similar_by_email = _group_by(similar_candidates, "email")
+
+    existing_tasks = set(
+        Task.objects.filter(
+            event__in=[e for events in events_by_slug.values() for e in events],
+            person__in=[person for person, _, _ in matched_persons if person],
+        ).values_list("event_id", "person_id", "role_id")
+    )
+
+    # second pass: validate rows against fetched data
+    errors_occur = False
+    for item, (person, person_errors, person_info) in zip(data, matched_persons):
+        errors = []
+        info = person_info
+
+        event = item.get("event", None)
+        existing_event = None
+        if event:
+            events = events_by_slug.get(event, [])
+            if not events:
+                errors.append('Event with slug "{0}" does not exist.'.format(event))
+            elif len(events) > 1:
+                errors.append('More than one event named "{0}" exists.'.format(event))
+            else:
+                existing_event = events[0]
+
+        role = item.get("role", None)
+        existing_role = None
+        if role:
+            roles = roles_by_name.get(role, [])
+            if not roles:
+                errors.append('Role with name "{0}" does not exist.'.format(role))
+            elif len(roles) > 1:
+                errors.append('More than one role named "{0}" exists.'.format(role))
+            else:
+                existing_role = roles[0]
+
+        errors += person_errors
+
+        personal, family, email = item["personal"], item["family"], item["email"]
+        similar_persons = similar_by_name.get((personal, family), [])
+        if email:
+            similar_persons = similar_persons + similar_by_email.get(email, [])
+        # need to cast to list, otherwise it won't JSON-ify
+        item["similar_persons"] = [
+            (p.pk, str(p)) for p in dict.fromkeys(similar_persons)
+        ]
 
         if existing_event and person and existing_role:
             # person, their role and a corresponding event exist, so
             # let's check if the task exists
-            try:
-                Task.objects.get(
-                    event=existing_event, person=person, role=existing_role
-                )
-            except Task.DoesNotExist:
-                info.append("Task will be created.")
-            else:
+            if (existing_event.pk, person.pk, existing_role.pk) in existing_tasks:
                 info.append("Task already exists.")
+            else:
+                info.append("Task will be created.")
 
         # let's check what Person model validators want to say
         try:
@@ -261,108 +375,169 @@ def verify_upload_person_task(data, match=False):
     return errors_occur
 
 
+def _row_repr(row):
+    return ("{personal} {family} {username} <{email}>, " "{role} at {event}").format(
+        **row
+    )
+
+
 def create_uploaded_persons_tasks(data, request=None):
     """
     Create persons and tasks from upload data.
+
+    Persons and tasks are inserted with `bulk_create`, and all related events,
+    roles and existing persons are fetched upfront, so the number of queries
+    depends on the number of distinct events rather than on the number of rows.
     """
 
     # Quick sanity check.
     if any([row.get("errors") for row in data]):
         raise InternalError("Uploaded data contains errors, cancelling upload")
 
+    events_by_slug = {
+        event.slug: event
+        for event in Event.objects.filter(
+            slug__in={row["event"] for row in data if row["event"] and row["role"]}
+        ).select_related("administrator")
+    }
+    roles_by_name = {
+        role.name: role
+        for role in Role.objects.filter(
+            name__in={row["role"] for row in data if row["event"] and row["role"]}
+        )
+    }
+    persons_by_id = Person.objects.in_bulk(
+        [
+            row["existing_person_id"]
+            for row in data
+            if row["person_exists"] and row["existing_person_id"]
+        ]
+    )
+    persons_by_username = Person.objects.in_bulk(
+        [
+            row["username"]
+            for row in data
+            if row["person_exists"] and not row["existing_person_id"]
+        ],
+        field_name="username",
+    )
+
     persons_created = []
     tasks_created = []
-    events = set()
+    rows_persons = []
 
     with transaction.atomic():
         for row in data:
-            try:
-                row_repr = (
-                    "{personal} {family} {username} <{email}>, " "{role} at {event}"
-                ).format(**row)
-
-                fields = {key: row[key] for key in Person.PERSON_UPLOAD_FIELDS}
-                fields["username"] = row["username"]
-
-                if row["person_exists"] and row["existing_person_id"]:
-                    # we should use existing Person
-                    p = Person.objects.get(pk=row["existing_person_id"])
-
-                elif row["person_exists"] and not row["existing_person_id"]:
-                    # we should use existing Person
-                    p = Person.objects.get(
-                        personal=fields["personal"],
-                        family=fields["family"],
-                        username=fields["username"],
-                        email=fields["email"],
-                    )
+            fields = {key: row[key] for key in Person.PERSON_UPLOAD_FIELDS}
+            fields["username"] = row["username"]
 
-                else:
-                    # we should create a new Person without any email provided
-                    p = Person(**fields)
-                    p.save()
-                    persons_created.append(p)
+            if row["person_exists"] and row["existing_person_id"]:
+                # we should use existing Person
+                p = persons_by_id.get(int(row["existing_person_id"]))
 
-                if row["event"] and row["role"]:
-                    e = Event.objects.get(slug=row["event"])
-                    r = Role.objects.get(name=row["role"])
+            elif row["person_exists"] and not row["existing_person_id"]:
+                # we should use existing Person
+                p = persons_by_username.get(fields["username"])
+                if p and any(getattr(p, key) != fields[key] for key in fields):
+                    p = None
 
-                    # if the number of learners attending the event changed,
-                    # we should update ``event.attendance``
-                    if row["role"] == "learner":
-                        events.add(e)
+            else:
+                # we should create a new Person without any email provided
+                p = Person(**fields)
+                p.normalize_fields()
+                persons_created.append(p)
+
+            if p is None:
+                raise ObjectDoesNotExist(
+                    'Person matching query does not exist. (for "{0}")'.format(
+                        _row_repr(row)
+                    )
+                )
+            rows_persons.append((row, p))
 
-                    t, created = Task.objects.get_or_create(person=p, event=e, role=r)
-                    if created:
-                        tasks_created.append(t)
+        try:
+            Person.objects.bulk_create(persons_created)
+        except IntegrityError as e:
+            raise IntegrityError("{0} (for uploaded persons)".format(str(e)))
+        persons_bulk_created_signal.send(sender=Person, persons=persons_created)
+        add_to_revision(persons_created)
+
+        existing_tasks = set(
+            Task.objects.filter(
+                event__in=events_by_slug.values(),
+                person__in=[p for _, p in rows_persons],
+            ).values_list("event_id", "person_id", "role_id")
+        )
+
+        for row, p in rows_persons:
+            if row["event"] and row["role"]:
+                try:
+                    e = events_by_slug[row["event"]]
+                    r = roles_by_name[row["role"]]
+                except KeyError:
+                    raise ObjectDoesNotExist(
+                        "Event or role matching query does not exist. "
+                        '(for "{0}")'.format(_row_repr(row))
+                    )
 
-            except IntegrityError as e:
-                raise IntegrityError('{0} (for "{1}")'.format(str(e), row_repr))
+                if (e.pk, p.pk, r.pk) not in existing_tasks:
+                    existing_tasks.add((e.pk, p.pk, r.pk))
+                    tasks_created.append(Task(person=p, event=e, role=r))
 
-            except ObjectDoesNotExist as e:
-                raise ObjectDoesNotExist('{0} (for "{1}")'.format(str(e), row_repr))
+        try:
+            Task.objects.bulk_create(tasks_created)
+        except IntegrityError as e:
+            raise IntegrityError("{0} (for uploaded tasks)".format(str(e)))
+        add_to_revision(tasks_created)
+
+        # `Task.save` saves the related event, so let's do the same, but only
+        # once per event
+        for event in {task.event for task in tasks_created}:
+            event.save()
+
+    # for each created task, try to add a new-(supporting)-instructor action;
+    # conditions depend only on the event and the role, so they're checked once
+    # per event and role
+    new_instructor_objects = []
+    new_supporting_instructor_objects = []
+    checked = {}
+    for task in tasks_created:
+        key = (task.event_id, task.role_id)
+        if key not in checked:
+            checked[key] = (
+                NewInstructorAction.check(task),
+                NewSupportingInstructorAction.check(task),
+            )
+        new_instructor, new_supporting_instructor = checked[key]
 
-    jobs_created = []
-    rqjobs_created = []
+        objs = dict(task=task, event=task.event)
+        if new_instructor:
+            new_instructor_objects.append((objs, task))
+        if new_supporting_instructor:
+            new_supporting_instructor_objects.append((objs, task))
 
-    # for each created task, try to add a new-(supporting)-instructor action
     with transaction.atomic():
-        for task in tasks_created:
-            # conditions check out
-            if NewInstructorAction.check(task):
-                objs = dict(task=task, event=task.event)
-                # prepare context and everything and create corresponding RQJob
-                jobs, rqjobs = ActionManageMixin.add(
-                    action_class=NewInstructorAction,
-                    logger=logger,
-                    scheduler=scheduler,
-                    triggers=Trigger.objects.filter(
-                        active=True, action="new-instructor"
-                    ),
-                    context_objects=objs,
-                    object_=task,
-                    request=request,
-                )
-                jobs_created += jobs
-                rqjobs_created += rqjobs
-
-            # conditions check out
-            if NewSupportingInstructorAction.check(task):
-                objs = dict(task=task, event=task.event)
-                # prepare context and everything and create corresponding RQJob
-                jobs, rqjobs = ActionManageMixin.add(
-                    action_class=NewSupportingInstructorAction,
-                    logger=logger,
-                    scheduler=scheduler,
-                    triggers=Trigger.objects.filter(
-                        active=True, action="new-supporting-instructor"
-                    ),
-                    context_objects=objs,
-                    object_=task,
-                    request=request,
-                )
-                jobs_created += jobs
-                rqjobs_created += rqjobs
+        if new_instructor_objects:
+            ActionManageMixin.bulk_add(
+                action_class=NewInstructorAction,
+                logger=logger,
+                scheduler=scheduler,
+                triggers=Trigger.objects.filter(active=True, action="new-instructor"),
+                objects=new_instructor_objects,
+                request=request,
+            )
+
+        if new_supporting_instructor_objects:
+            ActionManageMixin.bulk_add(
+                action_class=NewSupportingInstructorAction,
+                logger=logger,
+                scheduler=scheduler,
+                triggers=Trigger.objects.filter(
+                    active=True, action="new-supporting-instructor"
+                ),
+                objects=new_supporting_instructor_objects,
+                request=request,
+            )
 
     return persons_created, tasks_created
 
@@ -488,9 +663,16 @@ def update_manual_score(cleaned_data):
     return records
 
 
-def create_username(personal, family, tries=NUM_TRIES):
-    """Generate unique username."""
-    stem = normalize_name(family or "") + "_" + normalize_name(personal or "")
+def _username_stem(personal, family):
+    return normalize_name(family or "") + "_" + normalize_name(personal or "")
+
+
+def create_username(personal, family, tries=NUM_TRIES, taken=None):
+    """Generate unique username.
+
+    If `taken` set of usernames is provided, it's used instead of querying the
+    database for each candidate username."""
+    stem = _username_stem(personal, family)
 
     counter = None
     for i in range(tries):  # let's limit ourselves to only 100 tries
@@ -501,7 +683,10 @@ def create_username(personal, family, tries=NUM_TRIES):
             else:
                 counter += 1
                 username = "{0}_{1}".format(stem, counter)
-            Person.objects.get(username=username)
+            if taken is None:
+                Person.objects.get(username=username)
+            elif username not in taken:
+                return username
         except ObjectDoesNotExist:
             return username
 
@@ -604,8 +789,10 @@ class Paginator(DjangoPaginator):
         return pagination
 
 
-def get_pagination_items(request, all_objects):
-    """Select paginated items."""
+def get_pagination_items(request, all_objects, page_param="page"):
+    """Select paginated items.
+
+    `page_param` allows for more than one paginated list on a single page."""
 
     # Get parameters.
     items = request.GET.get("items_per_page", ITEMS_PER_PAGE)
@@ -615,11 +802,13 @@ def get_pagination_items(request, all_objects):
         except ValueError:
             items = ITEMS_PER_PAGE
     else:
-        # Show everything.
-        items = all_objects.count()
+        # Show everything; evaluating the objects once is cheaper than counting
+        # them first and then fetching all of them anyway.
+        all_objects = list(all_objects)
+        items = len(all_objects)
 
     # Figure out where we are.
-    page = request.GET.get("page")
+    page = request.GET.get(page_param)
 
     # Show selected items.
     paginator = Paginator(all_objects, items)
@@ -639,11 +828,377 @@ def get_pagination_items(request, all_objects):
     return result
 
 
+class KeysetPage:
+    """A single page of results paginated with `get_keyset_pagination_items`.
+
+    Unlike `django.core.paginator.Page` it doesn't know the number of pages nor
+    the total number of objects, only cursors to the neighbouring pages."""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None, count=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        # approximate number of all objects (see `get_approximate_count`)
+        self.count = count
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def _keyset_ordering(queryset) -> list:
+    """Ordering of the queryset, made unique with primary key as a tie-breaker."""
+    ordering = []
+    for name in queryset.query.order_by or queryset.model._meta.ordering:
+        if not isinstance(name, str) or name.lstrip("-") == "?":
+            raise ValueError(f"Ordering by {name!r} is not supported.")
+        if name.lstrip("-") in queryset.query.annotations:
+            ordering.append(name)
+        else:
+            ordering.extend(_keyset_expand_relations(queryset.model, name))
+    if not any(
+        name.lstrip("-") in ("pk", queryset.model._meta.pk.name) for name in ordering
+    ):
+        ordering.append("pk")
+    return ordering
+
+
+def _keyset_expand_relations(model, name: str) -> list:
+    """Like Django does, replace ordering by a relation with the related model's
+    default ordering, e.g. `-event` with `event__start` (`Event` is ordered by
+    `-start`)."""
+    descending = name.startswith("-")
+    path = name.lstrip("-")
+    field = None
+    for part in path.split("__"):
+        field = model._meta.pk if part == "pk" else model._meta.get_field(part)
+        model = field.related_model or model
+
+    related_ordering = field.related_model and field.related_model._meta.ordering
+    if not related_ordering or getattr(field, "attname", None) == part:
+        return [name]
+
+    ordering = []
+    for related_name in related_ordering:
+        if not isinstance(related_name, str):
+            raise ValueError(f"Ordering by {related_name!r} is not supported.")
+        for expanded in _keyset_expand_relations(field.related_model, related_name):
+            expanded_descending = expanded.startswith("-")
+            sign = "-" if descending != expanded_descending else ""
+            ordering.append(f"{sign}{path}__{expanded.lstrip('-')}")
+    return ordering
+
+
+def _keyset_field(queryset, name: str):
+    """Model (or annotation output) field used to order by `name`."""
+    if name in queryset.query.annotations:
+        return queryset.query.annotations[name].output_field
+
+    model = queryset.model
+    field = None
+    for part in name.split("__"):
+        field = model._meta.pk if part == "pk" else model._meta.get_field(part)
+        model = field.related_model or model
+    if field.is_relation:
+        field = field.target_field
+    return field
+
+
+def _keyset_value(obj, name: str):
+    for part in name.split("__"):
+        if obj is None:
+            return None
+        obj = getattr(obj, part)
+    return obj.pk if isinstance(obj, models.Model) else obj
+
+
+def _keyset_encode(ordering: list, direction: str, obj) -> str:
+    values = []
+    for name in ordering:
+        value = _keyset_value(obj, name.lstrip("-"))
+        values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+    data = {"o": ordering, "d": direction, "v": values}
+    return urlsafe_b64encode(json.dumps(data, default=str).encode()).decode()
+
+
+def _keyset_decode(queryset, ordering: list, cursor: str):
+    """Return cursor direction and values; raise `ValueError` on invalid cursor."""
+    try:
+        data = json.loads(urlsafe_b64decode(cursor.encode()))
+        direction, values = data["d"], data["v"]
+        if data["o"] != ordering or len(values) != len(ordering):
+            raise ValueError("Cursor doesn't match current ordering.")
+        if direction not in ("next", "previous"):
+            raise ValueError("Wrong cursor direction.")
+        return direction, [
+            None
+            if value is None
+            else _keyset_field(queryset, name.lstrip("-")).to_python(value)
+            for name, value in zip(ordering, values)
+        ]
+    except (TypeError, KeyError, binascii.Error, ValidationError) as e:
+        raise ValueError("Invalid cursor.") from e
+
+
+def _keyset_filter(ordering: list, values: list, forward: bool) -> Q:
+    """Condition selecting objects after (`forward=True`) or before given values
+    in the ordering, e.g. `(a > 1) OR (a = 1 AND b > 2)` for `a, b` ordering.
+
+    NULLs are placed as PostgreSQL does: after all values in ascending order,
+    before them in descending order."""
+    condition = Q(pk__in=[])
+    equal = Q()
+    for name, value in zip(ordering, values):
+        descending = name.startswith("-")
+        name = name.lstrip("-")
+        ascending = descending != forward
+        if value is None:
+            # only NULLs are after a NULL in ascending order, and only non-NULL
+            # values in descending order
+            after = Q(pk__in=[]) if ascending else Q(**{f"{name}__isnull": False})
+            same = Q(**{f"{name}__isnull": True})
+        else:
+            after = Q(**{f"{name}__{'gt' if ascending else 'lt'}": value})
+            if ascending:
+                after |= Q(**{f"{name}__isnull": True})
+            same = Q(**{name: value})
+        condition |= equal & after
+        equal &= same
+    return condition
+
+
+def keyset_pagination_supported(queryset) -> bool:
+    """Check if the queryset's ordering can be used by
+    `get_keyset_pagination_items` (e.g. it doesn't use expressions)."""
+    try:
+        for name in _keyset_ordering(queryset):
+            _keyset_field(queryset, name.lstrip("-"))
+    except (ValueError, FieldDoesNotExist):
+        return False
+    return True
+
+
+def _estimated_table_rows(model) -> Optional[int]:
+    """Number of rows in model's table as estimated by PostgreSQL planner
+    statistics, or `None` if there's no estimate."""
+    connection = connections[model._default_manager.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+            [model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    # tables that were never analyzed have negative (or zero) estimate
+    return int(row[0]) if row and row[0] > 0 else None
+
+
+def get_approximate_count(queryset) -> int:
+    """Number of objects in the queryset, which may be approximate or slightly
+    outdated.
+
+    For an unfiltered queryset of a large table, the database planner's estimate is
+    used. Otherwise the objects are counted, and the count is cached for
+    `COUNT_CACHE_TIMEOUT` seconds."""
+    queryset = queryset.order_by()
+    query = queryset.query
+    if not query.where and not query.distinct and query.can_filter():
+        estimate = _estimated_table_rows(queryset.model)
+        if estimate is not None and estimate > COUNT_ESTIMATE_THRESHOLD:
+            return estimate
+
+    try:
+        sql, params = query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    key = "approximate-count:{}".format(
+        sha1(f"{sql}{params!r}".encode("utf-8")).hexdigest()
+    )
+    return cache.get_or_set(key, queryset.count, COUNT_CACHE_TIMEOUT)
+
+
+def get_keyset_pagination_items(
+    request, all_objects, cursor_param="cursor", with_count=False
+):
+    """Select a page of items with keyset (cursor) pagination.
+
+    Instead of counting all objects and skipping with OFFSET, each page is
+    selected with a condition on values of the ordering fields of the last (or
+    first) object on the neighbouring page, so the cost doesn't depend on the page
+    number. Queryset's (or model's default) ordering is followed by primary key.
+
+    With `with_count`, the page has also an approximate number of all objects
+    (see `get_approximate_count`)."""
+    items = request.GET.get("items_per_page", ITEMS_PER_PAGE)
+    try:
+        items = int(items)
+    except ValueError:
+        items = None if items == "all" else ITEMS_PER_PAGE
+
+    ordering = _keyset_ordering(all_objects)
+    reversed_ordering = [
+        name[1:] if name.startswith("-") else f"-{name}" for name in ordering
+    ]
+
+    direction, values = "next", None
+    cursor = request.GET.get(cursor_param)
+    if cursor:
+        try:
+            direction, values = _keyset_decode(all_objects, ordering, cursor)
+        except ValueError:
+            direction, values = "next", None
+
+    forward = direction == "next"
+    queryset = all_objects.order_by(*(ordering if forward else reversed_ordering))
+    if values is not None:
+        queryset = queryset.filter(_keyset_filter(ordering, values, forward))
+
+    object_list = list(queryset if items is None else queryset[: items + 1])
+    more = items is not None and len(object_list) > items
+    object_list = object_list[:items]
+    if not forward:
+        object_list.reverse()
+
+    has_next = more if forward else True
+    has_previous = values is not None if forward else more
+    next_cursor = previous_cursor = None
+    if object_list and has_next:
+        next_cursor = _keyset_encode(ordering, "next", object_list[-1])
+    if object_list and has_previous:
+        previous_cursor = _keyset_encode(ordering, "previous", object_list[0])
+
+    count = None
+    if with_count:
+        count = (
+            len(object_list) if items is None else get_approximate_count(all_objects)
+        )
+    return KeysetPage(object_list, next_cursor, previous_cursor, count)
+
+
+_http = threading.local()
+
+
+def http_session() -> requests.Session:
+    """Session of the current thread, so that connections (e.g. to GitHub Pages)
+    are reused between requests."""
+    try:
+        return _http.session
+    except AttributeError:
+        session = _http.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+
 def fetch_workshop_metadata(event_url, timeout=5):
     """Handle metadata from any event site (works with rendered <meta> tags
     metadata or YAML metadata in `index.html`)."""
     # fetch page
-    response = requests.get(event_url, timeout=timeout)
+    session = http_session()
+    response = session.get(event_url, timeout=timeout)
+    return workshop_metadata_from_response(
+        event_url, response, timeout=timeout, get=session.get
+    )
+
+
+def _metadata_error_entry(exc: Exception) -> dict:
+    response = getattr(exc, "response", None)
+    return {
+        "error": type(exc),
+        "message": exc.msg if isinstance(exc, WrongWorkshopURL) else str(exc),
+        "status_code": response.status_code if response is not None else None,
+        "fetched_at": time.time(),
+    }
+
+
+def _raise_metadata_error(entry: dict):
+    error, message = entry["error"], entry["message"]
+    if issubclass(error, requests.exceptions.HTTPError):
+        response = requests.Response()
+        response.status_code = entry["status_code"]
+        raise error(message, response=response)
+    raise error(message)
+
+
+def fetch_workshop_metadata_cached(event_url, timeout=5, max_age=METADATA_MAX_AGE):
+    """Like `fetch_workshop_metadata`, but with metadata shared between requests
+    (and processes) in the default cache.
+
+    Metadata fetched at most `max_age` seconds ago are returned without any
+    request; older ones are revalidated with ETag and Last-Modified headers.
+    Failures are cached too, for a short time, and raised again. With `max_age=0`
+    the website is always requested."""
+    key = METADATA_CACHE_KEY.format(digest=sha1(event_url.encode()).hexdigest())
+    entry = cache.get(key)
+    if entry is not None:
+        age = time.time() - entry["fetched_at"]
+        if "error" in entry:
+            if age < min(max_age, METADATA_ERROR_TIMEOUT):
+                _raise_metadata_error(entry)
+        elif age < max_age:
+            return deepcopy(entry["metadata"])
+
+    headers = {}
+    if entry is not None and "metadata" in entry:
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    session = http_session()
+    try:
+        response = session.get(event_url, headers=headers, timeout=timeout)
+        if response.status_code == 304 and headers:
+            metadata = entry["metadata"]
+        else:
+            metadata = workshop_metadata_from_response(
+                event_url, response, timeout=timeout, get=session.get
+            )
+    except (requests.exceptions.RequestException, WrongWorkshopURL) as e:
+        cache.set(key, _metadata_error_entry(e), timeout=METADATA_ERROR_TIMEOUT)
+        raise
+
+    cache_workshop_metadata(event_url, metadata, response)
+    return deepcopy(metadata)
+
+
+def cache_workshop_metadata(event_url, metadata, response):
+    """Store metadata fetched from event site `response` in the cache used by
+    `fetch_workshop_metadata_cached`, along with validators for revalidation."""
+    key = METADATA_CACHE_KEY.format(digest=sha1(event_url.encode()).hexdigest())
+    entry = {
+        "metadata": metadata,
+        "etag": response.headers.get("ETag", ""),
+        "last_modified": response.headers.get("Last-Modified", ""),
+        "fetched_at": time.time(),
+    }
+    cache.set(key, entry, timeout=METADATA_CACHE_TIMEOUT)
+
+
+def workshop_metadata_from_response(event_url, response, timeout=5, get=None):
+    """Find metadata in already fetched event site `response`; if necessary,
+    fall back to fetching YAML metadata from `index.html` with `get` (by default
+    `requests.get`)."""
+    get = get or requests.get
+
     response.raise_for_status()  # assert it's 200 OK
     content = response.text
 
@@ -655,7 +1210,7 @@ def fetch_workshop_metadata(event_url, timeout=5):
         index_url, repository = generate_url_to_event_index(event_url)
 
         # fetch page
-        response = requests.get(index_url, timeout=timeout)
+        response = get(index_url, timeout=timeout)
 
         if response.status_code == 200:
             # don't throw errors for pages we fall back to
@@ -22,15 +22,17 @@ from django.db import IntegrityError
 from django.db.models import (
     Case,
     Count,
-    F,
     IntegerField,
+    OuterRef,
     Prefetch,
     ProtectedError,
     Q,
+    Subquery,
     Sum,
     Value,
     When,
 )
+from django.db.models.functions import Coalesce
 from django.forms import HiddenInput
 from django.http import Http404, HttpResponse, HttpResponseBadRequest, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
@@ -52,6 +54,7 @@ from autoemails.actions import (
 from autoemails.base_views import ActionManageMixin
 from autoemails.models import Trigger
 from communityroles.forms import CommunityRoleForm
+from consents.cache import invalidate_consent_status
 from consents.forms import ActiveTermConsentsForm
 from consents.models import Consent
 from dashboard.forms import AssignmentForm
@@ -66,6 +69,7 @@ from workshops.base_views import (
     PrepopulationSupportMixin,
     RedirectSupportMixin,
 )
+from workshops.exports import iterate_in_chunks, streaming_csv_response
 from workshops.filters import (
     AirportFilter,
     BadgeAwardsFilter,
@@ -91,6 +95,7 @@ from workshops.forms import (
     TaskForm,
     WorkshopStaffForm,
 )
+from workshops.geo import bounding_box_q, great_circle_distance_expression
 from workshops.management.commands.check_for_workshop_websites_updates import (
     Command as WebsiteUpdatesCommand,
 )
@@ -117,7 +122,7 @@ from workshops.util import (
     create_uploaded_persons_tasks,
     create_username,
     failed_to_delete,
-    fetch_workshop_metadata,
+    fetch_workshop_metadata_cached,
     get_pagination_items,
     login_required,
     merge_objects,
@@ -214,6 +219,7 @@ class AllPersons(OnlyForAdminsMixin, AMYListView):
         ),
     )
     title = "All Persons"
+    keyset_pagination = True
 
 
 class PersonDetails(OnlyForAdminsMixin, AMYDetailView):
@@ -882,6 +888,8 @@ def persons_merge(request):
                 )
 
             else:
+                # consents may have been moved without triggering any signals
+                invalidate_consent_status(base_obj.pk)
                 messages.success(
                     request,
                     "Persons were merged successfully. "
@@ -1072,7 +1080,7 @@ def validate_event(request, slug):
     warning_messages = []
 
     try:
-        metadata = fetch_workshop_metadata(page_url)
+        metadata = fetch_workshop_metadata_cached(page_url)
         # validate metadata
         error_messages, warning_messages = validate_workshop_metadata(metadata)
 
@@ -1378,7 +1386,7 @@ def event_import(request):
     url = request.GET.get("url", "").strip()
 
     try:
-        metadata = fetch_workshop_metadata(url)
+        metadata = fetch_workshop_metadata_cached(url)
         # normalize the metadata
         metadata = parse_workshop_metadata(metadata)
         return JsonResponse(metadata)
@@ -1552,7 +1560,7 @@ def event_review_metadata_changes(request, slug):
         raise Http404("No event found matching the query.")
 
     try:
-        metadata = fetch_workshop_metadata(event.website_url)
+        metadata = fetch_workshop_metadata_cached(event.website_url)
     except requests.exceptions.RequestException:
         messages.error(
             request,
@@ -1664,6 +1672,7 @@ class AllTasks(OnlyForAdminsMixin, AMYListView):
     filter_class = TaskFilter
     queryset = Task.objects.select_related("event", "person", "role")
     title = "All Tasks"
+    keyset_pagination = True
 
 
 class TaskDetails(OnlyForAdminsMixin, AMYDetailView):
@@ -2241,10 +2250,25 @@ class BadgeDetails(OnlyForAdminsMixin, AMYDetailView):
 # ------------------------------------------------------------
 
 
-def _workshop_staff_query(lat=None, lng=None):
+def _count_subquery(queryset, field="person"):
+    """Number of objects in `queryset` (already filtered with `OuterRef`) grouped
+    by `field`; 0 when there are none."""
+    counts = (
+        queryset.order_by().values(field).annotate(count=Count("pk")).values("count")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def _workshop_staff_query(lat=None, lng=None, radius=None):
     """This query is used in two views: workshop staff searching and its CSV
     results. Thanks to factoring-out this function, we're now quite certain
-    that the results in both of the views are the same."""
+    that the results in both of the views are the same.
+
+    When coordinates are provided, people are ordered by great-circle distance
+    (in km) from them; `radius` additionally limits results to people whose
+    airport is within this distance. Counts of roles and badges are correlated
+    subqueries, so they're computed only for the matching (and, when paginated,
+    displayed) people, and not for everyone with an airport."""
     TTT = Tag.objects.get(name="TTT")
     stalled = Tag.objects.get(name="stalled")
     learner = Role.objects.get(name="learner")
@@ -2255,33 +2279,40 @@ def _workshop_staff_query(lat=None, lng=None):
         .exclude(event__tags=stalled)
         .exclude(person__badges__in=important_badges)
     )
+    person_tasks = Task.objects.filter(person=OuterRef("pk"))
+
+    people = Person.objects.filter(airport__isnull=False)
+
+    if lat is not None and lng is not None:
+        people = people.annotate(
+            distance=great_circle_distance_expression(
+                lat, lng, "airport__latitude", "airport__longitude"
+            )
+        )
+        if radius is not None:
+            # the bounding box is checked first, on indexed airport coordinates
+            people = people.filter(
+                bounding_box_q(
+                    lat, lng, radius, "airport__latitude", "airport__longitude"
+                ),
+                distance__lte=radius,
+            )
+        people = people.order_by("distance", "family", "personal")
+    else:
+        people = people.order_by("family", "personal")
 
     # we need to count number of specific roles users had
     # and if they are SWC/DC/LC instructors
     people = (
-        Person.objects.filter(airport__isnull=False)
-        .select_related("airport")
+        people.select_related("airport")
         .annotate(
-            num_taught=Count(
-                Case(
-                    When(task__role__name="instructor", then=Value(1)),
-                    output_field=IntegerField(),
-                )
+            num_taught=_count_subquery(person_tasks.filter(role__name="instructor")),
+            num_helper=_count_subquery(person_tasks.filter(role__name="helper")),
+            num_organizer=_count_subquery(person_tasks.filter(role__name="organizer")),
+            is_trainee=_count_subquery(trainee_tasks.filter(person=OuterRef("pk"))),
+            is_trainer=_count_subquery(
+                Award.objects.filter(person=OuterRef("pk"), badge__name="trainer")
             ),
-            num_helper=Count(
-                Case(
-                    When(task__role__name="helper", then=Value(1)),
-                    output_field=IntegerField(),
-                )
-            ),
-            num_organizer=Count(
-                Case(
-                    When(task__role__name="organizer", then=Value(1)),
-                    output_field=IntegerField(),
-                )
-            ),
-            is_trainee=Count("task", filter=(Q(task__in=trainee_tasks))),
-            is_trainer=Count("badges", filter=(Q(badges__name="trainer"))),
         )
         .prefetch_related(
             "lessons",
@@ -2291,41 +2322,42 @@ def _workshop_staff_query(lat=None, lng=None):
                 queryset=Badge.objects.filter(name__in=Badge.IMPORTANT_BADGES),
             ),
         )
-        .order_by("family", "personal")
     )
 
-    if lat and lng:
-        # using Euclidean distance just because it's faster and easier
-        complex_F = (F("airport__latitude") - lat) ** 2 + (
-            F("airport__longitude") - lng
-        ) ** 2
-        people = people.annotate(distance=complex_F).order_by("distance", "family")
-
     return people
 
 
+def _workshop_staff_location(form):
+    """Return (latitude, longitude, radius) of a location-based search in the
+    workshop staff form; they're `None` when not searching by location."""
+    lat, lng, radius = None, None, None
+    if form.is_valid():
+        if form.cleaned_data["airport"]:
+            lat = form.cleaned_data["airport"].latitude
+            lng = form.cleaned_data["airport"].longitude
+
+        elif form.cleaned_data["latitude"] and form.cleaned_data["longitude"]:
+            lat = form.cleaned_data["latitude"]
+            lng = form.cleaned_data["longitude"]
+
+        if lat is not None:
+            radius = form.cleaned_data["radius"]
+    return lat, lng, radius
+
+
 @admin_required
 def workshop_staff(request):
     """Search for workshop staff."""
 
     # read data from form, if it was submitted correctly
-    lat, lng = None, None
     lessons = list()
     form = WorkshopStaffForm(request.GET)
     if form.is_valid():
         # to highlight (in template) what lessons people know
         lessons = form.cleaned_data["lessons"]
 
-        if form.cleaned_data["airport"]:
-            lat = form.cleaned_data["airport"].latitude
-            lng = form.cleaned_data["airport"].longitude
-
-        elif form.cleaned_data["latitude"] and form.cleaned_data["longitude"]:
-            lat = form.cleaned_data["latitude"]
-            lng = form.cleaned_data["longitude"]
-
     # prepare the query
-    people = _workshop_staff_query(lat, lng)
+    people = _workshop_staff_query(*_workshop_staff_location(form))
 
     # filter the query
     f = WorkshopStaffFilter(request.GET, queryset=people)
@@ -2345,19 +2377,10 @@ def workshop_staff_csv(request):
     """Generate CSV of workshop staff search results."""
 
     # read data from form, if it was submitted correctly
-    lat, lng = None, None
     form = WorkshopStaffForm(request.GET)
-    if form.is_valid():
-        if form.cleaned_data["airport"]:
-            lat = form.cleaned_data["airport"].latitude
-            lng = form.cleaned_data["airport"].longitude
-
-        elif form.cleaned_data["latitude"] and form.cleaned_data["longitude"]:
-            lat = form.cleaned_data["latitude"]
-            lng = form.cleaned_data["longitude"]
 
     # prepare the query
-    people = _workshop_staff_query(lat, lng)
+    people = _workshop_staff_query(*_workshop_staff_location(form))
 
     # filter the query
     f = WorkshopStaffFilter(request.GET, queryset=people)
@@ -2377,28 +2400,23 @@ def workshop_staff_csv(request):
         "Affiliation",
     )
 
-    # CSV http header
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = "attachment; " 'filename="WorkshopStaff.csv"'
-    # CSV output
-    writer = csv.writer(response)
-    writer.writerow(header_row)
-    for person in people:
-        writer.writerow(
-            [
-                person.full_name,
-                person.email,
-                " ".join([badge.name for badge in person.important_badges]),
-                "yes" if person.is_trainer else "no",
-                person.num_taught,
-                "yes" if person.is_trainee else "no",
-                str(person.airport) if person.airport else "",
-                person.country.name if person.country else "",
-                " ".join([lesson.name for lesson in person.lessons.all()]),
-                person.affiliation or "",
-            ]
-        )
-    return response
+    # rows are generated and sent while people are fetched in chunks
+    rows = (
+        [
+            person.full_name,
+            person.email,
+            " ".join([badge.name for badge in person.important_badges]),
+            "yes" if person.is_trainer else "no",
+            person.num_taught,
+            "yes" if person.is_trainee else "no",
+            str(person.airport) if person.airport else "",
+            person.country.name if person.country else "",
+            " ".join([lesson.name for lesson in person.lessons.all()]),
+            person.affiliation or "",
+        ]
+        for person in iterate_in_chunks(people)
+    )
+    return streaming_csv_response(rows, header=header_row, filename="WorkshopStaff.csv")
 
 
 # ------------------------------------------------------------
@@ -2441,24 +2459,26 @@ def object_changes(request, version_id):
         """Applies the correct ordering to the given version queryset."""
         return queryset.order_by("-pk" if history_latest_first else "pk")
 
-    # get action list
+    # get action list; long histories are paginated
+    versions = get_pagination_items(
+        request,
+        _order(Version.objects.get_for_object(obj).select_related("revision__user")),
+    )
     action_list = [
-        {"version": version, "revision": version.revision}
-        for version in _order(
-            Version.objects.get_for_object(obj).select_related("revision__user")
-        )
+        {"version": version, "revision": version.revision} for version in versions
     ]
+    comparable = versions.paginator.count >= 2
 
-    if len(action_list) >= 2:
+    if comparable and len(action_list) >= 2:
         # this preselects radio buttons
-        if history_latest_first:
+        if history_latest_first and not versions.has_previous():
             action_list[0]["first"] = True
             action_list[1]["second"] = True
-        else:
+        elif not history_latest_first and not versions.has_next():
             action_list[-1]["first"] = True
             action_list[-2]["second"] = True
 
-    if request.GET:
+    if "version_id1" in request.GET or "version_id2" in request.GET:
         form = SelectDiffForm(request.GET)
         if form.is_valid():
             version_id1 = form.cleaned_data["version_id1"]
@@ -2485,6 +2505,7 @@ def object_changes(request, version_id):
         "action": "",
         "compare_view": True,
         "action_list": action_list,
-        "comparable": len(action_list) >= 2,
+        "versions": versions,
+        "comparable": comparable,
     }
     return render(request, "workshops/object_diff.html", context)